@@ -0,0 +1,119 @@
+# backend/admission.py
+"""
+Admission control for the inference path.
+
+At most `max_inflight` predictions run at once; up to `max_queue` more wait
+for a slot (for at most `queue_timeout_ms`). Anything beyond that is turned
+away immediately instead of piling up on Flask threads until the client
+times out:
+
+  429 - the wait queue is full (rejected on arrival)
+  503 - admitted to the queue but no slot freed up in time
+
+Every answer carries a recommended next-frame interval that grows with load,
+so clients slow their capture rate before they start getting rejected.
+"""
+
+import threading
+import time
+
+from metrics import LatencyHistogram
+
+
+class AdmissionRejected(Exception):
+    """Raised by admit() - `status` is 429 (queue full) or 503 (queue timeout)"""
+
+    def __init__(self, status, message, retry_after_ms):
+        super().__init__(message)
+        self.status = status
+        self.retry_after_ms = retry_after_ms
+
+
+class AdmissionController:
+    """
+    max_inflight       -- predictions allowed to run concurrently
+    max_queue          -- requests allowed to wait for a slot
+    queue_timeout_ms   -- longest a queued request waits before a 503
+    min_interval_ms    -- recommended frame interval when the server is idle
+    max_interval_ms    -- upper bound on the recommended interval
+    """
+
+    def __init__(self, max_inflight=4, max_queue=32, queue_timeout_ms=2000,
+                 min_interval_ms=150, max_interval_ms=2000):
+        self.max_inflight = max(1, int(max_inflight))
+        self.max_queue = max(0, int(max_queue))
+        self.queue_timeout = max(0.0, float(queue_timeout_ms)) / 1000.0
+        self.min_interval_ms = float(min_interval_ms)
+        self.max_interval_ms = max(float(max_interval_ms), self.min_interval_ms)
+
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected_full = 0
+        self._rejected_timeout = 0
+        self._max_waiting_seen = 0
+        self.wait_time = LatencyHistogram()
+
+    def recommended_interval_ms(self):
+        """
+        Frame interval for clients: the idle interval scaled by how oversubscribed
+        the slots are ((running + queued) / slots), clamped to max_interval_ms.
+        """
+        load = (self._inflight + self._waiting) / self.max_inflight
+        return int(min(self.max_interval_ms, self.min_interval_ms * max(1.0, load)))
+
+    def admit(self):
+        """Block until a slot is free; raises AdmissionRejected instead of waiting too long"""
+        started = time.perf_counter()
+        with self._cond:
+            if self._inflight < self.max_inflight and self._waiting == 0:
+                self._inflight += 1
+                self._admitted += 1
+                self.wait_time.record(0.0)
+                return
+
+            if self._waiting >= self.max_queue:
+                self._rejected_full += 1
+                raise AdmissionRejected(429, "Server busy - inference queue full",
+                                        self.recommended_interval_ms())
+
+            self._waiting += 1
+            self._max_waiting_seen = max(self._max_waiting_seen, self._waiting)
+            deadline = started + self.queue_timeout
+            try:
+                while self._inflight >= self.max_inflight:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._rejected_timeout += 1
+                        self._cond.notify()  # pass on a wake-up this waiter may have consumed
+                        raise AdmissionRejected(503, "Server busy - timed out waiting for inference",
+                                                self.recommended_interval_ms())
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._inflight += 1
+            self._admitted += 1
+        self.wait_time.record(time.perf_counter() - started)
+
+    def release(self):
+        with self._cond:
+            self._inflight -= 1
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            body = {
+                "max_inflight": self.max_inflight,
+                "max_queue": self.max_queue,
+                "queue_timeout_ms": round(self.queue_timeout * 1000.0),
+                "inflight": self._inflight,
+                "queue_depth": self._waiting,
+                "max_queue_depth_seen": self._max_waiting_seen,
+                "admitted": self._admitted,
+                "rejected_queue_full": self._rejected_full,
+                "rejected_timeout": self._rejected_timeout,
+                "recommended_interval_ms": self.recommended_interval_ms(),
+            }
+        body["wait_time"] = self.wait_time.snapshot()
+        return body
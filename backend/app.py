@@ -11,6 +11,10 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 import base64
+import json
+import atexit
+import threading
+import time
 import numpy as np
 
 # Load environment variables from .env file
@@ -935,13 +939,6 @@ def get_quiz(lesson_id):
         20: {'words': [str(i) for i in range(11)], 'type': 'image', 'pool': [str(i) for i in range(11)]},
     }
     
-    # Video lessons pool
-    VIDEO_POOL = ['HELLO', 'WELCOME', 'YES', 'NO', 'PLEASE', 'THANK_YOU', 'SORRY', 'FINE', 'OK', 'GOODBYE',
-                  'ME', 'YOU', 'HE', 'MY', 'YOUR', 'MOTHER', 'FATHER', 'CHILD', 'UNCLE', 'AUNT',
-                  'GOOD', 'BAD', 'LIKE', 'PROUD', 'MAD', 'FUNNY', 'HUNGRY', 'THIRSTY', 'LONELY', 'HOT',
-                  'WHO', 'WHERE', 'WHY', 'LATER', 'SOON', 'SAME', 'LEFT', 'RIGHT', 'YESTERDAY', 'TOMORROW',
-                  'TRUE', 'FALSE', 'WATER', 'FOOD', 'HOME', 'PHONE', 'NEED', 'BATHROOM', 'FINISH', 'UNDERSTAND']
-    
     VIDEO_LESSONS = {
         1: ['HELLO', 'WELCOME'],
         2: ['YES', 'NO'],
@@ -1144,133 +1141,1176 @@ def get_user_progress():
         return jsonify({"message": "Invalid token"}), 401
 
 # --- ML MODEL SETUP ---
-# Sign language actions (must match training data)
-ACTIONS = np.array(['HELLO', 'WELCOME', 'YES', 'NO', 'PLEASE', 'THANK_YOU', 'SORRY', 'FINE', 'OK', 'GOOD_BYE'])
-
-# Load trained SINGLE-FRAME model (instant prediction, no 30-frame buffer needed)
-try:
-    from tensorflow.keras.models import load_model
-    MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'sign_lingo_model_single.h5')
-    if os.path.exists(MODEL_PATH):
-        gesture_model = load_model(MODEL_PATH)
-        print(f"[ML] Single-frame gesture model loaded from {MODEL_PATH}")
+# Sign language actions (must match training data) - shared with ml_training via labels.json.
+# Registered model versions carry their own label list; this one is for the legacy model files.
+with open(os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'labels.json')) as f:
+    ACTIONS = np.array(json.load(f))
+# The 50 signs the video lessons quiz on; build_template_index.py reads the same vocabulary.json
+with open(os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'vocabulary.json')) as f:
+    VIDEO_POOL = json.load(f)
+
+# ML_RUNTIME: 'auto'  - NumPy export if present (no TensorFlow import), else Keras .h5
+#             'numpy' - only the NumPy export (ml_training/export_numpy_model.py)
+#             'keras' - only the Keras .h5 model
+#             'tflite'- TFLITE_MODEL_PATH (fp16 / int8 from ml_training/export_tflite.py)
+ML_RUNTIME = os.getenv('ML_RUNTIME', 'auto').lower()
+MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'sign_lingo_model_single.h5')
+NUMPY_MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'sign_lingo_model_single.npz')
+TFLITE_MODEL_PATH = os.getenv('TFLITE_MODEL_PATH', os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'sign_lingo_model_single_fp16.tflite'))
+
+# Model registry (ml_training/register_model.py): versioned models, each with its labels
+# and input spec. When MODEL_REGISTRY_DIR has an active.json it decides what is served
+# (the ML_RUNTIME files above are the fallback). Swap the active version or split traffic
+# with a canary via POST /admin/api/models/activate - no restart needed.
+# MODEL_REGISTRY_POLL_SECONDS - how often each worker process re-reads active.json
+MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR', os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'models'))
+MODEL_REGISTRY_POLL_SECONDS = float(os.getenv('MODEL_REGISTRY_POLL_SECONDS', '5'))
+
+# MediaPipe hand model is loaded from a local bundle only - never downloaded at startup.
+# Fetch it once with:  python ml_training/fetch_hand_model.py
+HAND_MODEL_PATH = os.getenv('HAND_MODEL_PATH', os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'hand_landmarker.task'))
+
+# Cross-request micro-batching: concurrent /predict calls share one forward pass.
+# PREDICT_BATCH_WINDOW_MS - how long the first frame waits for others to join
+# PREDICT_MAX_BATCH       - flush immediately once this many frames are queued
+# ML_PREDICT_TIMEOUT_S    - longest a request waits for its batch before a 503 (0 = no limit), so
+#                           one stuck forward pass can't hold every request thread behind it
+PREDICT_BATCH_WINDOW_MS = float(os.getenv('PREDICT_BATCH_WINDOW_MS', '5'))
+PREDICT_MAX_BATCH = int(os.getenv('PREDICT_MAX_BATCH', '16'))
+ML_PREDICT_TIMEOUT_S = float(os.getenv('ML_PREDICT_TIMEOUT_S', '5')) or None
+
+# Per-session VIDEO-mode detectors: clients that send X-Session-Id get their own
+# HandLandmarker that tracks hands between frames instead of re-detecting the palm.
+# VIDEO_TRACKING        - 'false' forces the shared IMAGE-mode detector for everyone
+# SESSION_IDLE_SECONDS  - close a session (and its detector) after this long without frames
+# MAX_SESSIONS          - upper bound on live sessions (least recently used evicted)
+VIDEO_TRACKING = os.getenv('VIDEO_TRACKING', 'True').lower() == 'true'
+SESSION_IDLE_SECONDS = float(os.getenv('SESSION_IDLE_SECONDS', '60'))
+MAX_SESSIONS = int(os.getenv('MAX_SESSIONS', '200'))
+
+# Frame pre-processing fast path (frame_preprocess.py), both off by default.
+# DECODE_MAX_SIDE - decode JPEGs at 1/2, 1/4 or 1/8 scale while the longer side stays >= this
+#                   many pixels (MediaPipe downsizes to ~200 px anyway); 0 = full-size decode
+# ROI_CROP        - detect on a crop around the session's previous hand (full frame on a miss).
+#                   Only for sessions without a VIDEO-mode tracker (VIDEO_TRACKING=false):
+#                   the tracker already crops internally and moving crops would break it.
+#                   With ML_WORKERS the crop is taken inside the worker process.
+# ROI_MARGIN      - padding around the previous hand box, as a fraction of its longer side
+DECODE_MAX_SIDE = int(os.getenv('DECODE_MAX_SIDE', '0'))
+ROI_CROP = os.getenv('ROI_CROP', 'false').lower() == 'true'
+ROI_MARGIN = float(os.getenv('ROI_MARGIN', '0.3'))
+
+# Landmark-delta gating: while a session's keypoints stay within GATING_THRESHOLD
+# (RMS distance, normalized image units) of the last classified frame, the cached
+# prediction is returned with "cached": true instead of running the classifier.
+# Sessions with an open verification bypass the gate - every frame there is evidence.
+# GATING_THRESHOLD  - 0 disables gating
+# GATING_MAX_SKIPS  - re-classify after this many cached frames in a row
+GATING_THRESHOLD = float(os.getenv('GATING_THRESHOLD', '0.004'))
+GATING_MAX_SKIPS = int(os.getenv('GATING_MAX_SKIPS', '15'))
+
+# Optional streaming sequence model (ml_training/train_model_sequence.py). Each session
+# keeps the GRU hidden state, so a frame costs one step instead of a 30-frame window;
+# responses for session clients gain a "sequence" block. POST /predict/reset clears it.
+# SEQUENCE_MODEL        - 'true' to load it
+# SEQUENCE_RESET_FRAMES - this many hand-less frames in a row ends the current sign
+# SEQUENCE_HORIZON      - window length the model was trained on (ml_training SEQUENCE_LENGTH).
+#                         The GRU never runs longer than this: at the horizon it is restarted
+#                         on the latest half window, so it always covers 1/2 to 1 window.
+SEQUENCE_MODEL = os.getenv('SEQUENCE_MODEL', 'false').lower() == 'true'
+SEQUENCE_MODEL_PATH = os.getenv('SEQUENCE_MODEL_PATH', os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'sign_lingo_model_sequence.npz'))
+SEQUENCE_RESET_FRAMES = int(os.getenv('SEQUENCE_RESET_FRAMES', '10'))
+SEQUENCE_HORIZON = max(2, int(os.getenv('SEQUENCE_HORIZON', '30')))
+
+# Optional template index (ml_training/build_template_index.py): nearest-neighbour matching
+# against landmark templates from the sign videos covers the full 50-word vocabulary without
+# retraining; responses for frames with a hand gain a "template" block.
+# TEMPLATE_INDEX              - 'true' to load it (not shipped - build it first, see build_template_index.py)
+# TEMPLATE_K                  - neighbours that vote on each frame
+# TEMPLATE_MAX_DISTANCE       - farther than this from every template -> "sign": null (0 = no limit)
+TEMPLATE_INDEX = os.getenv('TEMPLATE_INDEX', 'false').lower() == 'true'
+TEMPLATE_INDEX_PATH = os.getenv('TEMPLATE_INDEX_PATH', os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'sign_templates.npz'))
+TEMPLATE_K = int(os.getenv('TEMPLATE_K', '5'))
+TEMPLATE_MAX_DISTANCE = float(os.getenv('TEMPLATE_MAX_DISTANCE', '0')) or None
+
+# Sign verification sessions (POST /predict/verify): the server grades a "show the sign"
+# attempt across frames and answers pass/fail as soon as the evidence is conclusive.
+# Evidence is the per-frame log ratio of the target's probability to the best other sign's.
+# VERIFY_PASS_EVIDENCE - total evidence to pass (~3 confident frames at the default)
+# VERIFY_FAIL_EVIDENCE - total counter-evidence to fail
+# VERIFY_MIN_FRAMES    - hand frames required before any verdict
+# VERIFY_MAX_FRAMES    - hand frames after which an undecided attempt fails
+# VERIFY_MAX_TOTAL_FRAMES - frames with or without a hand after which it fails ("no_hand" if
+#                        too few had one); 0 = twice VERIFY_MAX_FRAMES
+VERIFY_PASS_EVIDENCE = float(os.getenv('VERIFY_PASS_EVIDENCE', '6'))
+VERIFY_FAIL_EVIDENCE = float(os.getenv('VERIFY_FAIL_EVIDENCE', '12'))
+VERIFY_MIN_FRAMES = int(os.getenv('VERIFY_MIN_FRAMES', '3'))
+VERIFY_MAX_FRAMES = int(os.getenv('VERIFY_MAX_FRAMES', '60'))
+VERIFY_MAX_TOTAL_FRAMES = int(os.getenv('VERIFY_MAX_TOTAL_FRAMES', '0'))
+
+# Multi-core worker pool for sessionless frames (each process owns a HandLandmarker).
+# ML_WORKERS              - number of worker processes, 'auto' = one per CPU core, 0 = off
+# ML_WORKER_QUEUE_DEPTH   - shared-memory frame slots (frames in flight), default 2 per worker
+# ML_WORKER_MAX_PIXELS    - largest frame (width * height) a slot can hold; larger frames get a 413
+ML_WORKERS = os.getenv('ML_WORKERS', '0').lower()
+ML_WORKERS = (os.cpu_count() or 1) if ML_WORKERS == 'auto' else int(ML_WORKERS)
+ML_WORKER_QUEUE_DEPTH = int(os.getenv('ML_WORKER_QUEUE_DEPTH', '0')) or None
+ML_WORKER_MAX_PIXELS = int(os.getenv('ML_WORKER_MAX_PIXELS', str(1280 * 1280)))
+
+# Admission control: a bounded number of predictions run at once and a bounded queue
+# waits for a slot; beyond that requests get a fast 429 (queue full) or 503 (waited
+# too long) instead of piling up until the client times out. Every prediction
+# response carries "recommended_interval_ms" so clients can slow their capture rate.
+# ML_MAX_INFLIGHT       - predictions running at once (default: worker count, else CPU count,
+#                         but at least PREDICT_MAX_BATCH so concurrent requests can still fill
+#                         a micro-batch instead of reaching the classifier one at a time)
+# ML_MAX_QUEUE          - requests allowed to wait for a slot
+# ML_QUEUE_TIMEOUT_MS   - longest a request waits in the queue
+# MIN_FRAME_INTERVAL_MS - recommended interval when idle (grows with load up to MAX_FRAME_INTERVAL_MS)
+ML_MAX_INFLIGHT = int(os.getenv('ML_MAX_INFLIGHT', '0')) or max(ML_WORKERS or (os.cpu_count() or 1), PREDICT_MAX_BATCH)
+ML_MAX_QUEUE = int(os.getenv('ML_MAX_QUEUE', '32'))
+ML_QUEUE_TIMEOUT_MS = float(os.getenv('ML_QUEUE_TIMEOUT_MS', '2000'))
+MIN_FRAME_INTERVAL_MS = float(os.getenv('MIN_FRAME_INTERVAL_MS', '150'))
+MAX_FRAME_INTERVAL_MS = float(os.getenv('MAX_FRAME_INTERVAL_MS', '2000'))
+
+# ML_INIT: 'background' - start loading models in a thread at import (default)
+#          'lazy'       - start loading on the first ML request
+#          'eager'      - block the import until models are loaded (old behaviour)
+# Non-ML routes (login, leaderboard, lessons...) are served while models warm up.
+ML_INIT = os.getenv('ML_INIT', 'background').lower()
+
+import multiprocessing
+from numpy_model import NumpySequenceModel
+from template_index import TemplateIndex
+from frame_preprocess import crop_to_roi, decode_frame, hand_roi, uncrop_keypoints
+from model_registry import ModelRegistry, ModelVersion, load_model_file
+from hand_tracking import KEYPOINT_SIZE, create_hand_landmarker, extract_hand_keypoints, to_mp_image
+from sessions import DeltaGate, PracticeSession, SessionStore
+from admission import AdmissionController, AdmissionRejected
+from verification import VerificationPolicy
+from worker_pool import FrameTooLarge, InferenceWorkerPool
+
+# Gesture classifier versions - the routing is filled in by init_ml()
+model_registry = ModelRegistry(MODEL_REGISTRY_DIR, KEYPOINT_SIZE,
+                               max_batch_size=PREDICT_MAX_BATCH, max_wait_ms=PREDICT_BATCH_WINDOW_MS,
+                               predict_timeout_s=ML_PREDICT_TIMEOUT_S)
+
+# Filled in by init_ml()
+sequence_model = None
+template_index = None
+hand_detector = None
+practice_sessions = None
+worker_pool = None
+worker_classifier_version = None  # version whose probabilities the worker pool returns
+
+# The shared IMAGE-mode detector is not safe for concurrent use from Flask threads
+hand_detector_lock = threading.Lock()
+
+delta_gate = DeltaGate(GATING_THRESHOLD, GATING_MAX_SKIPS)
+
+verification_policy = VerificationPolicy(VERIFY_PASS_EVIDENCE, VERIFY_FAIL_EVIDENCE,
+                                         VERIFY_MIN_FRAMES, VERIFY_MAX_FRAMES,
+                                         max_total_frames=VERIFY_MAX_TOTAL_FRAMES)
+
+admission = AdmissionController(ML_MAX_INFLIGHT, ML_MAX_QUEUE, ML_QUEUE_TIMEOUT_MS,
+                                MIN_FRAME_INTERVAL_MS, MAX_FRAME_INTERVAL_MS)
+
+ML_STATE = {"status": "not_started", "error": None, "load_seconds": None, "warmup_ms": None}
+ml_init_lock = threading.Lock()
+
+def create_practice_session(session_id):
+    """New session - gets its own VIDEO-mode HandLandmarker on its first image frame"""
+    if hand_detector is not None and VIDEO_TRACKING:
+        return PracticeSession(session_id, lambda: create_hand_landmarker(HAND_MODEL_PATH, video_mode=True))
+    return PracticeSession(session_id)
+
+def load_gesture_model():
+    """
+    Load trained SINGLE-FRAME model (instant prediction, no 30-frame buffer needed)
+    from the ML_RUNTIME files - used when the model registry has no active version.
+    """
+    if ML_RUNTIME == 'tflite':
+        runtime, path = 'tflite', TFLITE_MODEL_PATH
+    elif ML_RUNTIME in ('auto', 'numpy') and os.path.exists(NUMPY_MODEL_PATH):
+        runtime, path = 'numpy', NUMPY_MODEL_PATH
+    elif ML_RUNTIME in ('auto', 'keras') and os.path.exists(MODEL_PATH):
+        runtime, path = 'keras', MODEL_PATH
     else:
-        gesture_model = None
-        print(f"[ML] WARNING: Model not found at {MODEL_PATH}")
-except Exception as e:
-    gesture_model = None
-    print(f"[ML] WARNING: Could not load model: {e}")
-
-# MediaPipe hand detector
-try:
-    import urllib.request
-    from mediapipe.tasks import python as mp_python
-    from mediapipe.tasks.python import vision as mp_vision
-    from mediapipe import Image as MpImage, ImageFormat as MpImageFormat
-
-    HAND_MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'ml_training', 'hand_landmarker.task')
-    if not os.path.exists(HAND_MODEL_PATH):
-        print("[ML] Downloading MediaPipe hand landmark model...")
-        url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
-        urllib.request.urlretrieve(url, HAND_MODEL_PATH)
-        print("[ML] Hand model downloaded!")
-
-    base_options = mp_python.BaseOptions(model_asset_path=HAND_MODEL_PATH)
-    hand_options = mp_vision.HandLandmarkerOptions(
-        base_options=base_options,
-        num_hands=2,
-        min_hand_detection_confidence=0.5,
-        min_hand_presence_confidence=0.5,
-        min_tracking_confidence=0.5
-    )
-    hand_detector = mp_vision.HandLandmarker.create_from_options(hand_options)
-    print("[ML] MediaPipe hand detector ready!")
-except Exception as e:
-    hand_detector = None
-    print(f"[ML] WARNING: Could not load MediaPipe: {e}")
-
-def extract_hand_keypoints(results):
-    """Extract keypoints from MediaPipe hand detection results"""
-    lh = np.zeros(21 * 3)
-    rh = np.zeros(21 * 3)
-
-    if results.hand_landmarks and results.handedness:
-        for idx, hand_landmarks in enumerate(results.hand_landmarks):
-            hand_label = results.handedness[idx][0].category_name
-            coords = np.array([[lm.x, lm.y, lm.z] for lm in hand_landmarks]).flatten()
-            if hand_label == "Left":
-                lh = coords
+        print(f"[ML] WARNING: No model found for ML_RUNTIME={ML_RUNTIME}")
+        return None
+    model = load_model_file(runtime, path)
+    print(f"[ML] Single-frame gesture model loaded ({runtime} runtime) from {path}")
+    return ModelVersion(f"legacy-{runtime}", runtime, ACTIONS, model, path,
+                        max_batch_size=PREDICT_MAX_BATCH, max_wait_ms=PREDICT_BATCH_WINDOW_MS,
+                        timeout_s=ML_PREDICT_TIMEOUT_S)
+
+def warm_up_ml():
+    """One pass through classifier + detector so the first real frame isn't slow"""
+    started = time.perf_counter()
+    primary = model_registry.primary()
+    if primary is not None:
+        primary.batcher.submit(np.full(KEYPOINT_SIZE, 0.5, dtype=np.float32))
+    if hand_detector is not None:
+        with hand_detector_lock:
+            hand_detector.detect(to_mp_image(np.zeros((240, 320, 3), dtype=np.uint8)))
+    return (time.perf_counter() - started) * 1000.0
+
+def init_ml():
+    """Load classifier, hand detector, session pool and worker pool, then warm up"""
+    global sequence_model, template_index, hand_detector, practice_sessions, worker_pool, worker_classifier_version
+
+    started = time.perf_counter()
+    ML_STATE["status"] = "loading"
+    try:
+        if model_registry.has_active():
+            try:
+                model_registry.load_active()
+            except Exception as e:
+                print(f"[ML] WARNING: Could not load the registry's active model: {e}")
+        if model_registry.primary() is None:
+            legacy_model = load_gesture_model()
+            if legacy_model is not None:
+                model_registry.install(legacy_model)
+        model_registry.start_polling(MODEL_REGISTRY_POLL_SECONDS)
+        if model_registry.primary() is not None:
+            print(f"[ML] Micro-batching enabled (window={PREDICT_BATCH_WINDOW_MS}ms, max_batch={PREDICT_MAX_BATCH})")
+
+        if SEQUENCE_MODEL:
+            if os.path.exists(SEQUENCE_MODEL_PATH):
+                sequence_model = NumpySequenceModel(SEQUENCE_MODEL_PATH)
+                print(f"[ML] Streaming sequence model loaded from {SEQUENCE_MODEL_PATH}")
+            else:
+                print(f"[ML] WARNING: Sequence model not found at {SEQUENCE_MODEL_PATH} "
+                      f"(run ml_training/train_model_sequence.py)")
+
+        if TEMPLATE_INDEX:
+            if os.path.exists(TEMPLATE_INDEX_PATH):
+                template_index = TemplateIndex.load(TEMPLATE_INDEX_PATH, TEMPLATE_K, TEMPLATE_MAX_DISTANCE)
+                print(f"[ML] Template index loaded: {len(template_index.vectors)} templates, "
+                      f"{len(template_index.vocabulary)} signs")
             else:
-                rh = coords
+                print(f"[ML] WARNING: Template index not found at {TEMPLATE_INDEX_PATH} "
+                      f"(run ml_training/build_template_index.py)")
+
+        # MediaPipe hand detector
+        if os.path.exists(HAND_MODEL_PATH):
+            try:
+                hand_detector = create_hand_landmarker(HAND_MODEL_PATH)
+                print("[ML] MediaPipe hand detector ready!")
+            except Exception as e:
+                print(f"[ML] WARNING: Could not load MediaPipe: {e}")
+        else:
+            print(f"[ML] WARNING: Hand model not found at {HAND_MODEL_PATH} - image prediction disabled "
+                  f"(run ml_training/fetch_hand_model.py)")
+
+        # Sessions hold gating state for every client (and a tracking detector for image clients)
+        practice_sessions = SessionStore(create_practice_session, SESSION_IDLE_SECONDS, MAX_SESSIONS,
+                                         sweep_interval=SESSION_IDLE_SECONDS / 2)
+
+        # Spawned workers re-import the main module; only the parent process may start the pool
+        if ML_WORKERS > 0 and hand_detector is not None and multiprocessing.parent_process() is None:
+            try:
+                # Workers can classify too when the active version runs on NumPy
+                primary = model_registry.primary()
+                worker_classifier = primary.path if primary is not None and primary.runtime == 'numpy' else None
+                worker_classifier_version = primary.version if worker_classifier else None
+                worker_pool = InferenceWorkerPool(
+                    ML_WORKERS, HAND_MODEL_PATH,
+                    classifier_path=worker_classifier,
+                    queue_depth=ML_WORKER_QUEUE_DEPTH,
+                    max_frame_pixels=ML_WORKER_MAX_PIXELS
+                )
+                atexit.register(worker_pool.close)
+                print(f"[ML] Inference worker pool started ({ML_WORKERS} workers, {worker_pool.queue_depth} slots)")
+            except Exception as e:
+                worker_pool = None
+                print(f"[ML] WARNING: Could not start worker pool: {e}")
+
+        ML_STATE["warmup_ms"] = round(warm_up_ml(), 1)
+        ML_STATE["status"] = "ready"
+    except Exception as e:
+        ML_STATE["status"] = "failed"
+        ML_STATE["error"] = str(e)
+        print(f"[ML] ERROR: ML initialization failed: {e}")
+    finally:
+        ML_STATE["load_seconds"] = round(time.perf_counter() - started, 3)
+        print(f"[ML] Initialization {ML_STATE['status']} in {ML_STATE['load_seconds']}s "
+              f"(warm-up {ML_STATE['warmup_ms']}ms)")
+
+def ensure_ml_started(block=False):
+    """Kick off init_ml() exactly once (in a background thread unless block=True)"""
+    with ml_init_lock:
+        if ML_STATE["status"] != "not_started":
+            return
+        ML_STATE["status"] = "loading"
+        if not block:
+            threading.Thread(target=init_ml, name='ml-init', daemon=True).start()
+            return
+    init_ml()
+
+def ml_not_ready(need_hand_detector=True):
+    """503 response while the ML stack is loading / unavailable, otherwise None"""
+    ensure_ml_started()
+    if ML_STATE["status"] in ("not_started", "loading"):
+        return jsonify({"error": "Model warming up", "sign": None, "confidence": 0}), 503
+    if model_registry.primary() is None or (need_hand_detector and not hand_detector):
+        return jsonify({"error": "Model not loaded", "sign": None, "confidence": 0}), 503
+    return None
+
+# Don't load models inside spawned worker processes that re-import this module
+if multiprocessing.parent_process() is None:
+    if ML_INIT == 'eager':
+        ensure_ml_started(block=True)
+    elif ML_INIT == 'background':
+        ensure_ml_started()
+
+def get_session_id():
+    """Client stream id from the X-Session-Id header (or ?session_id=)"""
+    session_id = request.headers.get('X-Session-Id') or request.args.get('session_id')
+    if session_id:
+        return session_id.strip()[:128] or None
+    return None
+
+def get_practice_session(session_id):
+    """Session for a client stream id (created on first use), or None without an id"""
+    if session_id and practice_sessions is not None:
+        return practice_sessions.get(session_id)
+    return None
+
+def detect_hands(frame_rgb, session=None):
+    """Run MediaPipe on an RGB frame - tracked per session when the session has a detector"""
+    mp_image = to_mp_image(frame_rgb)
+    if session is not None:
+        with session.lock:
+            detector = session.get_detector()
+            if detector is not None:
+                session.frames += 1
+                return detector.detect_for_video(mp_image, session.next_timestamp_ms())
+    with hand_detector_lock:
+        return hand_detector.detect(mp_image)
+
+
+def classify_keypoints(keypoints, probabilities=None, timer=None, session=None):
+    """
+    Run the classifier on one 126-value keypoint vector and build the response body.
+    Pass `probabilities` when they were already computed (e.g. by a worker process).
+    With a `session`, near-identical keypoints reuse the session's last result, the
+    streaming sequence model (if loaded) advances one step and an open verification
+    takes the frame as evidence.
+    """
+    result = classify_frame(keypoints, probabilities, timer, session)
+    if sequence_model is not None and session is not None:
+        sequence = step_sequence(session, keypoints)
+        if timer is not None:
+            timer.mark('sequence')
+        if sequence is not None:
+            result["sequence"] = sequence
+    if template_index is not None and result.get("hand_detected"):
+        result = dict(result, template=template_index.query(keypoints)[0])
+        if timer is not None:
+            timer.mark('template')
+    if session is not None and session.verification is not None:
+        result = dict(result)  # may be the gate's cached body - don't mutate it
+        with session.lock:
+            verification = session.verification
+            if verification is not None:
+                verification.update(result)
+                result["verification"] = verification.state()
+    return result
+
+
+def verification_verdict(session_id):
+    """Final verdict body for a session whose verification is already decided, else None"""
+    session = practice_sessions.peek(session_id) if session_id and practice_sessions is not None else None
+    verification = session.verification if session is not None else None
+    if verification is None or not verification.done:
+        return None
+    # No more frames are needed - answer without decoding or classifying
+    state = verification.state()
+    return {"sign": state["sign"], "confidence": state["confidence"], "verification": state}
+
+
+def step_sequence(session, keypoints):
+    """Advance the session's sequence-model state by one frame -> sequence result or None"""
+    hand_present = np.sum(np.abs(keypoints)) >= 0.01
+    with session.lock:
+        if not hand_present:
+            session.empty_frames += 1
+            # Hands dropped between signs (or not up yet) - start the next sign fresh
+            if session.sequence_state is None or session.empty_frames >= SEQUENCE_RESET_FRAMES:
+                session.sequence_state = None
+                session.sequence_frames = 0
+                session.sequence_window.clear()
+                return None
+        else:
+            session.empty_frames = 0
+
+        state = session.sequence_state if session.sequence_state is not None else sequence_model.initial_state()
+        if session.sequence_frames >= SEQUENCE_HORIZON:
+            # Past the trained window length the hidden state drifts - rebuild it from the
+            # latest frames (half a window, so this costs ~1 extra step per frame on average)
+            state = sequence_model.initial_state()
+            for frame in session.sequence_window:
+                _, state = sequence_model.step(frame, state)
+            session.sequence_frames = len(session.sequence_window)
+        probabilities, session.sequence_state = sequence_model.step(keypoints, state)
+        session.sequence_frames += 1
+        frames = session.sequence_frames
+        session.sequence_window.append(keypoints)
+        if len(session.sequence_window) > SEQUENCE_HORIZON // 2 - 1:
+            session.sequence_window.popleft()
+
+    best = int(np.argmax(probabilities))
+    return {
+        "sign": ACTIONS[best],
+        "confidence": round(float(probabilities[best]), 3),
+        "frames": frames
+    }
+
+
+def prediction_body(probabilities, version):
+    """Response body for one frame with a hand, from the class probabilities of `version`"""
+    labels = version.labels
+    predicted_index = np.argmax(probabilities)
+    confidence = float(probabilities[predicted_index])
+    predicted_sign = labels[predicted_index]
+    version.record_confidence(confidence)
+
+    return {
+        "sign": predicted_sign,
+        "confidence": round(confidence, 3),
+        "hand_detected": True,
+        "cached": False,
+        "model_version": version.version,
+        "all_predictions": {labels[i]: round(float(probabilities[i]), 3) for i in range(len(labels))}
+    }
+
+
+def classify_frame(keypoints, probabilities=None, timer=None, session=None):
+    """Single-frame classification (delta-gated per session) - see classify_keypoints"""
+    # Check if a hand was actually detected
+    if np.sum(np.abs(keypoints)) < 0.01:
+        return {
+            "sign": None,
+            "confidence": 0,
+            "hand_detected": False
+        }
+
+    # A/B routing: sticky per session, random for sessionless requests
+    version = model_registry.choose(session.session_id if session is not None else None)
+    if probabilities is not None and version.version != worker_classifier_version:
+        probabilities = None  # worker pool still runs a model this request isn't routed to
+
+    # An open verification needs a fresh prediction per frame, not replays of the last one
+    if probabilities is None and session is not None and session.verification is None:
+        cached = delta_gate.lookup(session, keypoints, key=version.version)
+        if cached is not None:
+            if timer is not None:
+                timer.mark('gate')
+            return dict(cached, cached=True)
+
+    # Single-frame prediction - batched with other in-flight requests
+    if probabilities is None:
+        probabilities = version.predict(keypoints)  # Shape: (num_actions,)
+        if timer is not None:
+            timer.mark('classify')
+
+    result = prediction_body(probabilities, version)
+    if session is not None:
+        delta_gate.store(session, keypoints, dict(result), key=version.version)
+    return result
+
+
+from metrics import LabeledTotals, StageHistograms, StageTimer
+
+# Per-stage latency histograms (p50/p95/p99) for each prediction entry point.
+# Stages: read, queue (waiting for an admission slot), decode, color, detect, keypoints,
+# classify (or 'worker' when the worker pool did detect + classify, 'gate' when a cached
+# result was reused), sequence (streaming model step), parse for landmark payloads.
+stage_latency = {
+    'predict': StageHistograms(),
+    'landmarks': StageHistograms(),
+    'stream': StageHistograms(),
+    'batch': StageHistograms(),
+}
+
+def timed_response(body, status, timer, endpoint):
+    """jsonify + Server-Timing header, and fold the stage timings into the histograms"""
+    stage_latency[endpoint].record(timer)
+    body["recommended_interval_ms"] = admission.recommended_interval_ms()
+    response = jsonify(body)
+    response.headers['Server-Timing'] = timer.server_timing()
+    return response, status
+
+def busy_response(message, status, retry_after_ms):
+    """429/503 when the inference path is saturated - tells the client how long to back off"""
+    response = jsonify({"error": message, "sign": None, "confidence": 0,
+                        "recommended_interval_ms": retry_after_ms})
+    response.headers['Retry-After'] = str(max(1, int(np.ceil(retry_after_ms / 1000.0))))
+    return response, status
+
+# Upload size per body encoding (json / raw / multipart) - shows the bandwidth win
+# of raw binary frames over base64-in-JSON
+predict_bytes_in = LabeledTotals()
+# decode_scale: 1 = full-size decode; roi_hit: 1 = hand found on the crop, 0 = fell back to full frame
+preprocess_stats = LabeledTotals()
+
+RAW_FRAME_MIMETYPES = ('image/jpeg', 'image/png', 'image/webp', 'application/octet-stream')
+MAX_FRAME_BYTES = int(os.getenv('MAX_FRAME_BYTES', str(8 * 1024 * 1024)))
+
+def read_stream_into_array(stream, length):
+    """Read exactly `length` bytes from a stream straight into a uint8 array (no temp bytes)"""
+    buffer = np.empty(length, dtype=np.uint8)
+    view = memoryview(buffer)
+    filled = 0
+    while filled < length:
+        n = stream.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return buffer[:filled]
+
+def read_frame_bytes():
+    """
+    Pull the encoded frame out of a /predict request.
+    Returns (uint8 array, body encoding) or (None, reason) when no frame is present.
+    """
+    if request.content_length and request.content_length > MAX_FRAME_BYTES:
+        return None, "Frame too large"
 
-    return np.concatenate([lh, rh])
+    if request.mimetype in RAW_FRAME_MIMETYPES:
+        if request.content_length:
+            nparr = read_stream_into_array(request.stream, request.content_length)
+        else:
+            # Chunked upload - length unknown, let Werkzeug buffer it once
+            nparr = np.frombuffer(request.get_data(cache=False), np.uint8)
+        predict_bytes_in.add('raw', nparr.size)
+        return nparr, 'raw'
+
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('image')
+        if upload is None:
+            return None, "No image provided"
+        nparr = np.frombuffer(upload.read(), np.uint8)
+        predict_bytes_in.add('multipart', request.content_length or nparr.size)
+        return nparr, 'multipart'
+
+    # Legacy JSON body: {"image": <base64>}
+    data = request.get_json(silent=True)
+    if not data or 'image' not in data:
+        return None, "No image provided"
+    nparr = np.frombuffer(base64.b64decode(data['image']), np.uint8)
+    predict_bytes_in.add('json', request.content_length or len(request.get_data()))
+    return nparr, 'json'
+
+
+def predict_encoded_frame(nparr, session_id=None, timer=None):
+    """Decode an encoded frame, find the hands and classify - None if the image is invalid"""
+    timer = timer or StageTimer()
+    frame, scale = decode_frame(nparr, DECODE_MAX_SIDE)
+    timer.mark('decode')
+    if frame is None:
+        return None
+    preprocess_stats.add('decode_scale', scale)
+
+    session = get_practice_session(session_id)
+    if worker_pool is not None and not (session is not None and VIDEO_TRACKING):
+        # Detection (and classification, when workers have the NumPy model) on another core
+        use_roi = ROI_CROP and session is not None
+        keypoints, probabilities = worker_frame_keypoints(frame, session.hand_roi if use_roi else None)
+        if use_roi:
+            session.hand_roi = hand_roi(keypoints, ROI_MARGIN)
+        timer.mark('worker')
+        return classify_keypoints(keypoints, probabilities, timer, session)
+
+    # Detect hands with MediaPipe, then classify
+    keypoints = detect_frame_keypoints(frame, session)
+    timer.mark('detect')
+    return classify_keypoints(keypoints, timer=timer, session=session)
+
+
+def worker_frame_keypoints(frame, roi=None):
+    """BGR frame -> (keypoints, probabilities) from the worker pool, cropped to `roi` first when given"""
+    keypoints, probabilities, roi_hit = worker_pool.submit(frame, roi=roi)
+    if roi_hit is not None:
+        preprocess_stats.add('roi_hit', int(roi_hit))
+    return keypoints, probabilities
+
+
+def detect_frame_keypoints(frame, session=None):
+    """BGR frame -> keypoints on the in-process detector (on a crop around the last hand with ROI_CROP)"""
+    import cv2
+    use_roi = ROI_CROP and session is not None and not VIDEO_TRACKING
+    roi = session.hand_roi if use_roi else None
+    keypoints = None
+    if roi is not None:
+        crop, box = crop_to_roi(frame, roi)
+        crop_keypoints = extract_hand_keypoints(detect_hands(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB), session))
+        hit = np.sum(np.abs(crop_keypoints)) >= 0.01
+        preprocess_stats.add('roi_hit', int(hit))
+        if hit:
+            keypoints = uncrop_keypoints(crop_keypoints, box, frame.shape)
+    if keypoints is None:
+        keypoints = extract_hand_keypoints(detect_hands(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), session))
+    if use_roi:
+        session.hand_roi = hand_roi(keypoints, ROI_MARGIN)
+    return keypoints
 
 
 # 17. GESTURE PREDICTION ENDPOINT (Single-Frame - Instant Feedback)
 @app.route('/predict', methods=['POST'])
 def predict_gesture():
     """
-    Receive a base64-encoded image frame, detect hand landmarks,
+    Receive an image frame, detect hand landmarks,
     and instantly predict the sign from a single frame.
     No frame buffer needed - gives immediate feedback!
+
+    Accepted bodies:
+      - application/json: {"image": <base64>}  (original format)
+      - image/jpeg, image/png or application/octet-stream: the raw encoded frame
+      - multipart/form-data with the frame in an 'image' file field
     """
-    if not gesture_model or not hand_detector:
-        return jsonify({"error": "Model not loaded", "sign": None, "confidence": 0}), 503
+    not_ready = ml_not_ready()
+    if not_ready:
+        return not_ready
 
+    timer = StageTimer()
     try:
-        data = request.get_json()
-        if not data or 'image' not in data:
-            return jsonify({"error": "No image provided", "sign": None, "confidence": 0}), 400
+        nparr, source = read_frame_bytes()
+        timer.mark('read')
+        if nparr is None:
+            return jsonify({"error": source, "sign": None, "confidence": 0}), 400
+        verdict = verification_verdict(get_session_id())
+        if verdict is not None:
+            return timed_response(verdict, 200, timer, 'predict')
+
+        # Body is already read - only the compute waits for a slot
+        admission.admit()
+        timer.mark('queue')
+        try:
+            result = predict_encoded_frame(nparr, get_session_id(), timer)
+        finally:
+            admission.release()
+        if result is None:
+            return jsonify({"error": "Invalid image", "sign": None, "confidence": 0}), 400
+        return timed_response(result, 200, timer, 'predict')
 
-        # Decode base64 image
-        image_data = base64.b64decode(data['image'])
-        nparr = np.frombuffer(image_data, np.uint8)
+    except AdmissionRejected as e:
+        return busy_response(str(e), e.status, e.retry_after_ms)
 
-        import cv2
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if frame is None:
-            return jsonify({"error": "Invalid image", "sign": None, "confidence": 0}), 400
+    except TimeoutError as e:
+        return busy_response(str(e), 503, admission.recommended_interval_ms())
 
-        # Detect hands with MediaPipe
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        mp_image = MpImage(image_format=MpImageFormat.SRGB, data=frame_rgb)
-        results = hand_detector.detect(mp_image)
+    except FrameTooLarge as e:
+        return jsonify({"error": str(e), "sign": None, "confidence": 0}), 413
 
-        # Extract keypoints
-        keypoints = extract_hand_keypoints(results)
+    except Exception as e:
+        print(f"[ML] Prediction error: {str(e)}")
+        return jsonify({"error": str(e), "sign": None, "confidence": 0}), 500
 
-        # Check if a hand was actually detected
-        if np.sum(np.abs(keypoints)) < 0.01:
-            return jsonify({
-                "sign": None,
-                "confidence": 0,
-                "hand_detected": False
-            }), 200
 
-        # Single-frame prediction - instant!
-        input_data = np.expand_dims(keypoints, axis=0)  # Shape: (1, 126)
-        prediction = gesture_model.predict(input_data, verbose=0)
-        predicted_index = np.argmax(prediction[0])
-        confidence = float(prediction[0][predicted_index])
-        predicted_sign = ACTIONS[predicted_index]
+# 17b. LANDMARK-ONLY PREDICTION (client already ran hand landmarking on-device)
+@app.route('/predict/landmarks', methods=['POST'])
+def predict_from_landmarks():
+    """
+    Classify a keypoint vector directly - no image decoding or MediaPipe on the server.
+    Same layout as extract_hand_keypoints: left hand 63 values, then right hand 63
+    (zeros for a missing hand). Accepts either:
+      - application/octet-stream: 126 little-endian float32 values (504 bytes)
+      - application/json: {"keypoints": [126 numbers]}
+    """
+    not_ready = ml_not_ready(need_hand_detector=False)
+    if not_ready:
+        return not_ready
+
+    timer = StageTimer()
+    try:
+        if request.mimetype == 'application/octet-stream':
+            body = request.get_data(cache=False)
+            if len(body) != KEYPOINT_SIZE * 4:
+                return jsonify({"error": f"Expected {KEYPOINT_SIZE * 4} bytes of float32 keypoints", "sign": None, "confidence": 0}), 400
+            keypoints = np.frombuffer(body, dtype='<f4')
+        else:
+            data = request.get_json(silent=True)
+            if not data or 'keypoints' not in data:
+                return jsonify({"error": "No keypoints provided", "sign": None, "confidence": 0}), 400
+            keypoints = np.asarray(data['keypoints'], dtype=np.float32)
+            if keypoints.shape != (KEYPOINT_SIZE,):
+                return jsonify({"error": f"Expected {KEYPOINT_SIZE} keypoint values", "sign": None, "confidence": 0}), 400
+
+        if not np.all(np.isfinite(keypoints)):
+            return jsonify({"error": "Keypoints must be finite numbers", "sign": None, "confidence": 0}), 400
+        timer.mark('parse')
+        verdict = verification_verdict(get_session_id())
+        if verdict is not None:
+            return timed_response(verdict, 200, timer, 'landmarks')
+
+        admission.admit()
+        timer.mark('queue')
+        try:
+            result = classify_keypoints(keypoints, timer=timer, session=get_practice_session(get_session_id()))
+        finally:
+            admission.release()
+        return timed_response(result, 200, timer, 'landmarks')
+
+    except AdmissionRejected as e:
+        return busy_response(str(e), e.status, e.retry_after_ms)
+    except TimeoutError as e:
+        return busy_response(str(e), 503, admission.recommended_interval_ms())
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid keypoints: {e}", "sign": None, "confidence": 0}), 400
+    except Exception as e:
+        print(f"[ML] Landmark prediction error: {str(e)}")
+        return jsonify({"error": str(e), "sign": None, "confidence": 0}), 500
+
 
-        return jsonify({
-            "sign": predicted_sign,
-            "confidence": round(confidence, 3),
-            "hand_detected": True,
-            "all_predictions": {ACTIONS[i]: round(float(prediction[0][i]), 3) for i in range(len(ACTIONS))}
-        }), 200
+# 17c. STREAMING PREDICTION (persistent WebSocket for live practice)
+# One connection per practice screen: the client pushes frames and gets a prediction
+# back on the same socket - no per-frame HTTP, CORS or connection setup.
+# Each connection gets its own VIDEO-mode detector and smoothed prediction.
+# For many concurrent streams per worker run under gevent/eventlet
+# (e.g. gunicorn -k gevent) so idle sockets don't each hold an OS thread.
+import uuid
+from streaming import StreamRegistry
+
+STREAM_SMOOTHING = float(os.getenv('STREAM_SMOOTHING', '0.5'))
+stream_connections = StreamRegistry(STREAM_SMOOTHING)
 
+try:
+    from flask_sock import Sock
+    sock = Sock(app)
+except ImportError:
+    sock = None
+    print("[ML] WARNING: flask-sock not installed - /predict/stream disabled")
+
+def handle_stream_message(message, connection, timer):
+    """
+    One client message -> one response dict.
+      binary message        : raw encoded frame (JPEG/PNG)
+      {"image": <base64>}   : encoded frame
+      {"keypoints": [126]}  : landmarks computed on-device
+      {"type": "reset"}     : clear tracking + smoothing for this connection
+    """
+    if isinstance(message, (bytes, bytearray)):
+        result = predict_encoded_frame(np.frombuffer(message, np.uint8), connection.connection_id, timer)
+    else:
+        data = json.loads(message)
+        timer.mark('parse')
+        if data.get('type') == 'reset':
+            connection.smooth(None)
+            if practice_sessions is not None:
+                practice_sessions.discard(connection.connection_id)
+            return {"type": "reset", "message": "Stream state cleared"}
+        if 'keypoints' in data:
+            keypoints = np.asarray(data['keypoints'], dtype=np.float32)
+            if keypoints.shape != (KEYPOINT_SIZE,) or not np.all(np.isfinite(keypoints)):
+                return {"error": f"Expected {KEYPOINT_SIZE} keypoint values", "sign": None, "confidence": 0}
+            result = classify_keypoints(keypoints, timer=timer,
+                                        session=get_practice_session(connection.connection_id))
+        elif 'image' in data:
+            result = predict_encoded_frame(np.frombuffer(base64.b64decode(data['image']), np.uint8),
+                                           connection.connection_id, timer)
+        else:
+            return {"error": "No image provided", "sign": None, "confidence": 0}
+
+    if result is None:
+        return {"error": "Invalid image", "sign": None, "confidence": 0}
+
+    # Smooth over the connection's recent frames to steady the on-screen feedback
+    if result.get('hand_detected'):
+        labels = list(result['all_predictions'])
+        smoothed = connection.smooth([result['all_predictions'][a] for a in labels])
+        best = int(np.argmax(smoothed))
+        result['smoothed_sign'] = labels[best]
+        result['smoothed_confidence'] = round(float(smoothed[best]), 3)
+    else:
+        connection.smooth(None)
+    return result
+
+if sock is not None:
+    @sock.route('/predict/stream')
+    def predict_stream(ws):
+        """WebSocket: push frames, receive one JSON prediction per frame"""
+        ensure_ml_started()
+        if ML_STATE["status"] != "ready" or model_registry.primary() is None:
+            ws.send(json.dumps({"error": "Model not loaded", "sign": None, "confidence": 0}))
+            return
+
+        connection = stream_connections.open(f"ws-{uuid.uuid4().hex[:12]}")
+        print(f"[STREAM] {connection.connection_id} opened")
+        try:
+            while True:
+                message = ws.receive()
+                if message is None:
+                    break
+                timer = StageTimer()
+                try:
+                    admission.admit()
+                    timer.mark('queue')
+                    try:
+                        result = handle_stream_message(message, connection, timer)
+                    finally:
+                        admission.release()
+                except AdmissionRejected as e:
+                    # Frame dropped - the client should send the next one after the interval
+                    result = {"error": str(e), "status": e.status, "sign": None, "confidence": 0}
+                except TimeoutError as e:
+                    result = {"error": str(e), "status": 503, "sign": None, "confidence": 0}
+                except FrameTooLarge as e:
+                    result = {"error": str(e), "status": 413, "sign": None, "confidence": 0}
+                except Exception as e:
+                    print(f"[STREAM] {connection.connection_id} frame error: {str(e)}")
+                    result = {"error": str(e), "sign": None, "confidence": 0}
+                timer.mark('respond')
+                latency = timer.total()
+                stage_latency['stream'].record(timer)
+                connection.record(latency, error='error' in result)
+                result['frame'] = connection.frames
+                result['latency_ms'] = round(latency * 1000.0, 2)
+                result['recommended_interval_ms'] = admission.recommended_interval_ms()
+                ws.send(json.dumps(result))
+        finally:
+            stream_connections.close(connection)
+            if practice_sessions is not None:
+                practice_sessions.discard(connection.connection_id)
+            print(f"[STREAM] {connection.connection_id} closed after {connection.frames} frames")
+
+
+# 17d. MULTI-FRAME BATCH PREDICTION (one request per burst of frames)
+# Amortizes HTTP + model-call overhead on high-latency mobile links: frames are decoded
+# in parallel, hands detected (in parallel across the worker pool when it is on, in
+# order on the session's tracking detector when a session id is sent), and every
+# frame with a hand is classified in ONE batched forward pass.
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_BATCH_FRAMES = int(os.getenv('MAX_BATCH_FRAMES', '16'))
+batch_executor = ThreadPoolExecutor(max_workers=int(os.getenv('BATCH_DECODE_THREADS', str(min(4, os.cpu_count() or 1)))),
+                                    thread_name_prefix='batch-decode')
+
+def decode_batch_frame(nparr):
+    """Encoded bytes -> BGR frame (None if invalid); cv2 releases the GIL so threads overlap"""
+    frame, scale = decode_frame(nparr, DECODE_MAX_SIDE)
+    if frame is not None:
+        preprocess_stats.add('decode_scale', scale)
+    return frame
+
+def detect_keypoints_many(frames, session=None):
+    """Keypoints (or None for undecodable frames) for a burst of decoded frames"""
+    if session is not None and VIDEO_TRACKING and hand_detector is not None:
+        # The tracking detector needs frames in order
+        return [detect_frame_keypoints(frame, session) if frame is not None else None for frame in frames]
+    if worker_pool is not None:
+        # The burst runs in parallel, so with ROI_CROP every frame is cropped around the hand
+        # found before it; the last frame with a hand sets the box for the next request
+        use_roi = ROI_CROP and session is not None
+        roi = session.hand_roi if use_roi else None
+        submit = lambda frame: worker_frame_keypoints(frame, roi)[0] if frame is not None else None
+        keypoints = list(batch_executor.map(submit, frames))
+        if use_roi:
+            found = [k for k in keypoints if k is not None and np.sum(np.abs(k)) >= 0.01]
+            session.hand_roi = hand_roi(found[-1], ROI_MARGIN) if found else None
+        return keypoints
+    return [detect_frame_keypoints(frame, session) if frame is not None else None for frame in frames]
+
+def read_batch_inputs():
+    """
+    Pull the frames or keypoint vectors out of a /predict/batch request.
+    Returns ('images', [uint8 arrays]) / ('keypoints', (N, 126) array), or (None, error).
+    """
+    if request.content_length and request.content_length > MAX_FRAME_BYTES * MAX_BATCH_FRAMES:
+        return None, "Batch too large"
+
+    if request.mimetype == 'application/octet-stream':
+        body = request.get_data(cache=False)
+        if not body or len(body) % (KEYPOINT_SIZE * 4):
+            return None, f"Expected a multiple of {KEYPOINT_SIZE * 4} bytes of float32 keypoints"
+        predict_bytes_in.add('batch_raw', len(body))
+        return 'keypoints', np.frombuffer(body, dtype='<f4').reshape(-1, KEYPOINT_SIZE)
+
+    if request.mimetype == 'multipart/form-data':
+        uploads = request.files.getlist('images') or request.files.getlist('image')
+        if not uploads:
+            return None, "No images provided"
+        predict_bytes_in.add('batch_multipart', request.content_length or 0)
+        return 'images', [np.frombuffer(upload.read(), np.uint8) for upload in uploads]
+
+    data = request.get_json(silent=True) or {}
+    if 'keypoints' in data:
+        keypoints = np.asarray(data['keypoints'], dtype=np.float32)
+        if keypoints.ndim != 2 or keypoints.shape[1] != KEYPOINT_SIZE:
+            return None, f"Expected a list of {KEYPOINT_SIZE}-value keypoint vectors"
+        return 'keypoints', keypoints
+    if data.get('images'):
+        predict_bytes_in.add('batch_json', request.content_length or 0)
+        return 'images', [np.frombuffer(base64.b64decode(image), np.uint8) for image in data['images']]
+    return None, "No images or keypoints provided"
+
+def aggregate_vote(results):
+    """Majority sign over the frames with a hand (ties -> higher mean confidence)"""
+    hand_results = [r for r in results if r.get('hand_detected')]
+    if not hand_results:
+        return {"sign": None, "confidence": 0, "votes": {}, "frames": len(results), "hand_frames": 0}
+    votes, confidence_sums = {}, {}
+    for r in hand_results:
+        votes[r['sign']] = votes.get(r['sign'], 0) + 1
+        confidence_sums[r['sign']] = confidence_sums.get(r['sign'], 0.0) + r['confidence']
+    winner = max(votes, key=lambda sign: (votes[sign], confidence_sums[sign]))
+    return {
+        "sign": winner,
+        "confidence": round(confidence_sums[winner] / votes[winner], 3),
+        "agreement": round(votes[winner] / len(hand_results), 3),
+        "votes": votes,
+        "frames": len(results),
+        "hand_frames": len(hand_results),
+    }
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Classify a burst of up to MAX_BATCH_FRAMES frames in one request.
+    Accepted bodies:
+      - application/json: {"images": [<base64>, ...]} or {"keypoints": [[126 numbers], ...]}
+      - multipart/form-data with the frames in 'images' file fields (in capture order)
+      - application/octet-stream: N x 126 little-endian float32 keypoints
+    Returns per-frame results in order plus an aggregated "vote".
+    """
+    not_ready = ml_not_ready(need_hand_detector=False)
+    if not_ready:
+        return not_ready
+
+    timer = StageTimer()
+    try:
+        kind, inputs = read_batch_inputs()
+        timer.mark('read')
+        if kind is None:
+            return jsonify({"error": inputs, "sign": None, "confidence": 0}), 400
+        if len(inputs) > MAX_BATCH_FRAMES:
+            return jsonify({"error": f"At most {MAX_BATCH_FRAMES} frames per batch", "sign": None, "confidence": 0}), 400
+        if kind == 'images' and not hand_detector:
+            return jsonify({"error": "Model not loaded", "sign": None, "confidence": 0}), 503
+        if kind == 'keypoints' and not np.all(np.isfinite(inputs)):
+            return jsonify({"error": "Keypoints must be finite numbers", "sign": None, "confidence": 0}), 400
+
+        session = get_practice_session(get_session_id())
+        admission.admit()
+        timer.mark('queue')
+        try:
+            if kind == 'images':
+                frames = list(batch_executor.map(decode_batch_frame, inputs))
+                timer.mark('decode')
+                keypoints = detect_keypoints_many(frames, session)
+                timer.mark('detect')
+            else:
+                keypoints = list(inputs)
+
+            # One forward pass for every frame with a hand, on the version this client is routed to
+            version = model_registry.choose(session.session_id if session is not None else None)
+            hand_rows = [i for i, k in enumerate(keypoints) if k is not None and np.sum(np.abs(k)) >= 0.01]
+            probabilities = version.predict_many(np.stack([keypoints[i] for i in hand_rows])) if hand_rows else []
+            timer.mark('classify')
+        finally:
+            admission.release()
+
+        results = []
+        for k in keypoints:
+            if k is None:
+                results.append({"error": "Invalid image", "sign": None, "confidence": 0})
+            else:
+                results.append({"sign": None, "confidence": 0, "hand_detected": False})
+        for i, row in zip(hand_rows, probabilities):
+            results[i] = prediction_body(row, version)
+        if template_index is not None and hand_rows:
+            # One distance matmul for the whole burst
+            for i, match in zip(hand_rows, template_index.query(np.stack([keypoints[i] for i in hand_rows]))):
+                results[i]["template"] = match
+            timer.mark('template')
+
+        return timed_response({
+            "frames": results,
+            "vote": aggregate_vote(results),
+            "model_version": version.version,
+        }, 200, timer, 'batch')
+
+    except AdmissionRejected as e:
+        return busy_response(str(e), e.status, e.retry_after_ms)
+    except TimeoutError as e:
+        return busy_response(str(e), 503, admission.recommended_interval_ms())
+    except FrameTooLarge as e:
+        return jsonify({"error": str(e), "sign": None, "confidence": 0}), 413
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid batch: {e}", "sign": None, "confidence": 0}), 400
     except Exception as e:
-        print(f"[ML] Prediction error: {str(e)}")
+        print(f"[ML] Batch prediction error: {str(e)}")
         return jsonify({"error": str(e), "sign": None, "confidence": 0}), 500
 
 
-# 18. RESET PREDICTION (kept for backward compatibility)
+# 18. RESET PREDICTION (clear a session's sequence state and cached prediction)
 @app.route('/predict/reset', methods=['POST'])
 def reset_prediction():
-    """No longer needed for single-frame model, but kept for compatibility"""
-    return jsonify({"message": "Single-frame model - no buffer to reset"}), 200
+    """
+    Start the caller's session over - call it when a new sign is expected.
+    Identified by X-Session-Id (or ?session_id=); without one there is nothing to clear.
+    """
+    session_id = get_session_id()
+    session = practice_sessions.peek(session_id) if session_id and practice_sessions is not None else None
+    if session is None:
+        return jsonify({"message": "No session state to reset", "reset": False}), 200
+    session.reset()
+    return jsonify({"message": "Session state cleared", "session_id": session_id, "reset": True}), 200
+
+
+# 18b. SIGN VERIFICATION (server-side grading of "show the sign" questions)
+@app.route('/predict/verify', methods=['POST', 'GET', 'DELETE'])
+def sign_verification():
+    """
+    POST   {"target_sign": "HELLO"} - start grading the caller's session against a sign
+                                      (clears its previous prediction state, like /predict/reset)
+    GET    - current verification state
+    DELETE - abandon it
+
+    Frames then go to /predict or /predict/landmarks with the same X-Session-Id; their
+    responses carry a "verification" block. Once its "done" is true the status
+    ("passed" / "failed") is final and the client should stop sending frames.
+    """
+    not_ready = ml_not_ready(need_hand_detector=False)
+    if not_ready:
+        return not_ready
+    session_id = get_session_id()
+    if not session_id:
+        return jsonify({"error": "X-Session-Id header required"}), 400
+
+    if request.method == 'GET':
+        session = practice_sessions.peek(session_id)
+        if session is None or session.verification is None:
+            return jsonify({"error": "No verification in progress"}), 404
+        return jsonify({"verification": session.verification.state()}), 200
+
+    if request.method == 'DELETE':
+        session = practice_sessions.peek(session_id)
+        if session is None or session.verification is None:
+            return jsonify({"message": "No verification in progress", "cancelled": False}), 200
+        with session.lock:
+            session.verification = None
+        return jsonify({"message": "Verification cancelled", "cancelled": True}), 200
+
+    data = request.get_json(silent=True) or {}
+    target_sign = data.get('target_sign')
+    if not target_sign:
+        return jsonify({"error": "target_sign required"}), 400
+    version = model_registry.choose(session_id)
+    if target_sign not in version.labels:
+        return jsonify({"error": f"Unknown sign '{target_sign}'"}), 400
+
+    session = practice_sessions.get(session_id)
+    session.reset()
+    with session.lock:
+        session.verification = verification_policy.start(target_sign)
+        state = session.verification.state()
+    return jsonify({"message": "Verification started", "verification": state}), 200
+
+
+# 19. PREDICTION STATS (Admin only - batch sizes achieved by the micro-batcher)
+@app.route('/predict/stats', methods=['GET'])
+def prediction_stats():
+    """Report inference pipeline stats for tuning throughput vs latency (admin token required)"""
+    auth_error = admin_auth_error()
+    if auth_error:
+        return auth_error
+    primary = model_registry.primary()
+    return jsonify({
+        "batching": primary.batcher.stats() if primary else None,
+        "models": model_registry.stats(),
+        "bytes_in": predict_bytes_in.snapshot(),
+        "preprocess": preprocess_stats.snapshot(),
+        "sessions": practice_sessions.stats() if practice_sessions else None,
+        "gating": delta_gate.stats(),
+        "verification": verification_policy.stats(),
+        "templates": template_index.stats() if template_index else None,
+        "admission": admission.stats(),
+        "workers": worker_pool.stats() if worker_pool else None,
+        "streams": stream_connections.stats(),
+        "stage_latency": {endpoint: histograms.snapshot() for endpoint, histograms in stage_latency.items()}
+    }), 200
+
+
+# 20. LIVENESS / READINESS PROBES
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Process is up and serving requests (ML may still be warming up)"""
+    return jsonify({"status": "ok"}), 200
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Ready only once the ML stack has loaded and warmed up"""
+    ensure_ml_started()
+    body = dict(ML_STATE)
+    primary = model_registry.primary()
+    body["gesture_model"] = primary is not None
+    body["model_version"] = primary.version if primary else None
+    body["sequence_model"] = sequence_model is not None
+    body["template_index"] = template_index is not None
+    body["hand_detector"] = hand_detector is not None
+    ready = ML_STATE["status"] == "ready" and primary is not None
+    return jsonify(body), 200 if ready else 503
+
+
+# 21. MODEL REGISTRY (Admin only) - list versions, hot-swap, canary traffic split
+def admin_auth_error():
+    """401/403 response unless the request carries an admin token, otherwise None"""
+    auth_header = request.headers.get('Authorization')
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return jsonify({"message": "Unauthorized"}), 401
+    try:
+        payload = jwt.decode(auth_header.split(' ')[1], app.config['SECRET_KEY'], algorithms=["HS256"])
+    except jwt.ExpiredSignatureError:
+        return jsonify({"message": "Token expired"}), 401
+    except jwt.InvalidTokenError:
+        return jsonify({"message": "Invalid token"}), 401
+    if payload.get('role') != 'admin':
+        return jsonify({"message": "Admin access required"}), 403
+    return None
+
+@app.route('/admin/api/models', methods=['GET'])
+def list_models():
+    """Registered versions (with labels + input spec), current routing and per-version stats"""
+    auth_error = admin_auth_error()
+    if auth_error:
+        return auth_error
+    return jsonify({
+        "registry": MODEL_REGISTRY_DIR,
+        "available": model_registry.available(),
+        "serving": model_registry.stats(),
+    }), 200
+
+@app.route('/admin/api/models/activate', methods=['POST'])
+def activate_model():
+    """
+    Body: {"version": "<active>", "canary": "<version>", "canary_percent": 10}
+    The new version is loaded and warmed up while the current one keeps serving,
+    then swapped in atomically; other worker processes follow via active.json.
+    """
+    auth_error = admin_auth_error()
+    if auth_error:
+        return auth_error
+
+    data = request.get_json(silent=True) or {}
+    if not data.get('version'):
+        return jsonify({"message": "version is required"}), 400
+    try:
+        canary_percent = int(data.get('canary_percent', 0))
+    except (TypeError, ValueError):
+        return jsonify({"message": "canary_percent must be an integer 0-100"}), 400
+
+    try:
+        routing = model_registry.activate(data['version'], data.get('canary'), canary_percent)
+    except KeyError as e:
+        return jsonify({"message": str(e.args[0])}), 404
+    except Exception as e:
+        print(f"[ML] Model activation failed: {e}")
+        return jsonify({"message": f"Could not load model: {e}"}), 400
+
+    print(f"[ML] Admin {request.remote_addr} activated {routing}")
+    return jsonify({"message": "Model routing updated", "routing": routing}), 200
 
 
 if __name__ == '__main__':
@@ -0,0 +1,164 @@
+# backend/batching.py
+"""
+Cross-request micro-batching for the gesture classifier.
+
+Concurrent /predict requests each hand one 126-value keypoint row to the
+batcher. A single background thread collects rows for a short window (or
+until the batch is full), runs ONE forward pass over the stacked batch and
+hands every caller back its own row of probabilities.
+
+The window only applies under concurrent load (the previous batch had more
+than one row). A lone caller is flushed as soon as the queue is empty, so an
+idle server doesn't add the window to every prediction.
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+class _PendingRow:
+    """One caller's keypoint row waiting for its slice of a batched result"""
+    __slots__ = ('row', 'done', 'result', 'error')
+
+    def __init__(self, row):
+        self.row = row
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Collect rows from many threads and run them through `predict_fn` together.
+
+    predict_fn    -- callable taking an (N, features) array, returning (N, classes)
+    max_batch_size -- flush as soon as this many rows are waiting
+    max_wait_ms    -- how long the first row of a batch may wait for company
+                      (only while requests are arriving concurrently)
+    """
+
+    def __init__(self, predict_fn, max_batch_size=16, max_wait_ms=5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._rows = 0
+        self._largest_batch = 0
+        self._size_counts = {}
+        self._last_batch_size = 0
+        self._windowed_batches = 0
+
+        self._worker = threading.Thread(target=self._run, name='predict-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, row, timeout=None):
+        """Queue one keypoint row and block until its prediction row is ready"""
+        if self._closed:
+            raise RuntimeError("Batcher is closed")
+        pending = _PendingRow(np.asarray(row, dtype=np.float32))
+        self._queue.put(pending)
+        if not pending.done.wait(timeout):
+            raise TimeoutError("Prediction batch did not complete in time")
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def submit_many(self, rows, timeout=None):
+        """
+        Queue several rows back to back so they share a forward pass (up to
+        max_batch_size per pass) and block until all are ready -> (N, classes)
+        """
+        if self._closed:
+            raise RuntimeError("Batcher is closed")
+        pendings = [_PendingRow(np.asarray(row, dtype=np.float32)) for row in rows]
+        for pending in pendings:
+            self._queue.put(pending)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for pending in pendings:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if not pending.done.wait(remaining):
+                raise TimeoutError("Prediction batch did not complete in time")
+            if pending.error is not None:
+                raise pending.error
+        return np.stack([pending.result for pending in pendings])
+
+    def close(self):
+        """Stop the worker thread once the rows already queued have been served"""
+        self._closed = True
+        self._queue.put(None)
+
+    def stats(self):
+        """Achieved batch sizes so the window/size knobs can be tuned"""
+        with self._stats_lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait * 1000.0, 3),
+                "batches": self._batches,
+                "rows": self._rows,
+                "avg_batch_size": round(self._rows / self._batches, 3) if self._batches else 0,
+                "largest_batch": self._largest_batch,
+                "batch_size_counts": {str(k): v for k, v in sorted(self._size_counts.items())},
+                "windowed_batches": self._windowed_batches,
+                "queued": self._queue.qsize(),
+            }
+
+    def _collect(self):
+        """
+        Block for the first row, then gather more until full or the window closes.
+        Without concurrent load the window is skipped: take what is already queued and go.
+        """
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        windowed = self._last_batch_size > 1 or not self._queue.empty()
+        deadline = time.perf_counter() + (self.max_wait if windowed else 0.0)
+        if windowed:
+            with self._stats_lock:
+                self._windowed_batches += 1
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    pending = self._queue.get_nowait()
+                else:
+                    pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if pending is None:
+                # close() - serve this batch, stop on the next collect
+                self._queue.put(None)
+                break
+            batch.append(pending)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            try:
+                output = np.asarray(self.predict_fn(np.stack([p.row for p in batch])))
+                for i, pending in enumerate(batch):
+                    pending.result = output[i]
+            except Exception as e:
+                for pending in batch:
+                    pending.error = e
+            finally:
+                for pending in batch:
+                    pending.done.set()
+
+            with self._stats_lock:
+                size = len(batch)
+                self._last_batch_size = size
+                self._batches += 1
+                self._rows += size
+                self._largest_batch = max(self._largest_batch, size)
+                self._size_counts[size] = self._size_counts.get(size, 0) + 1
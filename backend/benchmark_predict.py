@@ -0,0 +1,275 @@
+# backend/benchmark_predict.py
+"""
+Replay benchmark for the prediction endpoints.
+
+Replays a corpus of recorded JPEG frames against /predict and/or synthetic
+keypoint vectors (taken from ml_training/data) against /predict/landmarks,
+either in-process through Flask's test client or over HTTP against a running
+server, at a configurable concurrency. Reports requests/sec, latency
+percentiles, status codes, CPU time and RSS per process, and writes the whole
+run as JSON so runs can be compared across model / runtime changes.
+
+Usage:
+    # in-process, keypoints only (no hand model needed)
+    python benchmark_predict.py --target landmarks --concurrency 1 4 16
+
+    # over HTTP against `python app.py`, recorded frames, server PIDs for CPU/RSS
+    python benchmark_predict.py --mode http --url http://127.0.0.1:5000 \\
+        --target predict --frames-dir ./recorded_frames --server-pids 1234 1235
+
+    # compare runtimes
+    ML_RUNTIME=keras  python benchmark_predict.py --output keras.json
+    ML_RUNTIME=numpy  python benchmark_predict.py --output numpy.json
+"""
+
+import argparse
+import base64
+import glob
+import http.client
+import json
+import os
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_PATH = os.path.join(BACKEND_DIR, '..', 'ml_training', 'data')
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+# ---------- corpus ----------
+
+def load_frames(frames_dir, limit):
+    """Recorded JPEG/PNG frames as raw bytes"""
+    paths = sorted(glob.glob(os.path.join(frames_dir, '*.jpg')) +
+                   glob.glob(os.path.join(frames_dir, '*.jpeg')) +
+                   glob.glob(os.path.join(frames_dir, '*.png')))[:limit]
+    frames = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            frames.append(f.read())
+    return frames
+
+
+def load_keypoints(data_path, limit, jitter, seed=0):
+    """Keypoint vectors with a hand present, optionally jittered to avoid identical inputs"""
+    rows = []
+    for path in sorted(glob.glob(os.path.join(data_path, '*', '*', '*.npy'))):
+        row = np.load(path)
+        if np.sum(np.abs(row)) >= 0.01:
+            rows.append(row)
+        if len(rows) >= limit:
+            break
+    if not rows:
+        rows = [np.random.default_rng(seed).random(126)]
+    X = np.array(rows, dtype=np.float32)
+    if jitter > 0:
+        rng = np.random.default_rng(seed)
+        X = X + (rng.standard_normal(X.shape) * jitter * (X != 0)).astype(np.float32)
+    return [row.astype('<f4').tobytes() for row in X]
+
+
+def build_requests(args):
+    """List of (path, body bytes, content type) to replay round-robin"""
+    requests = []
+    if args.target in ('predict', 'both'):
+        frames = load_frames(args.frames_dir, args.limit) if args.frames_dir else []
+        if not frames:
+            raise SystemExit("--target predict needs --frames-dir with recorded .jpg/.png frames")
+        for frame in frames:
+            if args.encoding == 'raw':
+                requests.append(('/predict', frame, 'image/jpeg'))
+            else:
+                body = json.dumps({"image": base64.b64encode(frame).decode('ascii')}).encode()
+                requests.append(('/predict', body, 'application/json'))
+    if args.target in ('landmarks', 'both'):
+        for body in load_keypoints(args.data_path, args.limit, args.jitter):
+            requests.append(('/predict/landmarks', body, 'application/octet-stream'))
+    return requests
+
+
+# ---------- process stats ----------
+
+def process_cpu_seconds(pid):
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    except (OSError, IndexError, ValueError):
+        if pid == os.getpid():
+            times = os.times()
+            return times.user + times.system
+        return None
+
+
+def process_rss_mb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024.0, 1)
+    except OSError:
+        pass
+    return None
+
+
+# ---------- clients ----------
+
+class InProcessClient:
+    def __init__(self):
+        import app as backend
+        self.backend = backend
+        backend.ensure_ml_started(block=True)
+        self.client = backend.app.test_client()
+
+    def post(self, path, body, content_type, session_id=None):
+        headers = {'X-Session-Id': session_id} if session_id else {}
+        response = self.client.post(path, data=body, content_type=content_type, headers=headers)
+        return response.status_code
+
+    def stats(self):
+        """/predict/stats is admin-only - sign a short-lived admin token with the app's key"""
+        import datetime
+        import jwt
+        token = jwt.encode({'role': 'admin', 'exp': datetime.datetime.utcnow() + datetime.timedelta(minutes=5)},
+                           self.backend.app.config['SECRET_KEY'], algorithm="HS256")
+        return self.client.get('/predict/stats', headers={'Authorization': f'Bearer {token}'}).get_json()
+
+
+class HttpClient:
+    """One keep-alive connection per thread"""
+
+    def __init__(self, url):
+        parsed = urlparse(url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self._local = threading.local()
+
+    def post(self, path, body, content_type, session_id=None):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        headers = {'Content-Type': content_type}
+        if session_id:
+            headers['X-Session-Id'] = session_id
+        try:
+            connection.request('POST', path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            self._local.connection = None
+            return 'error'
+
+
+# ---------- run ----------
+
+def run_level(client, requests, concurrency, total, warmup, sessions):
+    counter = iter(range(total + warmup))
+    lock = threading.Lock()
+    latencies = []
+    statuses = {}
+
+    def worker(worker_id):
+        session_id = f'bench-{worker_id}' if sessions else None
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            path, body, content_type = requests[i % len(requests)]
+            started = time.perf_counter()
+            status = client.post(path, body, content_type, session_id)
+            elapsed = time.perf_counter() - started
+            if i >= warmup:
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    wall = time.perf_counter() - started
+
+    ms = np.array(latencies) * 1000.0
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "wall_s": round(wall, 3),
+        "requests_per_s": round(len(latencies) / wall, 1) if wall else None,
+        "latency_ms": {
+            "mean": round(float(ms.mean()), 3),
+            "p50": round(float(np.percentile(ms, 50)), 3),
+            "p95": round(float(np.percentile(ms, 95)), 3),
+            "p99": round(float(np.percentile(ms, 99)), 3),
+            "max": round(float(ms.max()), 3),
+        } if len(ms) else None,
+        "status_counts": statuses,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay benchmark for /predict and /predict/landmarks")
+    parser.add_argument('--mode', choices=['inprocess', 'http'], default='inprocess')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--target', choices=['predict', 'landmarks', 'both'], default='landmarks')
+    parser.add_argument('--encoding', choices=['raw', 'json'], default='raw', help="frame upload format for /predict")
+    parser.add_argument('--frames-dir', help="directory of recorded .jpg/.png frames")
+    parser.add_argument('--data-path', default=DEFAULT_DATA_PATH, help="keypoint data tree for synthetic vectors")
+    parser.add_argument('--limit', type=int, default=2000, help="max corpus items of each kind")
+    parser.add_argument('--jitter', type=float, default=0.0, help="gaussian noise added to keypoints")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=2000, help="measured requests per concurrency level")
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--sessions', action='store_true', help="send a per-thread X-Session-Id")
+    parser.add_argument('--server-pids', type=int, nargs='*', default=[], help="HTTP mode: PIDs to sample CPU/RSS")
+    parser.add_argument('--label', default='', help="free-form tag stored in the result (e.g. runtime name)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args()
+
+    requests = build_requests(args)
+    client = InProcessClient() if args.mode == 'inprocess' else HttpClient(args.url)
+    pids = [os.getpid()] if args.mode == 'inprocess' else args.server_pids
+
+    levels = []
+    for concurrency in args.concurrency:
+        cpu_before = {pid: process_cpu_seconds(pid) for pid in pids}
+        level = run_level(client, requests, concurrency, args.requests, args.warmup, args.sessions)
+        level["processes"] = []
+        for pid in pids:
+            before, after = cpu_before[pid], process_cpu_seconds(pid)
+            cpu = after - before if before is not None and after is not None else None
+            level["processes"].append({
+                "pid": pid,
+                "cpu_s": round(cpu, 3) if cpu is not None else None,
+                "cpu_util": round(cpu / level["wall_s"], 3) if cpu is not None and level["wall_s"] else None,
+                "rss_mb": process_rss_mb(pid),
+            })
+        levels.append(level)
+        lat = level["latency_ms"] or {}
+        print(f"c={concurrency:<4} {level['requests_per_s']:>9} req/s | p50 {lat.get('p50')} ms | "
+              f"p95 {lat.get('p95')} ms | p99 {lat.get('p99')} ms | {level['status_counts']}")
+
+    result = {
+        "label": args.label,
+        "mode": args.mode,
+        "target": args.target,
+        "encoding": args.encoding,
+        "corpus_size": len(requests),
+        "env": {key: os.environ.get(key) for key in
+                ('ML_RUNTIME', 'ML_WORKERS', 'PREDICT_BATCH_WINDOW_MS', 'PREDICT_MAX_BATCH', 'VIDEO_TRACKING',
+                 'GATING_THRESHOLD')},
+        "host": {"python": platform.python_version(), "cpus": os.cpu_count(), "machine": platform.machine()},
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "levels": levels,
+    }
+    if args.mode == 'inprocess':
+        result["server_stats"] = client.stats()
+
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"Saved {args.output}")
@@ -0,0 +1,167 @@
+# backend/benchmark_preprocess.py
+"""
+Benchmark for the frame pre-processing fast path (frame_preprocess.py).
+
+Runs an ordered recording - a directory of JPEG frames or a video file - through
+decode + MediaPipe hand detection (IMAGE mode, as with VIDEO_TRACKING=false)
+at every combination of DECODE_MAX_SIDE and ROI_CROP, and compares each
+setting with the full-size, full-frame baseline:
+
+  decode_ms / detect_ms   - per-frame percentiles
+  hand_agreement          - frames where hand presence matches the baseline
+  landmark_error          - mean |x, y| landmark distance (normalized) on frames
+                            where both found a hand
+  sign_agreement          - classifier top-1 agreement (with the NumPy model)
+  roi_hit_rate            - ROI settings: frames whose hand was found on the crop
+
+Usage:
+    python benchmark_preprocess.py --frames-dir ./recorded_frames
+    python benchmark_preprocess.py --video ./hello.mp4 --max-sides 0 720 480 320
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import time
+
+import numpy as np
+
+from frame_preprocess import crop_to_roi, decode_frame, hand_roi, uncrop_keypoints
+from hand_tracking import create_hand_landmarker, extract_hand_keypoints, to_mp_image
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+HAND_MODEL_PATH = os.path.join(BACKEND_DIR, '..', 'ml_training', 'hand_landmarker.task')
+NUMPY_MODEL_PATH = os.path.join(BACKEND_DIR, '..', 'ml_training', 'sign_lingo_model_single.npz')
+
+
+def load_encoded_frames(args):
+    """Encoded JPEG bytes as uint8 arrays, in recording order"""
+    if args.frames_dir:
+        paths = sorted(glob.glob(os.path.join(args.frames_dir, '*.jpg')) +
+                       glob.glob(os.path.join(args.frames_dir, '*.jpeg')))[:args.limit]
+        return [np.fromfile(path, np.uint8) for path in paths]
+
+    import cv2
+    capture = cv2.VideoCapture(args.video)
+    frames = []
+    while len(frames) < args.limit:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, args.jpeg_quality])[1].ravel())
+    capture.release()
+    return frames
+
+
+def run_setting(encoded_frames, detector, max_side, roi_crop, margin):
+    import cv2
+
+    decode_ms, detect_ms, keypoints, roi_hits = [], [], [], []
+    roi = None
+    for buffer in encoded_frames:
+        started = time.perf_counter()
+        frame, _ = decode_frame(buffer, max_side)
+        decoded = time.perf_counter()
+
+        found = None
+        if roi_crop and roi is not None:
+            crop, box = crop_to_roi(frame, roi)
+            crop_keypoints = extract_hand_keypoints(detector.detect(to_mp_image(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))))
+            roi_hits.append(np.sum(np.abs(crop_keypoints)) >= 0.01)
+            if roi_hits[-1]:
+                found = uncrop_keypoints(crop_keypoints, box, frame.shape)
+        if found is None:
+            found = extract_hand_keypoints(detector.detect(to_mp_image(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))))
+        if roi_crop:
+            roi = hand_roi(found, margin)
+
+        decode_ms.append((decoded - started) * 1000)
+        detect_ms.append((time.perf_counter() - decoded) * 1000)
+        keypoints.append(found)
+    return np.array(decode_ms), np.array(detect_ms), np.array(keypoints, dtype=np.float32), roi_hits
+
+
+def percentiles(samples):
+    return {name: round(float(np.percentile(samples, q)), 3) for name, q in (("p50", 50), ("p95", 95))}
+
+
+def compare(keypoints, baseline, classifier):
+    has_hand = np.sum(np.abs(keypoints), axis=1) >= 0.01
+    base_hand = np.sum(np.abs(baseline), axis=1) >= 0.01
+    both = has_hand & base_hand
+    result = {"hand_agreement": round(float(np.mean(has_hand == base_hand)), 4), "landmark_error": None,
+              "sign_agreement": None}
+    if both.any():
+        points = keypoints[both].reshape(-1, 42, 3)[..., :2]
+        base_points = baseline[both].reshape(-1, 42, 3)[..., :2]
+        present = np.any(base_points != 0, axis=2) & np.any(points != 0, axis=2)
+        result["landmark_error"] = round(float(np.linalg.norm(points - base_points, axis=2)[present].mean()), 5)
+        if classifier is not None:
+            predicted = np.argmax(classifier.predict(keypoints[both], verbose=0), axis=1)
+            base_predicted = np.argmax(classifier.predict(baseline[both], verbose=0), axis=1)
+            result["sign_agreement"] = round(float(np.mean(predicted == base_predicted)), 4)
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark reduced-resolution decode and hand ROI cropping")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--frames-dir', help="directory of recorded .jpg frames (sorted = recording order)")
+    source.add_argument('--video', help="video file (frames re-encoded as JPEG)")
+    parser.add_argument('--jpeg-quality', type=int, default=80, help="--video: JPEG quality of the re-encoded frames")
+    parser.add_argument('--limit', type=int, default=300)
+    parser.add_argument('--max-sides', type=int, nargs='+', default=[0, 640, 480, 320],
+                        help="DECODE_MAX_SIDE values (0 = full-size decode, the baseline)")
+    parser.add_argument('--margin', type=float, default=0.3, help="ROI_MARGIN")
+    parser.add_argument('--hand-model', default=HAND_MODEL_PATH)
+    parser.add_argument('--output', default='benchmark_preprocess.json')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.hand_model):
+        raise SystemExit(f"Hand model not found at {args.hand_model} (run ml_training/fetch_hand_model.py)")
+    frames = load_encoded_frames(args)
+    if not frames:
+        raise SystemExit("No frames to benchmark")
+    classifier = None
+    if os.path.exists(NUMPY_MODEL_PATH):
+        from numpy_model import NumpyGestureModel
+        classifier = NumpyGestureModel(NUMPY_MODEL_PATH)
+
+    detector = create_hand_landmarker(args.hand_model)
+    run_setting(frames[:10], detector, 0, False, args.margin)  # warm-up
+
+    baseline = None
+    results = []
+    for max_side in sorted(set(args.max_sides)):
+        for roi_crop in (False, True):
+            decode_ms, detect_ms, keypoints, roi_hits = run_setting(frames, detector, max_side, roi_crop, args.margin)
+            if baseline is None:
+                baseline = keypoints  # max_side 0 (or the smallest given), no ROI
+            result = {
+                "max_side": max_side,
+                "roi_crop": roi_crop,
+                "decode_ms": percentiles(decode_ms),
+                "detect_ms": percentiles(detect_ms),
+                "total_ms_mean": round(float(np.mean(decode_ms + detect_ms)), 3),
+                "roi_hit_rate": round(float(np.mean(roi_hits)), 4) if roi_hits else None,
+            }
+            result.update(compare(keypoints, baseline, classifier))
+            results.append(result)
+            print(f"max_side={max_side:<5} roi={str(roi_crop):<5} decode p50 {result['decode_ms']['p50']:>7} ms | "
+                  f"detect p50 {result['detect_ms']['p50']:>7} ms | hands {result['hand_agreement']} | "
+                  f"landmark err {result['landmark_error']} | sign {result['sign_agreement']} | roi hits {result['roi_hit_rate']}")
+    detector.close()
+
+    height, width = decode_frame(frames[0])[0].shape[:2]
+    with open(args.output, 'w') as f:
+        json.dump({
+            "source": args.frames_dir or args.video,
+            "frames": len(frames),
+            "frame_size": [width, height],
+            "host": {"python": platform.python_version(), "cpus": os.cpu_count(), "machine": platform.machine()},
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "results": results,
+        }, f, indent=2)
+    print(f"Saved {args.output}")
@@ -0,0 +1,120 @@
+# backend/benchmark_templates.py
+"""
+Benchmark for the nearest-neighbour template index (template_index.py).
+
+For each index size (default 50, 500 and 5,000 templates over the 50-word
+vocabulary) it builds an index from real keypoints in ml_training/data -
+jittered copies when the corpus is smaller than the index - and reports build
+time (normalize + norms), save/load time, memory footprint, and query latency
+for single frames and for batches of frames (one matmul per batch).
+
+Usage:
+    python benchmark_templates.py
+    python benchmark_templates.py --sizes 50 500 5000 50000 --batch 16 --queries 2000
+"""
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+
+import numpy as np
+
+from benchmark_predict import DEFAULT_DATA_PATH, load_keypoints
+from template_index import TemplateIndex, normalize_keypoints, save_index
+
+VOCABULARY_SIZE = 50
+
+
+def percentiles_ms(samples):
+    samples = np.asarray(samples) * 1000.0
+    return {name: round(float(np.percentile(samples, q)), 4) for name, q in (("p50", 50), ("p95", 95), ("p99", 99))}
+
+
+def corpus(data_path, size, seed=0):
+    """`size` raw keypoint rows from recordings, jittered copies beyond the corpus"""
+    rows = np.array([np.frombuffer(body, dtype='<f4') for body in load_keypoints(data_path, size, 0.0)])
+    rng = np.random.default_rng(seed)
+    picks = rows[rng.integers(0, len(rows), size)] if size > len(rows) else rows[:size]
+    noise = rng.standard_normal(picks.shape).astype(np.float32) * 0.01 * (picks != 0)
+    return picks + (noise if size > len(rows) else 0)
+
+
+def bench_size(size, args, queries):
+    raw = corpus(args.data_path, size)
+    labels = np.arange(size) % VOCABULARY_SIZE
+    vocabulary = [f"SIGN_{i}" for i in range(VOCABULARY_SIZE)]
+
+    started = time.perf_counter()
+    index = TemplateIndex(normalize_keypoints(raw), labels, vocabulary, k=args.k)
+    build_s = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'templates.npz')
+        started = time.perf_counter()
+        save_index(path, index.vectors, labels, vocabulary)
+        save_s = time.perf_counter() - started
+        started = time.perf_counter()
+        index = TemplateIndex.load(path, k=args.k)
+        load_s = time.perf_counter() - started
+        file_kb = os.path.getsize(path) / 1024
+
+    for row in queries[:20]:  # warm-up
+        index.query(row)
+
+    single = []
+    for row in queries[:args.queries]:
+        started = time.perf_counter()
+        index.query(row)
+        single.append(time.perf_counter() - started)
+
+    batched = []
+    for start in range(0, args.queries - args.batch + 1, args.batch):
+        started = time.perf_counter()
+        index.query(queries[start:start + args.batch])
+        batched.append(time.perf_counter() - started)
+
+    return {
+        "templates": size,
+        "build_ms": round(build_s * 1000, 3),
+        "save_ms": round(save_s * 1000, 3),
+        "load_ms": round(load_s * 1000, 3),
+        "memory_kb": round(index.nbytes / 1024, 1),
+        "file_kb": round(file_kb, 1),
+        "single_query_ms": percentiles_ms(single),
+        "batch_query_ms": percentiles_ms(batched),
+        "batch_per_frame_ms": round(float(np.median(batched)) * 1000 / args.batch, 4) if batched else None,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the template index at several sizes")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000])
+    parser.add_argument('--data-path', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--queries', type=int, default=1000, help="single-frame queries per size")
+    parser.add_argument('--batch', type=int, default=16, help="frames per batched query")
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--output', default='benchmark_templates.json')
+    args = parser.parse_args()
+
+    queries = corpus(args.data_path, args.queries, seed=1)
+    results = []
+    for size in args.sizes:
+        result = bench_size(size, args, queries)
+        results.append(result)
+        print(f"n={size:<6} build {result['build_ms']:>8} ms | load {result['load_ms']:>7} ms | "
+              f"{result['memory_kb']:>8} KB | single p50 {result['single_query_ms']['p50']} ms "
+              f"p95 {result['single_query_ms']['p95']} ms | batch-{args.batch} {result['batch_per_frame_ms']} ms/frame")
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            "host": {"python": platform.python_version(), "numpy": np.__version__,
+                     "cpus": os.cpu_count(), "machine": platform.machine()},
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "k": args.k,
+            "batch": args.batch,
+            "results": results,
+        }, f, indent=2)
+    print(f"Saved {args.output}")
@@ -0,0 +1,103 @@
+# backend/frame_preprocess.py
+"""
+Frame pre-processing fast path ahead of hand detection.
+
+Reduced-resolution decode: MediaPipe resizes every frame down to its model
+input (192/224 px) anyway, so a 1920x1080 JPEG can be decoded at 1/2, 1/4 or
+1/8 scale (libjpeg skips the DCT work for the dropped resolution) as long as
+the longer side stays at or above `max_side`. The header is parsed first to
+pick the largest such reduction.
+
+Hand ROI cropping: with the previous frame's hand bounding box (per session),
+detection runs on a margin-padded crop around it and the landmarks are mapped
+back to full-frame coordinates; a miss on the crop falls back to the full
+frame. Landmark x/y are normalized to the image MediaPipe saw, so they are the
+same whether the frame was decoded reduced or not.
+"""
+
+import struct
+
+import numpy as np
+
+# (scale, cv2 flag name) from the largest reduction down
+REDUCTIONS = ((8, 'IMREAD_REDUCED_COLOR_8'), (4, 'IMREAD_REDUCED_COLOR_4'), (2, 'IMREAD_REDUCED_COLOR_2'))
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def image_size(buffer):
+    """(width, height) from a JPEG or PNG header without decoding, or None"""
+    data = memoryview(buffer).cast('B')
+    if len(data) >= 24 and bytes(data[:8]) == b'\x89PNG\r\n\x1a\n':
+        return struct.unpack('>II', bytes(data[16:24]))
+    if len(data) < 4 or bytes(data[:2]) != b'\xff\xd8':
+        return None
+    offset = 2
+    while offset + 9 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:  # fill byte
+            offset += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # no length field
+            offset += 2
+            continue
+        length = struct.unpack('>H', bytes(data[offset + 2:offset + 4]))[0]
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', bytes(data[offset + 5:offset + 9]))
+            return width, height
+        offset += 2 + length
+    return None
+
+
+def decode_frame(buffer, max_side=0):
+    """
+    Encoded bytes -> (BGR frame or None, scale) where scale is how many times
+    smaller than the encoded image it was decoded. max_side=0 decodes full size.
+    """
+    import cv2
+
+    if max_side:
+        size = image_size(buffer)
+        if size is not None:
+            for scale, flag in REDUCTIONS:
+                if max(size) // scale >= max_side:
+                    return cv2.imdecode(buffer, getattr(cv2, flag)), scale
+    return cv2.imdecode(buffer, cv2.IMREAD_COLOR), 1
+
+
+def hand_roi(keypoints, margin=0.3, min_size=0.2):
+    """
+    Normalized (x0, y0, x1, y1) box around every detected landmark, padded by
+    `margin` x the box's longer side and at least `min_size` wide/tall; None without a hand.
+    """
+    points = np.asarray(keypoints, dtype=np.float32).reshape(-1, 3)
+    points = points[np.any(points != 0, axis=1)]
+    if not len(points):
+        return None
+    (x0, y0), (x1, y1) = points[:, :2].min(axis=0), points[:, :2].max(axis=0)
+    side = max(x1 - x0, y1 - y0, min_size) * (1 + 2 * margin)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    x0, x1 = max(0.0, cx - side / 2), min(1.0, cx + side / 2)
+    y0, y1 = max(0.0, cy - side / 2), min(1.0, cy + side / 2)
+    return float(x0), float(y0), float(x1), float(y1)
+
+
+def crop_to_roi(frame, roi):
+    """Crop a frame to a normalized box -> (crop view, pixel box (left, top, width, height))"""
+    height, width = frame.shape[:2]
+    left, top = int(roi[0] * width), int(roi[1] * height)
+    right, bottom = max(left + 1, int(np.ceil(roi[2] * width))), max(top + 1, int(np.ceil(roi[3] * height)))
+    return frame[top:bottom, left:right], (left, top, right - left, bottom - top)
+
+
+def uncrop_keypoints(keypoints, box, frame_shape):
+    """Keypoints normalized to a crop -> normalized to the full frame (zeros stay zeros)"""
+    left, top, crop_width, crop_height = box
+    height, width = frame_shape[:2]
+    points = np.array(keypoints, dtype=np.float32).reshape(-1, 3)
+    present = np.any(points != 0, axis=1)
+    points[present, 0] = (points[present, 0] * crop_width + left) / width
+    points[present, 1] = (points[present, 1] * crop_height + top) / height
+    points[present, 2] *= crop_width / width  # z shares x's scale
+    return points.reshape(-1)
@@ -0,0 +1,47 @@
+# backend/hand_tracking.py
+"""
+MediaPipe hand landmarking helpers shared by the Flask app and the
+inference worker processes (which must not import app.py).
+"""
+
+import numpy as np
+
+KEYPOINT_SIZE = 126  # Left hand (21 x 3) + Right hand (21 x 3)
+
+
+def create_hand_landmarker(model_path, video_mode=False):
+    """HandLandmarker with the settings used for training data collection"""
+    from mediapipe.tasks import python as mp_python
+    from mediapipe.tasks.python import vision as mp_vision
+
+    options = mp_vision.HandLandmarkerOptions(
+        base_options=mp_python.BaseOptions(model_asset_path=model_path),
+        running_mode=mp_vision.RunningMode.VIDEO if video_mode else mp_vision.RunningMode.IMAGE,
+        num_hands=2,
+        min_hand_detection_confidence=0.5,
+        min_hand_presence_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+    return mp_vision.HandLandmarker.create_from_options(options)
+
+
+def to_mp_image(frame_rgb):
+    from mediapipe import Image as MpImage, ImageFormat as MpImageFormat
+    return MpImage(image_format=MpImageFormat.SRGB, data=frame_rgb)
+
+
+def extract_hand_keypoints(results):
+    """Extract keypoints from MediaPipe hand detection results"""
+    lh = np.zeros(21 * 3)
+    rh = np.zeros(21 * 3)
+
+    if results.hand_landmarks and results.handedness:
+        for idx, hand_landmarks in enumerate(results.hand_landmarks):
+            hand_label = results.handedness[idx][0].category_name
+            coords = np.array([[lm.x, lm.y, lm.z] for lm in hand_landmarks]).flatten()
+            if hand_label == "Left":
+                lh = coords
+            else:
+                rh = coords
+
+    return np.concatenate([lh, rh])
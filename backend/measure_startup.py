@@ -0,0 +1,97 @@
+# backend/measure_startup.py
+"""
+Measure backend startup time for each ML_INIT mode.
+
+For every mode this launches the app in a fresh process and records:
+  - import_s   : time until `import app` returns
+  - healthz_s  : time until GET /healthz answers (non-ML routes usable)
+  - readyz_s   : time until GET /readyz returns 200 (models loaded + warmed up)
+
+Usage:
+    python measure_startup.py                      # all modes
+    python measure_startup.py --modes background eager --runs 3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app; "
+    "print('IMPORT_SECONDS', time.perf_counter() - t, flush=True)"
+)
+
+SERVER_SNIPPET = (
+    "import time; t = time.perf_counter(); import app; "
+    "print('IMPORT_SECONDS', time.perf_counter() - t, flush=True); "
+    "app.app.run(host='127.0.0.1', port={port}, debug=False, use_reloader=False, threaded=True)"
+)
+
+
+def wait_for(url, started, timeout):
+    """Seconds since `started` until `url` returns HTTP 200 (None on timeout)"""
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.02)
+    return None
+
+
+def measure_import(mode):
+    env = dict(os.environ, ML_INIT=mode)
+    out = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env,
+                         capture_output=True, text=True, timeout=300)
+    for line in out.stdout.splitlines():
+        if line.startswith('IMPORT_SECONDS'):
+            return float(line.split()[1])
+    return None
+
+
+def measure_server(mode, port, timeout):
+    env = dict(os.environ, ML_INIT=mode)
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-c', SERVER_SNIPPET.format(port=port)], cwd=BACKEND_DIR,
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        healthz = wait_for(f'http://127.0.0.1:{port}/healthz', started, timeout)
+        readyz = wait_for(f'http://127.0.0.1:{port}/readyz', started, timeout)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return healthz, readyz
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure backend startup time")
+    parser.add_argument('--modes', nargs='+', default=['background', 'lazy', 'eager'])
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--output', help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes:
+        for run in range(args.runs):
+            import_s = measure_import(mode)
+            healthz_s, readyz_s = measure_server(mode, args.port, args.timeout)
+            results.append({"mode": mode, "run": run, "import_s": import_s,
+                            "healthz_s": healthz_s, "readyz_s": readyz_s})
+            fmt = lambda v: f"{v:.2f}s" if v is not None else "timeout"
+            print(f"{mode:>10} run {run}: import {fmt(import_s)} | /healthz {fmt(healthz_s)} | /readyz {fmt(readyz_s)}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved {args.output}")
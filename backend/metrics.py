@@ -0,0 +1,164 @@
+# backend/metrics.py
+"""
+Lightweight, thread-safe counters for the prediction pipeline.
+Everything here is plain Python so it can stay on in production.
+"""
+
+import bisect
+import threading
+import time
+
+
+class LabeledTotals:
+    """Per-label count / total / min / max of a numeric value (e.g. bytes in per request)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def add(self, label, value):
+        with self._lock:
+            entry = self._totals.get(label)
+            if entry is None:
+                self._totals[label] = [1, value, value, value]
+            else:
+                entry[0] += 1
+                entry[1] += value
+                entry[2] = min(entry[2], value)
+                entry[3] = max(entry[3], value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                label: {
+                    "requests": count,
+                    "total": total,
+                    "avg": round(total / count, 1),
+                    "min": low,
+                    "max": high,
+                }
+                for label, (count, total, low, high) in self._totals.items()
+            }
+
+
+class StageTimer:
+    """Per-request stage stopwatch: mark(stage) records time since the previous mark"""
+    __slots__ = ('_started', '_last', 'stages')
+
+    def __init__(self):
+        self._started = self._last = time.perf_counter()
+        self.stages = []
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def total(self):
+        return self._last - self._started
+
+    def server_timing(self):
+        """Value for the Server-Timing response header (durations in ms)"""
+        parts = [f"{stage};dur={seconds * 1000.0:.3f}" for stage, seconds in self.stages]
+        parts.append(f"total;dur={self.total() * 1000.0:.3f}")
+        return ", ".join(parts)
+
+
+# Log-spaced latency buckets from 1 us to ~100 s (15% apart -> percentiles within ~15%)
+_BUCKET_BOUNDS = [1e-6 * (1.15 ** i) for i in range(133)]
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram - O(log buckets) to record, no per-sample storage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def record(self, seconds):
+        index = bisect.bisect_left(_BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += seconds
+            if seconds > self._max:
+                self._max = seconds
+
+    def _percentile(self, counts, total, fraction):
+        target = fraction * total
+        running = 0
+        for index, count in enumerate(counts):
+            running += count
+            if running >= target:
+                return _BUCKET_BOUNDS[index] if index < len(_BUCKET_BOUNDS) else self._max
+        return self._max
+
+    def snapshot(self):
+        with self._lock:
+            counts, total, total_s, max_s = list(self._counts), self._count, self._sum, self._max
+        if not total:
+            return {"count": 0}
+        ms = lambda seconds: round(min(seconds, max_s) * 1000.0, 3)
+        return {
+            "count": total,
+            "mean_ms": round(total_s / total * 1000.0, 3),
+            "p50_ms": ms(self._percentile(counts, total, 0.50)),
+            "p95_ms": ms(self._percentile(counts, total, 0.95)),
+            "p99_ms": ms(self._percentile(counts, total, 0.99)),
+            "max_ms": ms(max_s),
+        }
+
+
+class StageHistograms:
+    """One LatencyHistogram per pipeline stage (plus 'total'), per endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def _histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def record(self, timer):
+        for stage, seconds in timer.stages:
+            self._histogram(stage).record(seconds)
+        self._histogram('total').record(timer.total())
+
+    def snapshot(self):
+        with self._lock:
+            items = list(self._histograms.items())
+        return {name: histogram.snapshot() for name, histogram in items}
+
+
+class ConfidenceHistogram:
+    """Distribution of a 0..1 score (e.g. top-1 confidence) in ten equal bins, plus the mean"""
+
+    def __init__(self, bins=10):
+        self._lock = threading.Lock()
+        self._counts = [0] * bins
+        self._count = 0
+        self._sum = 0.0
+
+    def record(self, value):
+        index = min(int(value * len(self._counts)), len(self._counts) - 1)
+        with self._lock:
+            self._counts[max(index, 0)] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self):
+        with self._lock:
+            counts, total, total_sum = list(self._counts), self._count, self._sum
+        width = 1.0 / len(counts)
+        return {
+            "count": total,
+            "mean": round(total_sum / total, 4) if total else None,
+            "bins": {f"{i * width:.1f}-{(i + 1) * width:.1f}": count for i, count in enumerate(counts)},
+        }
@@ -0,0 +1,301 @@
+# backend/model_registry.py
+"""
+Versioned gesture-classifier registry with hot swapping and A/B routing.
+
+A registry directory (written by ml_training/register_model.py) holds one
+folder per model version - model file + manifest.json with its label list and
+input spec - and an active.json naming the active version and an optional
+canary that gets a percentage of traffic.
+
+Predictions read a single routing tuple that is replaced in one assignment,
+so swapping never blocks them: the new version is loaded and warmed up first,
+then published, and versions that drop out of the routing are closed after a
+grace period so requests already holding them can finish.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from batching import MicroBatcher
+from metrics import ConfidenceHistogram, LatencyHistogram
+
+RUNTIMES = ('numpy', 'keras', 'tflite')
+
+
+def load_model_file(runtime, path):
+    """Load a classifier with a Keras-style predict(batch, verbose=0)"""
+    if runtime == 'numpy':
+        from numpy_model import NumpyGestureModel
+        return NumpyGestureModel(path)
+    if runtime == 'tflite':
+        from tflite_model import TFLiteGestureModel
+        return TFLiteGestureModel(path)
+    if runtime == 'keras':
+        from tensorflow.keras.models import load_model
+        return load_model(path)
+    raise ValueError(f"Unknown runtime '{runtime}' (expected one of {', '.join(RUNTIMES)})")
+
+
+def write_json_atomic(path, data):
+    """Write-then-rename so other processes polling the file never see half of it"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class ModelVersion:
+    """One loaded classifier with its own micro-batcher, labels and serving stats"""
+
+    def __init__(self, version, runtime, labels, model, path=None, manifest=None,
+                 max_batch_size=16, max_wait_ms=5.0, timeout_s=None):
+        self.version = version
+        self.runtime = runtime
+        self.labels = np.array(labels)
+        self.model = model
+        self.path = path
+        self.manifest = manifest or {}
+        self.loaded_at = time.time()
+        self.timeout_s = timeout_s  # a hung forward pass fails callers with TimeoutError instead of blocking them
+        self.batcher = MicroBatcher(
+            lambda batch: model.predict(batch, verbose=0),
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms
+        )
+        self.latency = LatencyHistogram()
+        self.confidence = ConfidenceHistogram()
+
+    def predict(self, keypoints):
+        """Probabilities for one keypoint row (batched with concurrent callers)"""
+        started = time.perf_counter()
+        probabilities = self.batcher.submit(keypoints, self.timeout_s)
+        self.latency.record(time.perf_counter() - started)
+        return probabilities
+
+    def predict_many(self, rows):
+        """(N, features) -> (N, classes), queued together so they run as one batch"""
+        started = time.perf_counter()
+        probabilities = self.batcher.submit_many(rows, self.timeout_s)
+        self.latency.record(time.perf_counter() - started)
+        return probabilities
+
+    def record_confidence(self, confidence):
+        self.confidence.record(confidence)
+
+    def close(self):
+        self.batcher.close()
+
+    def stats(self):
+        return {
+            "runtime": self.runtime,
+            "labels": len(self.labels),
+            "loaded_at": time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.loaded_at)),
+            "latency": self.latency.snapshot(),
+            "confidence": self.confidence.snapshot(),
+            "batching": self.batcher.stats(),
+        }
+
+
+class ModelRegistry:
+    """
+    root           -- registry directory (versions + active.json)
+    input_size     -- keypoint vector length every version must accept
+    max_batch_size, max_wait_ms -- micro-batching knobs for each loaded version
+    predict_timeout_s -- longest a prediction may wait for its batch (None = no limit)
+    retire_grace_s -- how long a swapped-out version keeps serving in-flight requests
+    """
+
+    def __init__(self, root, input_size, max_batch_size=16, max_wait_ms=5.0, retire_grace_s=30.0,
+                 predict_timeout_s=None):
+        self.root = root
+        self.input_size = int(input_size)
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.predict_timeout_s = predict_timeout_s
+        self.retire_grace_s = float(retire_grace_s)
+
+        # (primary, canary or None, canary percent) - read lock-free by every prediction
+        self._routing = None
+        self._loaded = {}
+        self._retired = {}
+        self._swap_lock = threading.Lock()
+        self._active_mtime = None
+        self.swaps = 0
+
+    @property
+    def active_path(self):
+        return os.path.join(self.root, 'active.json')
+
+    def has_active(self):
+        return os.path.exists(self.active_path)
+
+    # ---------- versions on disk ----------
+
+    def read_manifest(self, version):
+        version_path = os.path.join(self.root, version)
+        manifest_path = os.path.join(version_path, 'manifest.json')
+        if os.path.basename(version) != version or not os.path.exists(manifest_path):
+            raise KeyError(f"Unknown model version '{version}'")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest["path"] = os.path.join(version_path, manifest["model_file"])
+        return manifest
+
+    def available(self):
+        """Manifests of every registered version, newest first"""
+        if not os.path.isdir(self.root):
+            return []
+        manifests = []
+        for name in sorted(os.listdir(self.root)):
+            try:
+                manifest = self.read_manifest(name)
+            except (KeyError, ValueError, OSError):
+                continue
+            manifest.pop("path")
+            manifests.append(manifest)
+        return sorted(manifests, key=lambda m: m.get("created_at", ""), reverse=True)
+
+    def load_version(self, version):
+        """Load, validate against the input spec and warm up - does not publish it"""
+        manifest = self.read_manifest(version)
+        runtime, labels = manifest.get("runtime"), manifest.get("labels") or []
+        input_size = int(manifest.get("input", {}).get("size", 0))
+        if input_size != self.input_size:
+            raise ValueError(f"Version '{version}' expects {input_size} inputs, server sends {self.input_size}")
+        if not labels:
+            raise ValueError(f"Version '{version}' has no labels in its manifest")
+
+        model = load_model_file(runtime, manifest["path"])
+        loaded = ModelVersion(version, runtime, labels, model, manifest["path"], manifest,
+                              self.max_batch_size, self.max_wait_ms, self.predict_timeout_s)
+        try:
+            probabilities = loaded.batcher.submit(np.full(self.input_size, 0.5, dtype=np.float32))
+            if len(probabilities) != len(labels):
+                raise ValueError(f"Version '{version}' outputs {len(probabilities)} classes "
+                                 f"but lists {len(labels)} labels")
+        except Exception:
+            loaded.close()
+            raise
+        return loaded
+
+    # ---------- routing ----------
+
+    def install(self, model_version):
+        """Serve an already-loaded version on 100% of traffic (no registry files involved)"""
+        with self._swap_lock:
+            self._publish(model_version, None, 0)
+
+    def activate(self, active, canary=None, canary_percent=0, persist=True):
+        """
+        Load (if needed) and atomically publish a new routing.
+        With persist, active.json is rewritten so other worker processes follow.
+        """
+        canary_percent = max(0, min(100, int(canary_percent or 0)))
+        if not canary or canary == active:
+            canary, canary_percent = None, 0
+
+        with self._swap_lock:
+            primary = self._loaded.get(active) or self.load_version(active)
+            canary_version = None
+            if canary and canary_percent > 0:
+                try:
+                    canary_version = self._loaded.get(canary) or self.load_version(canary)
+                except Exception:
+                    if active not in self._loaded:
+                        primary.close()
+                    raise
+            self._publish(primary, canary_version, canary_percent)
+
+            if persist:
+                os.makedirs(self.root, exist_ok=True)
+                write_json_atomic(self.active_path, {
+                    "active": active,
+                    "canary": canary,
+                    "canary_percent": canary_percent,
+                    "updated_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+                })
+                self._active_mtime = os.path.getmtime(self.active_path)
+        return self.routing()
+
+    def _publish(self, primary, canary, canary_percent):
+        """Swap the routing tuple, then retire versions nothing routes to any more"""
+        self._routing = (primary, canary, canary_percent)
+        self.swaps += 1
+        live = {primary.version: primary}
+        if canary is not None:
+            live[canary.version] = canary
+        for name, old in self._loaded.items():
+            if name not in live:
+                self._retired[name] = old.stats()
+                # Requests that picked `old` just before the swap still get their answer
+                timer = threading.Timer(self.retire_grace_s, old.close)
+                timer.daemon = True
+                timer.start()
+                print(f"[ML] Model version '{name}' retired")
+        self._loaded = live
+        print(f"[ML] Serving model '{primary.version}'" +
+              (f" with canary '{canary.version}' at {canary_percent}%" if canary else ""))
+
+    def load_active(self):
+        """Apply active.json (startup, or after another process changed it)"""
+        mtime = os.path.getmtime(self.active_path)
+        with open(self.active_path) as f:
+            active = json.load(f)
+        if not active.get("active"):
+            raise ValueError(f"{self.active_path} names no active version")
+        self.activate(active["active"], active.get("canary"), active.get("canary_percent", 0), persist=False)
+        self._active_mtime = mtime
+
+    def start_polling(self, interval):
+        """Follow active.json changes made by other processes (or by hand)"""
+        def poll():
+            while True:
+                time.sleep(interval)
+                try:
+                    if self.has_active() and os.path.getmtime(self.active_path) != self._active_mtime:
+                        self.load_active()
+                except Exception as e:
+                    print(f"[ML] WARNING: Could not apply {self.active_path}: {e}")
+        threading.Thread(target=poll, name='model-registry-poll', daemon=True).start()
+
+    def choose(self, session_id=None):
+        """Version for this request - sticky per session, random without one"""
+        routing = self._routing
+        if routing is None:
+            return None
+        primary, canary, canary_percent = routing
+        if canary is None:
+            return primary
+        if session_id:
+            bucket = zlib.crc32(session_id.encode('utf-8')) % 100
+        else:
+            bucket = random.randrange(100)
+        return canary if bucket < canary_percent else primary
+
+    def primary(self):
+        routing = self._routing
+        return routing[0] if routing else None
+
+    def routing(self):
+        routing = self._routing
+        if routing is None:
+            return {"active": None, "canary": None, "canary_percent": 0}
+        primary, canary, canary_percent = routing
+        return {
+            "active": primary.version,
+            "canary": canary.version if canary else None,
+            "canary_percent": canary_percent,
+        }
+
+    def stats(self):
+        body = self.routing()
+        body["swaps"] = self.swaps
+        body["versions"] = {name: version.stats() for name, version in list(self._loaded.items())}
+        body["retired"] = dict(self._retired)
+        return body
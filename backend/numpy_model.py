@@ -0,0 +1,121 @@
+# backend/numpy_model.py
+"""
+Pure-NumPy runtimes for the gesture classifiers.
+
+NumpyGestureModel loads the .npz written by ml_training/export_numpy_model.py
+(BatchNorm already folded into the Dense weights, Dropout removed) so the
+backend can classify keypoints without importing TensorFlow.
+
+NumpySequenceModel runs the GRU sequence model from
+ml_training/train_model_sequence.py one frame at a time with caller-held state.
+"""
+
+import numpy as np
+
+
+def _relu(x):
+    return np.maximum(x, 0.0, out=x)
+
+
+def _softmax(x):
+    x -= x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': _relu,
+    'softmax': _softmax,
+}
+
+
+class NumpyGestureModel:
+    """Stack of float32 Dense layers; predict() mirrors the Keras call signature"""
+
+    def __init__(self, path):
+        with np.load(path) as weights:
+            activations = [str(a) for a in weights['activations']]
+            self.layers = [
+                (np.ascontiguousarray(weights[f'kernel_{i}'], dtype=np.float32),
+                 np.ascontiguousarray(weights[f'bias_{i}'], dtype=np.float32),
+                 _ACTIVATIONS[activation])
+                for i, activation in enumerate(activations)
+            ]
+        self.input_size = self.layers[0][0].shape[0]
+        self.output_size = self.layers[-1][0].shape[1]
+
+    def predict(self, batch, verbose=0):
+        """(N, 126) keypoints -> (N, num_actions) probabilities"""
+        x = np.asarray(batch, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None, :]
+        for kernel, bias, activation in self.layers:
+            x = x @ kernel
+            x += bias
+            x = activation(x)
+        return x
+
+
+class NumpySequenceModel:
+    """
+    Dense(relu) frame encoder -> GRU -> Dense(softmax), stepped incrementally.
+
+    The GRU follows the Keras defaults (reset_after=True, gate order z, r, h),
+    so step() reproduces the Keras model's per-timestep output exactly while a
+    new frame costs one step instead of a pass over the whole window.
+    """
+
+    def __init__(self, path):
+        with np.load(path) as weights:
+            w = {key: np.ascontiguousarray(weights[key], dtype=np.float32) for key in weights.files}
+        self.encoder_kernel, self.encoder_bias = w['encoder_kernel'], w['encoder_bias']
+        self.gru_kernel, self.gru_recurrent = w['gru_kernel'], w['gru_recurrent_kernel']
+        self.gru_input_bias, self.gru_recurrent_bias = w['gru_bias'][0], w['gru_bias'][1]
+        self.output_kernel, self.output_bias = w['output_kernel'], w['output_bias']
+        self.input_size = self.encoder_kernel.shape[0]
+        self.units = self.gru_recurrent.shape[0]
+        self.output_size = self.output_kernel.shape[1]
+
+    def initial_state(self, batch_size=None):
+        shape = (self.units,) if batch_size is None else (batch_size, self.units)
+        return np.zeros(shape, dtype=np.float32)
+
+    def step(self, frames, states):
+        """
+        Advance one frame. frames (N, 126) or (126,), states (N, units) or (units,)
+        -> (probabilities, new states) with the same leading shape.
+        """
+        x = np.asarray(frames, dtype=np.float32)
+        h = np.asarray(states, dtype=np.float32)
+        single = x.ndim == 1
+        if single:
+            x, h = x[None, :], h[None, :]
+
+        x = _relu(x @ self.encoder_kernel + self.encoder_bias)
+        x_z, x_r, x_h = np.split(x @ self.gru_kernel + self.gru_input_bias, 3, axis=1)
+        h_z, h_r, h_h = np.split(h @ self.gru_recurrent + self.gru_recurrent_bias, 3, axis=1)
+        z = _sigmoid(x_z + h_z)
+        r = _sigmoid(x_r + h_r)
+        candidate = np.tanh(x_h + r * h_h)
+        h = z * h + (1.0 - z) * candidate
+
+        probabilities = _softmax(h @ self.output_kernel + self.output_bias)
+        if single:
+            return probabilities[0], h[0]
+        return probabilities, h
+
+    def predict(self, sequences, verbose=0):
+        """(N, T, 126) -> (N, T, num_actions), the same as the Keras model"""
+        x = np.asarray(sequences, dtype=np.float32)
+        h = self.initial_state(x.shape[0])
+        outputs = []
+        for t in range(x.shape[1]):
+            probabilities, h = self.step(x[:, t], h)
+            outputs.append(probabilities)
+        return np.stack(outputs, axis=1)
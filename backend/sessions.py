@@ -0,0 +1,255 @@
+# backend/sessions.py
+"""
+Per-client practice sessions for continuous camera streams.
+
+Each session owns its own MediaPipe HandLandmarker in VIDEO running mode so
+landmarks are tracked between frames instead of re-running palm detection on
+every frame, plus the last classified keypoints for delta gating and the
+hidden state of the streaming sequence model (and an open sign verification,
+see verification.py). Sessions are keyed by a
+client-supplied id and evicted after an idle timeout (or least-recently-used
+when the pool is full) so memory stays bounded.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+
+class PracticeSession:
+    """State for one client stream - use `lock` around anything that touches the detector"""
+
+    def __init__(self, session_id, detector_factory=None):
+        self.session_id = session_id
+        self.detector = None
+        self.lock = threading.Lock()
+        self.created_at = time.monotonic()
+        self.last_seen = self.created_at
+        self.frames = 0
+        self._detector_factory = detector_factory
+        self._last_timestamp_ms = -1
+
+        # ROI cropping: normalized box around the last detected hand (frame_preprocess.hand_roi)
+        self.hand_roi = None
+
+        # Delta gating: keypoints + response of the last frame the classifier ran on
+        self.gate_keypoints = None
+        self.gate_result = None
+        self.gate_skips = 0
+        self.gate_key = None
+
+        # Streaming sequence model: GRU hidden state carried between frames, plus the
+        # latest frames to restart it from when it reaches its training horizon
+        self.sequence_state = None
+        self.sequence_frames = 0
+        self.sequence_window = deque()
+        self.empty_frames = 0
+
+        # Server-side grading of a "show the sign" question (verification.SignVerification)
+        self.verification = None
+
+    def reset(self):
+        """Forget gating, sequence and verification state; the tracking detector is kept"""
+        with self.lock:
+            self.gate_keypoints = None
+            self.gate_result = None
+            self.gate_skips = 0
+            self.sequence_state = None
+            self.sequence_frames = 0
+            self.sequence_window.clear()
+            self.empty_frames = 0
+            self.verification = None
+
+    def get_detector(self):
+        """VIDEO-mode detector, created on the first image frame (call with `lock` held)"""
+        if self.detector is None and self._detector_factory is not None:
+            self.detector = self._detector_factory()
+            self._detector_factory = None
+        return self.detector
+
+    def next_timestamp_ms(self):
+        """Strictly increasing timestamp for detect_for_video()"""
+        timestamp = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp
+        return timestamp
+
+    def close(self):
+        with self.lock:
+            self._detector_factory = None
+            if self.detector is not None:
+                self.detector.close()
+                self.detector = None
+
+
+class SessionStore:
+    """
+    Thread-safe pool of PracticeSession objects.
+
+    factory        -- callable(session_id) -> PracticeSession
+    idle_timeout   -- seconds without a frame before a session is closed
+    max_sessions   -- hard cap; the least recently used session is evicted first
+    sweep_interval -- seconds between background idle sweeps (None = only on access)
+    """
+
+    def __init__(self, factory, idle_timeout=60.0, max_sessions=200, sweep_interval=None):
+        self.factory = factory
+        self.idle_timeout = float(idle_timeout)
+        self.max_sessions = max(1, int(max_sessions))
+
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+        self._created = 0
+        self._evicted_idle = 0
+        self._evicted_full = 0
+
+        if sweep_interval:
+            # Without it, idle sessions of a server that stopped getting traffic are never freed
+            self._sweep_interval = float(sweep_interval)
+            threading.Thread(target=self._sweep_loop, name='session-sweeper', daemon=True).start()
+
+    def get(self, session_id):
+        """Return the session for `session_id`, creating it if needed"""
+        evicted = self._evict_idle()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                while len(self._sessions) >= self.max_sessions:
+                    _, oldest = self._sessions.popitem(last=False)
+                    evicted.append(oldest)
+                    self._evicted_full += 1
+                session = self.factory(session_id)
+                self._sessions[session_id] = session
+                self._created += 1
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_seen = time.monotonic()
+
+        # Close detectors outside the pool lock - close() waits for in-flight frames
+        for old in evicted:
+            old.close()
+        return session
+
+    def peek(self, session_id):
+        """Return an existing session without creating or touching it"""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def discard(self, session_id):
+        """Close and forget a session; returns True if it existed"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    def _evict_idle(self):
+        """Pop sessions idle longer than idle_timeout (oldest first); caller closes them"""
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted = []
+        with self._lock:
+            while self._sessions:
+                session_id, session = next(iter(self._sessions.items()))
+                if session.last_seen >= cutoff:
+                    break
+                self._sessions.popitem(last=False)
+                evicted.append(session)
+                self._evicted_idle += 1
+        return evicted
+
+    def sweep(self):
+        """Close every idle session now; returns how many were evicted"""
+        evicted = self._evict_idle()
+        for old in evicted:
+            old.close()
+        return len(evicted)
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(self._sweep_interval)
+            self.sweep()
+
+    def stats(self):
+        self.sweep()
+        with self._lock:
+            return {
+                "active": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "idle_timeout_s": self.idle_timeout,
+                "created": self._created,
+                "evicted_idle": self._evicted_idle,
+                "evicted_full": self._evicted_full,
+            }
+
+
+class DeltaGate:
+    """
+    Skip the classifier while a user holds a sign still.
+
+    A frame whose keypoints are within `threshold` (RMS distance over the 126
+    values, in normalized image units) of the last CLASSIFIED frame reuses that
+    frame's result. Comparing against the last classified frame, not the
+    previous one, stops slow drift from being skipped forever; `max_skips`
+    forces a fresh classification every so often regardless.
+
+    The session's gate fields are read and written under `session.lock`, so
+    concurrent requests on one session (HTTP + stream socket) never pair one
+    frame's keypoints with another frame's result.
+    """
+
+    def __init__(self, threshold=0.004, max_skips=15):
+        self.threshold = float(threshold)
+        self.max_skips = int(max_skips)
+        self._lock = threading.Lock()
+        self._frames = 0
+        self._skipped = 0
+
+    def lookup(self, session, keypoints, key=None):
+        """
+        Cached response for this session if keypoints barely moved, else None.
+        `key` (e.g. the model version) must match the one the result was stored with.
+        """
+        if self.threshold <= 0:
+            return None
+        with session.lock:
+            cached, anchor = session.gate_result, session.gate_keypoints
+            hit = (
+                cached is not None
+                and session.gate_key == key
+                and session.gate_skips < self.max_skips
+                and float(np.sqrt(np.mean((keypoints - anchor) ** 2))) < self.threshold
+            )
+            if hit:
+                session.gate_skips += 1
+        with self._lock:
+            self._frames += 1
+            if hit:
+                self._skipped += 1
+        return cached if hit else None
+
+    def store(self, session, keypoints, result, key=None):
+        anchor = np.array(keypoints, dtype=np.float32)
+        with session.lock:
+            session.gate_keypoints = anchor
+            session.gate_result = result
+            session.gate_key = key
+            session.gate_skips = 0
+
+    def reset(self, session):
+        with session.lock:
+            session.gate_keypoints = None
+            session.gate_result = None
+            session.gate_skips = 0
+
+    def stats(self):
+        with self._lock:
+            frames, skipped = self._frames, self._skipped
+        return {
+            "threshold": self.threshold,
+            "max_skips": self.max_skips,
+            "frames": frames,
+            "skipped": skipped,
+            "skip_ratio": round(skipped / frames, 4) if frames else 0.0,
+        }
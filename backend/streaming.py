@@ -0,0 +1,104 @@
+# backend/streaming.py
+"""
+Bookkeeping for long-lived /predict/stream WebSocket connections.
+
+Each connection keeps its own prediction smoothing plus frame-rate and
+latency stats, and the registry exposes them for /predict/stats.
+"""
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class StreamConnection:
+    """One live client stream"""
+
+    def __init__(self, connection_id, smoothing=0.5, window=120):
+        self.connection_id = connection_id
+        self.smoothing = float(smoothing)
+        self.opened_at = time.monotonic()
+        self.frames = 0
+        self.errors = 0
+        self._frame_times = deque(maxlen=window)
+        self._latencies = deque(maxlen=window)
+        self._smoothed = None
+
+    def record(self, latency_s, error=False):
+        self.frames += 1
+        if error:
+            self.errors += 1
+        self._frame_times.append(time.monotonic())
+        self._latencies.append(latency_s)
+
+    def smooth(self, probabilities):
+        """Exponential moving average of the class probabilities (None resets it)"""
+        if probabilities is None:
+            self._smoothed = None
+            return None
+        probabilities = np.asarray(probabilities, dtype=np.float32)
+        # A model swap to a different label set starts the average over
+        if self._smoothed is None or self.smoothing <= 0 or self._smoothed.shape != probabilities.shape:
+            self._smoothed = probabilities
+        else:
+            self._smoothed = self.smoothing * self._smoothed + (1.0 - self.smoothing) * probabilities
+        return self._smoothed
+
+    def fps(self):
+        """Frame rate over the recent window"""
+        if len(self._frame_times) < 2:
+            return 0.0
+        span = self._frame_times[-1] - self._frame_times[0]
+        return (len(self._frame_times) - 1) / span if span > 0 else 0.0
+
+    def stats(self):
+        latencies = np.array(self._latencies) * 1000.0 if self._latencies else np.zeros(1)
+        return {
+            "id": self.connection_id,
+            "open_s": round(time.monotonic() - self.opened_at, 1),
+            "frames": self.frames,
+            "errors": self.errors,
+            "fps": round(self.fps(), 2),
+            "latency_ms": {
+                "avg": round(float(latencies.mean()), 2),
+                "p95": round(float(np.percentile(latencies, 95)), 2),
+                "max": round(float(latencies.max()), 2),
+            },
+        }
+
+
+class StreamRegistry:
+    """Thread-safe set of open connections plus lifetime totals"""
+
+    def __init__(self, smoothing=0.5):
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._opened = 0
+        self._total_frames = 0
+
+    def open(self, connection_id):
+        connection = StreamConnection(connection_id, self.smoothing)
+        with self._lock:
+            self._connections[connection_id] = connection
+            self._opened += 1
+        return connection
+
+    def close(self, connection):
+        with self._lock:
+            if self._connections.get(connection.connection_id) is connection:
+                del self._connections[connection.connection_id]
+            self._total_frames += connection.frames
+
+    def stats(self):
+        with self._lock:
+            connections = list(self._connections.values())
+            opened, closed_frames = self._opened, self._total_frames
+        return {
+            "open": len(connections),
+            "opened_total": opened,
+            "frames_total": closed_frames + sum(c.frames for c in connections),
+            "connections": [c.stats() for c in connections],
+        }
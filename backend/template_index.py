@@ -0,0 +1,124 @@
+# backend/template_index.py
+"""
+Nearest-neighbour sign matching over landmark templates.
+
+Recognizes signs the classifier was never trained on: an offline job
+(ml_training/build_template_index.py) extracts keypoint templates from the
+sign videos and reference recordings and stores them as one float32 matrix,
+and queries are a single batched distance computation against it:
+
+    |q - t|^2 = |q|^2 + |t|^2 - 2 q.t     (template norms precomputed)
+
+Keypoints are normalized per hand (wrist at the origin, scaled by hand size)
+so templates from a video match a user at any distance or position in frame.
+"""
+
+import json
+
+import numpy as np
+
+HAND_SIZE = 63  # 21 landmarks x (x, y, z)
+
+
+def normalize_keypoints(keypoints):
+    """
+    (..., 126) raw keypoints -> float32 translation/scale-invariant vectors.
+    Each hand is centred on its wrist and scaled so its farthest landmark is at
+    distance 1; a missing hand (all zeros) stays zeros.
+    """
+    hands = np.asarray(keypoints, dtype=np.float32).reshape(*np.shape(keypoints)[:-1], 2, 21, 3)
+    centred = hands - hands[..., :1, :]
+    scale = np.max(np.linalg.norm(centred, axis=-1), axis=-1)[..., None, None]
+    normalized = np.divide(centred, scale, out=np.zeros_like(centred), where=scale > 1e-6)
+    return normalized.reshape(*np.shape(keypoints)[:-1], 2 * HAND_SIZE)
+
+
+def save_index(path, vectors, labels, vocabulary, sources=None):
+    """Write an index: normalized (N, 126) vectors, int label per row, the vocabulary list"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    np.savez(
+        path,
+        vectors=vectors,
+        labels=np.asarray(labels, dtype=np.int32),
+        vocabulary=np.array(json.dumps(list(vocabulary))),
+        sources=np.array(json.dumps(sources or {})),
+    )
+
+
+class TemplateIndex:
+    """
+    Loaded template matrix with precomputed squared norms.
+
+    k               -- neighbours that vote on each query
+    max_distance    -- queries whose nearest template is farther than this get sign None
+    """
+
+    def __init__(self, vectors, labels, vocabulary, k=5, max_distance=None, sources=None):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.labels = np.asarray(labels, dtype=np.int32)
+        self.vocabulary = np.array(vocabulary)
+        self.k = max(1, min(int(k), len(self.vectors)))
+        self.max_distance = max_distance
+        self.sources = sources or {}
+        self.norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+
+    @classmethod
+    def load(cls, path, k=5, max_distance=None):
+        data = np.load(path)
+        return cls(data['vectors'], data['labels'], json.loads(str(data['vocabulary'])),
+                   k=k, max_distance=max_distance, sources=json.loads(str(data['sources'])))
+
+    @property
+    def nbytes(self):
+        return self.vectors.nbytes + self.labels.nbytes + self.norms.nbytes
+
+    def distances(self, queries):
+        """(Q, 126) normalized queries -> (Q, N) squared euclidean distances, one matmul"""
+        queries = np.asarray(queries, dtype=np.float32)
+        query_norms = np.einsum('ij,ij->i', queries, queries)
+        distances = query_norms[:, None] + self.norms[None, :] - 2.0 * (queries @ self.vectors.T)
+        return np.maximum(distances, 0.0, out=distances)
+
+    def query(self, keypoints):
+        """
+        Raw keypoints (126,) or (Q, 126) -> one match dict per query:
+        {"sign", "distance" (to the nearest template), "votes" (of the k nearest)}
+        """
+        queries = normalize_keypoints(np.atleast_2d(keypoints))
+        distances = self.distances(queries)
+
+        # k smallest per row without sorting the whole row
+        nearest = np.argpartition(distances, self.k - 1, axis=1)[:, :self.k]
+        nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        nearest_distances = np.sqrt(np.take_along_axis(nearest_distances, order, axis=1))
+
+        # Inverse-distance weighted vote among the k nearest
+        weights = 1.0 / (nearest_distances + 1e-3)
+        scores = np.zeros((len(queries), len(self.vocabulary)), dtype=np.float32)
+        np.add.at(scores, (np.arange(len(queries))[:, None], self.labels[nearest]), weights)
+        best = np.argmax(scores, axis=1)
+        agreement = scores[np.arange(len(queries)), best] / scores.sum(axis=1)
+
+        matches = []
+        for row in range(len(queries)):
+            nearest_distance = float(nearest_distances[row, 0])
+            too_far = self.max_distance is not None and nearest_distance > self.max_distance
+            counts = np.bincount(self.labels[nearest[row]], minlength=len(self.vocabulary))
+            matches.append({
+                "sign": None if too_far else str(self.vocabulary[best[row]]),
+                "distance": round(nearest_distance, 4),
+                "agreement": round(float(agreement[row]), 3),
+                "votes": {str(self.vocabulary[i]): int(c) for i, c in enumerate(counts) if c},
+            })
+        return matches
+
+    def stats(self):
+        return {
+            "templates": len(self.vectors),
+            "signs": len(self.vocabulary),
+            "k": self.k,
+            "max_distance": self.max_distance,
+            "memory_kb": round(self.nbytes / 1024, 1),
+        }
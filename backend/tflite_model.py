@@ -0,0 +1,52 @@
+# backend/tflite_model.py
+"""
+TFLite runtime for the (optionally quantized) single-frame gesture classifier.
+
+Uses the standalone LiteRT / tflite-runtime interpreter when installed so the
+backend doesn't need full TensorFlow; falls back to tf.lite otherwise.
+"""
+
+import numpy as np
+
+
+def _load_interpreter_class():
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+class TFLiteGestureModel:
+    """
+    predict() mirrors the Keras call signature. Not thread-safe: call it from a
+    single thread (the micro-batcher worker does exactly that).
+    """
+
+    def __init__(self, path, num_threads=1):
+        self.interpreter = _load_interpreter_class()(model_path=path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input_index = self.interpreter.get_input_details()[0]['index']
+        self._output_index = self.interpreter.get_output_details()[0]['index']
+        self._batch_size = int(self.interpreter.get_input_details()[0]['shape'][0])
+
+    def predict(self, batch, verbose=0):
+        """(N, 126) keypoints -> (N, num_actions) probabilities"""
+        x = np.asarray(batch, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None, :]
+        if x.shape[0] != self._batch_size:
+            # Re-plan only when the batch size actually changes
+            self.interpreter.resize_tensor_input(self._input_index, list(x.shape))
+            self.interpreter.allocate_tensors()
+            self._batch_size = x.shape[0]
+        self.interpreter.set_tensor(self._input_index, x)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output_index).copy()
@@ -0,0 +1,150 @@
+# backend/verification.py
+"""
+Server-side grading for "show the sign" questions.
+
+A client opens a verification for a target sign on its practice session and
+keeps streaming frames as usual. Every frame with a hand adds evidence - the
+log ratio of the target's probability to the best other sign's, clipped so a
+single frame can't decide - and the verdict is final as soon as the total
+crosses the pass or fail margin (or a frame budget runs out - hand frames, or
+all frames so a camera that never shows a hand still ends). Responses then
+say "done" and the client stops sending frames. Delta-gate replays ("cached")
+repeat an earlier frame's prediction, so they add no evidence.
+"""
+
+import math
+import threading
+
+import numpy as np
+
+EPSILON = 1e-3  # probabilities are rounded to 3 decimals in responses
+
+
+class SignVerification:
+    """Evidence for one target sign, accumulated across a session's frames"""
+
+    def __init__(self, target_sign, policy):
+        self.target_sign = target_sign
+        self.policy = policy
+        self.status = "pending"
+        self.reason = None  # why it failed: "evidence", "max_frames" or "no_hand"
+        self.frames = 0
+        self.hand_frames = 0
+        self.evidence = 0.0
+        self._probability_sums = {}
+
+    @property
+    def done(self):
+        return self.status != "pending"
+
+    def update(self, result):
+        """Add one prediction response; returns True when this frame decided the verdict"""
+        if self.done:
+            return False
+        self.frames += 1
+        predictions = result.get("all_predictions")
+        if not result.get("hand_detected") or not predictions or result.get("cached"):
+            # A gate replay is the previous frame's evidence, not new evidence; either way
+            # the frame still counts toward the overall budget
+            if self.frames >= self.policy.max_total_frames:
+                self._fail("no_hand" if self.hand_frames < self.policy.min_frames else "max_frames")
+                return True
+            return False
+
+        self.hand_frames += 1
+        for sign, probability in predictions.items():
+            self._probability_sums[sign] = self._probability_sums.get(sign, 0.0) + probability
+        target = predictions.get(self.target_sign, 0.0)
+        other = max((p for sign, p in predictions.items() if sign != self.target_sign), default=0.0)
+        ratio = math.log((target + EPSILON) / (other + EPSILON))
+        self.evidence += float(np.clip(ratio, -self.policy.frame_clip, self.policy.frame_clip))
+
+        if self.hand_frames >= self.policy.min_frames:
+            if self.evidence >= self.policy.pass_evidence:
+                self.status = "passed"
+            elif self.evidence <= -self.policy.fail_evidence:
+                self.status, self.reason = "failed", "evidence"
+        if not self.done and (self.hand_frames >= self.policy.max_frames
+                              or self.frames >= self.policy.max_total_frames):
+            self.status, self.reason = "failed", "max_frames"
+        if self.done:
+            self.policy.record_verdict(self)
+        return self.done
+
+    def _fail(self, reason):
+        self.status, self.reason = "failed", reason
+        self.policy.record_verdict(self)
+
+    def state(self):
+        """Response block - "sign" is the best-supported sign so far (mean probability)"""
+        sign, confidence = None, 0.0
+        if self._probability_sums:
+            sign = max(self._probability_sums, key=self._probability_sums.get)
+            confidence = self._probability_sums[sign] / self.hand_frames
+        return {
+            "target_sign": self.target_sign,
+            "status": self.status,
+            "reason": self.reason,
+            "done": self.done,
+            "frames": self.frames,
+            "hand_frames": self.hand_frames,
+            "max_frames": self.policy.max_frames,
+            "evidence": round(self.evidence, 3),
+            "sign": sign,
+            "confidence": round(confidence, 3),
+        }
+
+
+class VerificationPolicy:
+    """
+    pass_evidence -- total evidence needed to pass (natural-log units)
+    fail_evidence -- total counter-evidence that fails the attempt
+    min_frames    -- hand frames required before any verdict
+    max_frames    -- hand frames after which a still-undecided attempt fails
+    max_total_frames -- frames of any kind (with or without a hand) after which it fails;
+                        default 2 x max_frames
+    frame_clip    -- most evidence (either way) a single frame can add
+    """
+
+    def __init__(self, pass_evidence=6.0, fail_evidence=12.0, min_frames=3, max_frames=60, frame_clip=2.5,
+                 max_total_frames=None):
+        self.pass_evidence = float(pass_evidence)
+        self.fail_evidence = float(fail_evidence)
+        self.min_frames = max(1, int(min_frames))
+        self.max_frames = max(self.min_frames, int(max_frames))
+        self.max_total_frames = max(self.max_frames, int(max_total_frames or 2 * self.max_frames))
+        self.frame_clip = float(frame_clip)
+
+        self._lock = threading.Lock()
+        self._started = 0
+        self._passed = 0
+        self._failed = 0
+        self._frames_to_verdict = 0
+
+    def start(self, target_sign):
+        with self._lock:
+            self._started += 1
+        return SignVerification(target_sign, self)
+
+    def record_verdict(self, verification):
+        with self._lock:
+            if verification.status == "passed":
+                self._passed += 1
+            else:
+                self._failed += 1
+            self._frames_to_verdict += verification.frames
+
+    def stats(self):
+        with self._lock:
+            decided = self._passed + self._failed
+            return {
+                "pass_evidence": self.pass_evidence,
+                "fail_evidence": self.fail_evidence,
+                "min_frames": self.min_frames,
+                "max_frames": self.max_frames,
+                "max_total_frames": self.max_total_frames,
+                "started": self._started,
+                "passed": self._passed,
+                "failed": self._failed,
+                "mean_frames_to_verdict": round(self._frames_to_verdict / decided, 2) if decided else None,
+            }
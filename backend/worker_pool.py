@@ -0,0 +1,288 @@
+# backend/worker_pool.py
+"""
+Multi-core inference worker pool.
+
+Hand detection is CPU-bound and a single HandLandmarker must not be used from
+several Flask threads at once, so detection is fanned out to separate worker
+processes. Each worker owns its own HandLandmarker (and NumPy classifier when
+one is available).
+
+Frames are handed over through a fixed set of shared-memory slots instead of
+pickling arrays: the request thread converts BGR -> RGB straight into a free
+slot and only a tiny (job_id, slot, height, width) tuple crosses the process
+boundary.
+
+With an ROI (the session's previous hand box, ROI_CROP) the worker detects on
+a crop of the slot first and only falls back to the full frame on a miss; the
+landmarks are mapped back to full-frame coordinates before classifying.
+
+A supervisor thread replaces workers that die: the job a dead worker held is
+failed right away (and its slot freed) instead of waiting out the timeout.
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# One worker per core - native libraries must not spawn a thread pool each. Spawned
+# children import numpy while unpickling, before _worker_main runs, so these are set
+# in the parent around Process.start() (values the operator set are kept).
+WORKER_THREAD_ENV = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+SUPERVISE_INTERVAL_S = 0.5
+
+
+class FrameTooLarge(ValueError):
+    """The frame does not fit in a shared-memory slot (ML_WORKER_MAX_PIXELS)"""
+
+
+def _worker_main(worker_id, slot_names, hand_model_path, classifier_path, jobs, results, current_jobs):
+    """Worker process loop: detect hands + classify frames read from shared memory"""
+    from frame_preprocess import crop_to_roi, uncrop_keypoints
+    from hand_tracking import create_hand_landmarker, extract_hand_keypoints, to_mp_image
+
+    detector = create_hand_landmarker(hand_model_path)
+    classifier = None
+    if classifier_path:
+        from numpy_model import NumpyGestureModel
+        classifier = NumpyGestureModel(classifier_path)
+
+    blocks = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    results.put(('ready', worker_id, None, None, 0.0))
+
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            job_id, slot, height, width, roi = job
+            current_jobs[worker_id] = job_id  # lets the parent fail this job if the process dies
+            started = time.perf_counter()
+            try:
+                frame_rgb = np.ndarray((height, width, 3), dtype=np.uint8, buffer=blocks[slot].buf)
+                keypoints, roi_hit = None, None
+                if roi is not None:
+                    crop, box = crop_to_roi(frame_rgb, roi)
+                    crop_keypoints = extract_hand_keypoints(detector.detect(to_mp_image(np.ascontiguousarray(crop))))
+                    roi_hit = bool(np.sum(np.abs(crop_keypoints)) >= 0.01)
+                    if roi_hit:
+                        keypoints = uncrop_keypoints(crop_keypoints, box, frame_rgb.shape)
+                if keypoints is None:
+                    keypoints = extract_hand_keypoints(detector.detect(to_mp_image(frame_rgb)))
+                probabilities = None
+                if classifier is not None and np.sum(np.abs(keypoints)) >= 0.01:
+                    probabilities = classifier.predict(keypoints)[0]
+                payload = (keypoints, probabilities, roi_hit)
+                error = None
+            except Exception as e:
+                payload, error = None, str(e)
+            results.put((job_id, worker_id, payload, error, time.perf_counter() - started))
+            current_jobs[worker_id] = -1
+    finally:
+        detector.close()
+        for block in blocks:
+            block.close()
+
+
+class _PendingJob:
+    __slots__ = ('slot', 'done', 'payload', 'error')
+
+    def __init__(self, slot):
+        self.slot = slot
+        self.done = threading.Event()
+        self.payload = None
+        self.error = None
+
+
+class InferenceWorkerPool:
+    """
+    num_workers      -- worker processes (one HandLandmarker each)
+    hand_model_path  -- hand_landmarker.task
+    classifier_path  -- NumPy classifier .npz, or None to classify in the parent
+    queue_depth      -- shared-memory slots = max frames in flight across all workers
+    max_frame_pixels -- largest frame (width * height) a slot can hold
+    """
+
+    def __init__(self, num_workers, hand_model_path, classifier_path=None,
+                 queue_depth=None, max_frame_pixels=1280 * 1280):
+        self.num_workers = max(1, int(num_workers))
+        self.queue_depth = max(1, int(queue_depth or self.num_workers * 2))
+        self.slot_bytes = int(max_frame_pixels) * 3
+
+        self._slots = [shared_memory.SharedMemory(create=True, size=self.slot_bytes)
+                       for _ in range(self.queue_depth)]
+        self._free_slots = queue.Queue()
+        for slot in range(self.queue_depth):
+            self._free_slots.put(slot)
+
+        self._ctx = ctx = multiprocessing.get_context('spawn')
+        self._jobs = ctx.Queue()
+        self._results = ctx.Queue()
+        self._current_jobs = ctx.Array('q', [-1] * self.num_workers, lock=False)
+        self._job_ids = itertools.count()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        self._started_at = time.monotonic()
+        self._ready = set()
+        self._frames = [0] * self.num_workers
+        self._busy_seconds = [0.0] * self.num_workers
+        self._submitted = 0
+        self._rejected = 0
+        self._errors = 0
+        self._restarts = 0
+        self._closing = threading.Event()
+
+        self._worker_args = ([block.name for block in self._slots], hand_model_path, classifier_path,
+                             self._jobs, self._results, self._current_jobs)
+        self._processes = [self._start_worker(i) for i in range(self.num_workers)]
+
+        self._dispatcher = threading.Thread(target=self._dispatch_results, name='worker-results', daemon=True)
+        self._dispatcher.start()
+        self._supervisor = threading.Thread(target=self._supervise, name='worker-supervisor', daemon=True)
+        self._supervisor.start()
+
+    def _start_worker(self, worker_id):
+        process = self._ctx.Process(target=_worker_main, name=f'inference-worker-{worker_id}', daemon=True,
+                                    args=(worker_id,) + self._worker_args)
+        added = [name for name in WORKER_THREAD_ENV if name not in os.environ]
+        for name in added:
+            os.environ[name] = '1'
+        try:
+            process.start()  # the child copies the environment here
+        finally:
+            for name in added:
+                del os.environ[name]
+        return process
+
+    def _supervise(self):
+        """Replace dead workers; fail the job a dead worker was holding"""
+        given_up = set()
+        while not self._closing.wait(SUPERVISE_INTERVAL_S):
+            for worker_id, process in enumerate(self._processes):
+                if process.is_alive() or worker_id in given_up or self._closing.is_set():
+                    continue
+                job_id = self._current_jobs[worker_id]
+                self._current_jobs[worker_id] = -1
+                with self._lock:
+                    was_ready = worker_id in self._ready
+                    self._ready.discard(worker_id)
+                    pending = self._pending.pop(job_id, None) if job_id >= 0 else None
+                    if pending is not None:
+                        self._errors += 1
+                if pending is not None:
+                    self._free_slots.put(pending.slot)
+                    pending.error = f"Inference worker {worker_id} died"
+                    pending.done.set()
+                if not was_ready:
+                    # Died while starting (e.g. the hand model won't load) - restarting would just loop
+                    given_up.add(worker_id)
+                    print(f"[ML] WARNING: inference worker {worker_id} failed to start (code {process.exitcode})")
+                    continue
+                print(f"[ML] WARNING: inference worker {worker_id} exited (code {process.exitcode}) - restarting")
+                with self._lock:
+                    self._restarts += 1
+                self._processes[worker_id] = self._start_worker(worker_id)
+
+    def submit(self, frame_bgr, roi=None, timeout=5.0):
+        """
+        Detect + classify one BGR frame in a worker, on a crop to the normalized
+        `roi` box first when one is given (see frame_preprocess.hand_roi).
+        Returns (keypoints, probabilities, roi_hit); probabilities is None when no
+        hand was found or the workers have no classifier, roi_hit is None without
+        an roi and otherwise says whether the crop found the hand.
+        Raises TimeoutError when every slot stays busy for `timeout` seconds and
+        FrameTooLarge when the frame does not fit in a slot.
+        """
+        import cv2
+
+        height, width = frame_bgr.shape[:2]
+        if height * width * 3 > self.slot_bytes:
+            raise FrameTooLarge(f"Frame {width}x{height} is larger than the worker slot size")
+
+        try:
+            slot = self._free_slots.get(timeout=timeout)
+        except queue.Empty:
+            with self._lock:
+                self._rejected += 1
+            raise TimeoutError("All inference workers are busy")
+
+        # Colour conversion writes straight into shared memory - no extra copy
+        shared_frame = np.ndarray((height, width, 3), dtype=np.uint8, buffer=self._slots[slot].buf)
+        cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=shared_frame)
+
+        job_id = next(self._job_ids)
+        pending = _PendingJob(slot)
+        with self._lock:
+            self._pending[job_id] = pending
+            self._submitted += 1
+        self._jobs.put((job_id, slot, height, width, roi))
+
+        if not pending.done.wait(timeout):
+            # The slot is returned by the dispatcher once the worker finishes
+            raise TimeoutError("Inference worker did not respond in time")
+        if pending.error is not None:
+            raise RuntimeError(pending.error)
+        return pending.payload
+
+    def _dispatch_results(self):
+        while True:
+            job_id, worker_id, payload, error, busy = self._results.get()
+            if job_id == 'ready':
+                with self._lock:
+                    self._ready.add(worker_id)
+                continue
+            if job_id is None:
+                break
+
+            with self._lock:
+                pending = self._pending.pop(job_id, None)
+                self._frames[worker_id] += 1
+                self._busy_seconds[worker_id] += busy
+                if error is not None:
+                    self._errors += 1
+            if pending is None:
+                continue
+            self._free_slots.put(pending.slot)
+            pending.payload = payload
+            pending.error = error
+            pending.done.set()
+
+    def stats(self):
+        uptime = max(time.monotonic() - self._started_at, 1e-9)
+        with self._lock:
+            workers = [{
+                "worker": i,
+                "alive": process.is_alive(),
+                "ready": i in self._ready,
+                "frames": self._frames[i],
+                "busy_s": round(self._busy_seconds[i], 3),
+                "utilization": round(self._busy_seconds[i] / uptime, 4),
+            } for i, process in enumerate(self._processes)]
+            return {
+                "workers": workers,
+                "queue_depth": self.queue_depth,
+                "in_flight": self.queue_depth - self._free_slots.qsize(),
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "errors": self._errors,
+                "restarts": self._restarts,
+            }
+
+    def close(self):
+        self._closing.set()
+        for _ in self._processes:
+            self._jobs.put(None)
+        for process in self._processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+        self._results.put((None, None, None, None, 0.0))
+        for block in self._slots:
+            block.close()
+            block.unlink()
@@ -87,6 +87,10 @@ export default function LivePracticeScreen() {
   const cameraRef = useRef<CameraView>(null);
   const isCameraReady = useRef(false);
   const isProcessing = useRef(false);
+  // Stable per-screen id so the backend can track hands between frames
+  const sessionIdRef = useRef(`live-${Date.now()}-${Math.random().toString(36).slice(2, 10)}`);
+  // Earliest time for the next capture — the server recommends an interval under load
+  const nextFrameAtRef = useRef(0);
 
   // ── Prediction state ──
   const [predictedSign, setPredictedSign] = useState<string | null>(null);
@@ -147,6 +151,8 @@ export default function LivePracticeScreen() {
     if (!isCameraReady.current || isProcessing.current || !cameraRef.current) return;
     // Don't capture once success is locked in
     if (isCorrectRef.current) return;
+    // Back off while the server is busy
+    if (Date.now() < nextFrameAtRef.current) return;
 
     isProcessing.current = true;
 
@@ -161,11 +167,13 @@ export default function LivePracticeScreen() {
 
       if (!photo?.base64) { isProcessing.current = false; return; }
 
+      const sentAt = Date.now();
       const response = await axios.post(
         `${API_URL}/predict`,
         { image: photo.base64 },
-        { timeout: 5000 },
+        { timeout: 5000, headers: { 'X-Session-Id': sessionIdRef.current } },
       );
+      nextFrameAtRef.current = sentAt + (response.data.recommended_interval_ms ?? 0);
 
       const { sign, confidence: conf, hand_detected } = response.data;
 
@@ -201,7 +209,9 @@ export default function LivePracticeScreen() {
       borderStateAnim.setValue(0);
 
     } catch (error: any) {
-      // Silent — don't crash on network issues
+      // Silent — don't crash on network issues. 429/503 say how long to back off.
+      const backoff = error?.response?.data?.recommended_interval_ms;
+      if (backoff) nextFrameAtRef.current = Date.now() + backoff;
     } finally {
       isProcessing.current = false;
     }
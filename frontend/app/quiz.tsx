@@ -113,6 +113,10 @@ export default function QuizScreen() {
   const isCameraReady = useRef(false);
   const isProcessingFrame = useRef(false);
   const cameraIntervalRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  // Stable per-quiz id so the backend keeps (and can reset) per-session prediction state
+  const sessionIdRef = useRef(`quiz-${Date.now()}-${Math.random().toString(36).slice(2, 10)}`);
+  // Earliest time for the next capture — the server recommends an interval under load
+  const nextFrameAtRef = useRef(0);
   const [cameraFeedback, setCameraFeedback] = useState('Position your hand in frame');
   const [cameraError, setCameraError] = useState(false); // RED state for wrong sign detection
   const [framesCollected, setFramesCollected] = useState(0);
@@ -137,8 +141,10 @@ export default function QuizScreen() {
     const currentQ = quizData.questions[currentQuestionIndex];
 
     if (currentQ?.type === 'show_sign' && cameraPermission?.granted && !isAnswered) {
-      // Reset prediction buffer on backend
-      axios.post(`${API_URL}/predict/reset`).catch(() => {});
+      // Server grades the attempt across frames (also clears the session's previous prediction state)
+      axios.post(`${API_URL}/predict/verify`, { target_sign: currentQ.target_sign || currentQ.correct_answer }, {
+        headers: { 'X-Session-Id': sessionIdRef.current },
+      }).catch(() => {});
       setCameraFeedback('Position your hand in frame');
       setCameraError(false);
       setFramesCollected(0);
@@ -177,6 +183,8 @@ export default function QuizScreen() {
 
   const captureAndPredict = useCallback(async (targetSign: string) => {
     if (!isCameraReady.current || isProcessingFrame.current || !cameraRef.current) return;
+    // Back off while the server is busy
+    if (Date.now() < nextFrameAtRef.current) return;
     isProcessingFrame.current = true;
 
     try {
@@ -191,13 +199,38 @@ export default function QuizScreen() {
         return;
       }
 
+      const sentAt = Date.now();
       const response = await axios.post(
         `${API_URL}/predict`,
         { image: photo.base64 },
-        { timeout: 3000 }
+        { timeout: 3000, headers: { 'X-Session-Id': sessionIdRef.current } }
       );
+      nextFrameAtRef.current = sentAt + (response.data.recommended_interval_ms ?? 0);
 
-      const { sign, confidence, frames_collected, frames_needed } = response.data;
+      const { sign, confidence, frames_collected, frames_needed, verification } = response.data;
+
+      // Server verdict is final — stop sending frames
+      if (verification?.done) {
+        if (cameraIntervalRef.current) {
+          clearInterval(cameraIntervalRef.current);
+          cameraIntervalRef.current = null;
+        }
+        if (verification.status === 'passed') {
+          setCameraError(false);
+          setCameraFeedback(`${targetSign.replace('_', ' ')} - Correct!`);
+          recordSignAttempt(targetSign, true).catch(() => {});
+          handleCameraCorrect(targetSign);
+        } else {
+          setCameraError(true);
+          setCameraFeedback(verification.sign && verification.sign !== targetSign
+            ? `Incorrect: That looked like ${verification.sign.replace('_', ' ')}`
+            : 'Incorrect: Sign not recognised');
+          recordSignAttempt(targetSign, false).catch(() => {});
+          handleCameraIncorrect();
+        }
+        isProcessingFrame.current = false;
+        return;
+      }
 
       // Still collecting frames
       if (frames_needed && frames_collected < frames_needed) {
@@ -207,8 +240,8 @@ export default function QuizScreen() {
         return;
       }
 
-      // ── Scenario A — SUCCESS ──
-      if (sign && confidence >= CONFIDENCE_THRESHOLD && sign === targetSign) {
+      // ── Scenario A — SUCCESS (only graded here when the server has no verification) ──
+      if (!verification && sign && confidence >= CONFIDENCE_THRESHOLD && sign === targetSign) {
         if (cameraIntervalRef.current) {
           clearInterval(cameraIntervalRef.current);
           cameraIntervalRef.current = null;
@@ -223,8 +256,8 @@ export default function QuizScreen() {
       else if (sign && confidence >= CONFIDENCE_THRESHOLD && sign !== targetSign) {
         setCameraError(true);
         setCameraFeedback(`Incorrect: That looks like ${sign.replace('_', ' ')}`);
-        // Record wrong attempt → adds to weak signs
-        recordSignAttempt(targetSign, false).catch(() => {});
+        // Record wrong attempt → adds to weak signs (the server verdict records it when verifying)
+        if (!verification) recordSignAttempt(targetSign, false).catch(() => {});
         // Throttle sound + haptic so they don't spam
         if (!wrongSoundCooldownRef.current) {
           wrongSoundCooldownRef.current = true;
@@ -245,7 +278,9 @@ export default function QuizScreen() {
         setCameraFeedback('Position your hand in frame');
       }
     } catch (error: any) {
-      // Silently ignore errors - don't show distracting messages
+      // Silently ignore errors - don't show distracting messages. 429/503 say how long to back off.
+      const backoff = error?.response?.data?.recommended_interval_ms;
+      if (backoff) nextFrameAtRef.current = Date.now() + backoff;
     } finally {
       isProcessingFrame.current = false;
     }
@@ -261,6 +296,17 @@ export default function QuizScreen() {
     setTimeout(() => setShowFeedbackModal(true), 300);
   };
 
+  const handleCameraIncorrect = () => {
+    // Server failed the attempt — same outcome as a wrong choice
+    setSelectedAnswer(null);
+    setIsCorrect(false);
+    setIsAnswered(true);
+    setHearts((prev) => prev - 1);
+    shakeAnimation();
+    playSound('wrong');
+    setTimeout(() => setShowFeedbackModal(true), 300);
+  };
+
   const handleCameraSkip = () => {
     // Skip — NO score, NO XP. Just advance to the next question.
     setSelectedAnswer(null);
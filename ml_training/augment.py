@@ -0,0 +1,192 @@
+"""
+Vectorized Keypoint Augmentation + Prefetching Input Pipeline
+-------------------------------------------------------------
+Whole-batch augmentations of (B, 126) keypoint arrays - no per-sample Python:
+
+  hand swap      - mirror x (x -> 1 - x) and swap the left/right slots, which is
+                   what MediaPipe reports for the same sign made with the other hand
+  rotation       - small in-plane rotation about the sample's landmark centroid
+                   (in aspect-corrected pixels, so hands don't shear)
+  scale / shift  - distance-to-camera and position-in-frame jitter
+  noise          - per-landmark gaussian noise
+  hand dropout   - drop one hand of two-hand samples (detector misses)
+
+Missing hands / landmarks (zeros) stay zeros through every step.
+
+batch_stream() yields shuffled, augmented batches epoch after epoch and
+prefetch() runs it on a background thread so batches are ready while the
+model trains on the previous one.
+
+Usage (throughput report, CPU):
+    python augment.py
+    python augment.py --batch-size 32 --seconds 3 --fit-epochs 3
+"""
+
+import argparse
+import os
+import queue
+import threading
+import time
+from contextlib import closing
+
+import numpy as np
+
+ASPECT = 640 / 480  # collect_data.py camera frames are 640x480
+
+DEFAULTS = {
+    "swap_prob": 0.5,
+    "max_rotation": 15.0,   # degrees
+    "scale_jitter": 0.1,    # +-10%
+    "shift_jitter": 0.05,   # normalized image units
+    "noise_std": 0.003,
+    "hand_dropout": 0.1,
+}
+
+
+def augment_batch(X, rng, swap_prob=0.5, max_rotation=15.0, scale_jitter=0.1, shift_jitter=0.05,
+                  noise_std=0.003, hand_dropout=0.1, aspect=ASPECT):
+    """(B, 126) keypoints -> augmented float32 copy, one random draw per sample"""
+    batch = np.array(X, dtype=np.float32).reshape(-1, 2, 21, 3)
+    n = len(batch)
+    present = np.any(batch != 0, axis=3)  # (B, hand, landmark)
+
+    # Mirror + swap hands
+    swap = rng.random(n) < swap_prob
+    batch[swap, :, :, 0] = np.where(present[swap], 1.0 - batch[swap, :, :, 0], 0.0)
+    batch[swap] = batch[swap][:, ::-1]
+    present[swap] = present[swap][:, ::-1]
+
+    # Rotate + scale about the centroid, then shift (x in aspect-corrected units)
+    xy = batch[..., :2] * np.array([aspect, 1.0], dtype=np.float32)
+    counts = np.maximum(present.sum(axis=(1, 2)), 1)[:, None]
+    centroid = (xy * present[..., None]).sum(axis=(1, 2)) / counts  # (B, 2)
+    theta = np.radians(rng.uniform(-max_rotation, max_rotation, n))
+    scale = 1.0 + rng.uniform(-scale_jitter, scale_jitter, n)
+    cos, sin = (np.cos(theta) * scale)[:, None, None], (np.sin(theta) * scale)[:, None, None]
+    shift = rng.uniform(-shift_jitter, shift_jitter, (n, 2)) * np.array([aspect, 1.0])
+    # Elementwise 2x2 transform (cheaper than a (B, 2, 2) batched matmul at these sizes)
+    x, y = xy[..., 0] - centroid[:, None, None, 0], xy[..., 1] - centroid[:, None, None, 1]
+    target = centroid + shift
+    batch[..., 0] = (cos * x - sin * y + target[:, None, None, 0]) / aspect
+    batch[..., 1] = sin * x + cos * y + target[:, None, None, 1]
+    batch[..., 2] *= scale[:, None, None]
+
+    batch += rng.normal(0.0, noise_std, batch.shape).astype(np.float32)
+
+    # Drop one hand of two-hand samples
+    drop = (rng.random(n) < hand_dropout) & present.any(axis=2).all(axis=1)
+    present[drop, rng.integers(0, 2, n)[drop]] = False
+
+    batch *= present[..., None]  # absent landmarks back to exact zeros
+    return batch.reshape(n, -1)
+
+
+def batch_stream(X, y, batch_size=32, augment=True, seed=0, chunk_batches=32, **augment_options):
+    """
+    Endless (X, y) batches: reshuffled every epoch, augmented unless augment=False.
+    Augmentation runs on `chunk_batches` batches at a time - fewer, larger NumPy
+    calls, so a prefetch thread rarely holds the GIL while training wants it.
+    """
+    rng = np.random.default_rng(seed)
+    options = dict(DEFAULTS, **augment_options)
+    chunk = batch_size * chunk_batches
+    while True:
+        order = rng.permutation(len(X))
+        for chunk_start in range(0, len(X), chunk):
+            rows = order[chunk_start:chunk_start + chunk]
+            block = augment_batch(X[rows], rng, **options) if augment else np.asarray(X[rows], dtype=np.float32)
+            labels = y[rows]
+            for start in range(0, len(rows), batch_size):
+                yield block[start:start + batch_size], labels[start:start + batch_size]
+
+
+def prefetch(iterator, depth=8):
+    """
+    Run an iterator on a background thread, up to `depth` items ahead of the consumer.
+    Closing the returned generator (or dropping it) stops the thread, so an endless
+    batch_stream and the arrays it holds are released - wrap a fit in contextlib.closing().
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        """Wait for room in the queue, but give up once the consumer has gone"""
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+        except Exception as e:  # re-raised in the consumer
+            put(e)
+            return
+        finally:
+            if hasattr(iterator, 'close'):
+                iterator.close()
+        put(done)
+
+    threading.Thread(target=produce, name='batch-prefetch', daemon=True).start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def pipeline_throughput(X, y, batch_size, augment, seconds, use_prefetch):
+    """Samples/sec the input pipeline alone can deliver"""
+    stream = batch_stream(X, y, batch_size, augment=augment)
+    if use_prefetch:
+        stream = prefetch(stream)
+    samples, started = 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        batch, _ = next(stream)
+        samples += len(batch)
+    return samples / (time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Report augmentation / input pipeline throughput")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=3.0, help="per pipeline measurement")
+    parser.add_argument('--fit-epochs', type=int, default=3, help="epochs per training measurement (0 = skip)")
+    args = parser.parse_args()
+
+    from dataset import ACTIONS, DATA_PATH, load_frames
+    X, y, _ = load_frames(DATA_PATH, ACTIONS)
+    X = X.astype(np.float32)
+    print(f"CPUs: {os.cpu_count()}, samples: {len(X)}, batch size: {args.batch_size}\n")
+
+    print("Input pipeline alone:")
+    for augment in (False, True):
+        for use_prefetch in (False, True):
+            rate = pipeline_throughput(X, y, args.batch_size, augment, args.seconds, use_prefetch)
+            print(f"  augment={str(augment):<5} prefetch={str(use_prefetch):<5} {rate:>12,.0f} samples/s")
+
+    if args.fit_epochs:
+        from train_model_single_frame import build_model
+        from tensorflow.keras.utils import to_categorical
+        Y = to_categorical(y, num_classes=len(ACTIONS))
+        steps = int(np.ceil(len(X) / args.batch_size))
+        print("\nTraining (model.fit, single-frame model):")
+        for augment in (False, True):
+            model = build_model(len(ACTIONS))
+            with closing(prefetch(batch_stream(X, Y, args.batch_size, augment=augment))) as stream:
+                model.fit(stream, steps_per_epoch=steps, epochs=1, verbose=0)  # build + warm up
+                started = time.perf_counter()
+                model.fit(stream, steps_per_epoch=steps, epochs=args.fit_epochs, verbose=0)
+            rate = steps * args.batch_size * args.fit_epochs / (time.perf_counter() - started)
+            print(f"  augment={str(augment):<5} {rate:>12,.0f} samples/s")
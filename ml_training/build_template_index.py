@@ -0,0 +1,172 @@
+"""
+Landmark Template Index for the Full Video Vocabulary
+-----------------------------------------------------
+The classifier only knows the signs in labels.json; quizzes use the 50 words in
+vocabulary.json (the backend's VIDEO_POOL). This job turns every sign video
+(backend/static/videos) and every reference recording
+(data/<ACTION>/<seq>/<frame>.npy) into normalized keypoint templates and writes
+them as one float32 matrix the backend matches against with a batched
+nearest-neighbour search (backend/template_index.py), so new signs are
+recognized by adding a video - no retraining.
+
+Near-duplicate frames (a held pose) are dropped per source so the index stays
+small: a frame is kept only if it is at least --min-spacing away from the last
+template kept from the same video / sequence.
+
+Produces:
+  sign_templates.npz  - vectors (N, 126) float32, labels, vocabulary, sources
+
+The index is a build artifact, not part of the repo: run this job (with the
+videos) before serving it with TEMPLATE_INDEX=true in the backend.
+
+Usage:
+    python fetch_hand_model.py            # videos need the MediaPipe hand model
+    python build_template_index.py
+    python build_template_index.py --videos-dir ../backend/static/videos --video-stride 2
+    python build_template_index.py --no-videos   # recordings only
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+from dataset import ACTIONS, DATA_PATH, NO_SEQUENCES, SEQUENCE_LENGTH, VOCABULARY
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from hand_tracking import create_hand_landmarker, extract_hand_keypoints, to_mp_image  # noqa: E402
+from template_index import normalize_keypoints, save_index  # noqa: E402
+
+INDEX_PATH = 'sign_templates.npz'
+VIDEOS_DIR = os.path.join('..', 'backend', 'static', 'videos')
+HAND_MODEL_PATH = 'hand_landmarker.task'
+
+# Recording folder names that differ from the vocabulary word
+RECORDING_ALIASES = {'GOOD_BYE': 'GOODBYE'}
+# Video file names that differ from word.capitalize() (see get_sign_video in the backend)
+VIDEO_NAMES = {'THANK_YOU': 'Thankyou', 'GOODBYE': 'Goodbye'}
+
+
+def find_video(videos_dir, word):
+    """Path of the sign video for a word, matching the backend's file naming (case-insensitive)"""
+    wanted = {VIDEO_NAMES.get(word, word.capitalize()).lower(), word.lower()}
+    for path in glob.glob(os.path.join(videos_dir, '*.mp4')):
+        if os.path.splitext(os.path.basename(path))[0].lower() in wanted:
+            return path
+    return None
+
+
+def thin(frames, min_spacing):
+    """Keep frames at least `min_spacing` (normalized RMS) from the last kept one"""
+    kept = []
+    for frame in frames:
+        if not kept or np.sqrt(np.mean((frame - kept[-1]) ** 2)) >= min_spacing:
+            kept.append(frame)
+    return kept
+
+
+def video_templates(path, hand_model_path, stride):
+    """Normalized keypoints of every `stride`-th video frame that has a hand"""
+    import cv2
+
+    detector = create_hand_landmarker(hand_model_path, video_mode=True)
+    capture = cv2.VideoCapture(path)
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    templates, frame_index = [], 0
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            # The tracker needs every frame; only every `stride`-th one becomes a template
+            results = detector.detect_for_video(to_mp_image(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)),
+                                                int(frame_index * 1000 / fps))
+            if frame_index % stride == 0:
+                keypoints = extract_hand_keypoints(results)
+                if np.sum(np.abs(keypoints)) >= 0.01:
+                    templates.append(normalize_keypoints(keypoints))
+            frame_index += 1
+    finally:
+        capture.release()
+        detector.close()
+    return templates
+
+
+def recording_templates(data_path, action):
+    """Normalized keypoints per recorded sequence (frames with a hand only)"""
+    sequences = []
+    for sequence in range(NO_SEQUENCES):
+        frames = []
+        for frame_num in range(SEQUENCE_LENGTH):
+            npy_path = os.path.join(data_path, action, str(sequence), f"{frame_num}.npy")
+            if os.path.exists(npy_path):
+                keypoints = np.load(npy_path)
+                if np.sum(np.abs(keypoints)) >= 0.01:
+                    frames.append(normalize_keypoints(keypoints))
+        if frames:
+            sequences.append(frames)
+    return sequences
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the nearest-neighbour sign template index")
+    parser.add_argument('--videos-dir', default=VIDEOS_DIR)
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--hand-model', default=HAND_MODEL_PATH)
+    parser.add_argument('--video-stride', type=int, default=3, help="use every Nth video frame")
+    parser.add_argument('--min-spacing', type=float, default=0.02,
+                        help="drop frames closer than this to the previous template from the same source")
+    parser.add_argument('--no-videos', action='store_true')
+    parser.add_argument('--no-recordings', action='store_true')
+    parser.add_argument('--output', default=INDEX_PATH)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    vocabulary = list(VOCABULARY)
+    vectors, labels, sources = [], [], {}
+
+    def add(word, templates, source):
+        if word not in vocabulary:
+            vocabulary.append(word)
+        kept = thin(templates, args.min_spacing)
+        vectors.extend(kept)
+        labels.extend([vocabulary.index(word)] * len(kept))
+        sources[source] = sources.get(source, 0) + len(kept)
+        return len(kept)
+
+    # ========== SIGN VIDEOS ==========
+    if not args.no_videos:
+        if not os.path.exists(args.hand_model):
+            raise SystemExit(f"Hand model not found at {args.hand_model} - run fetch_hand_model.py "
+                             "(or pass --no-videos)")
+        missing = []
+        for word in VOCABULARY:
+            path = find_video(args.videos_dir, word)
+            if path is None:
+                missing.append(word)
+                continue
+            kept = add(word, video_templates(path, args.hand_model, args.video_stride), os.path.basename(path))
+            print(f"  {word:<12} {kept:>4} templates from {os.path.basename(path)}")
+        if missing:
+            print(f"No video for {len(missing)} words: {', '.join(missing)}")
+
+    # ========== REFERENCE RECORDINGS ==========
+    if not args.no_recordings:
+        for action in ACTIONS:
+            word = RECORDING_ALIASES.get(action, action)
+            kept = sum(add(word, frames, f"data/{action}") for frames in recording_templates(args.data_path, action))
+            print(f"  {word:<12} {kept:>4} templates from data/{action}")
+
+    if not vectors:
+        raise SystemExit("No templates extracted - nothing to index")
+
+    # ========== SAVE ==========
+    matrix = np.stack(vectors).astype(np.float32)
+    save_index(args.output, matrix, labels, vocabulary, sources)
+    covered = len(set(labels))
+    print(f"\nIndex saved as '{args.output}': {len(matrix)} templates, {covered}/{len(vocabulary)} signs covered, "
+          f"{matrix.nbytes / 1024:.1f} KB of vectors, built in {time.perf_counter() - started:.1f}s")
+    print("Serve it with TEMPLATE_INDEX=true in the backend")
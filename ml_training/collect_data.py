@@ -1,43 +1,81 @@
-import cv2
-import numpy as np
+"""
+Data Collection
+---------------
+Records `no_sequences` x `sequence_length` keypoint frames per word from the
+webcam (or a video file) into data/<ACTION>/<sequence>/<frame>.npy.
+
+Runs as a pipeline so slow detection or disk writes never stall the camera:
+
+  capture thread   - cap.read() into a small bounded queue. When detection falls
+                     behind, the oldest waiting frame is dropped (and counted)
+                     rather than recording stale frames.
+  detection thread - MediaPipe + the collection schedule (countdown, pause,
+                     sequences)
+  writer thread    - saves a whole sequence per write, plus
+                     data/<ACTION>/<sequence>/meta.json with the per-frame
+                     capture timestamps, dropped-frame count and effective fps
+  main thread      - preview window ('q' quits); skipped with --headless
+
+A video file is read losslessly (every frame, as fast as detection allows)
+unless --realtime paces it like a camera.
+
+Usage:
+    python collect_data.py
+    python collect_data.py --actions HELLO YES --sequences 10
+    python collect_data.py --video hello.mp4 --actions HELLO --sequences 3 --headless --pause 0
+"""
+
+import argparse
+import json
 import os
+import queue
+import threading
+import time
 import urllib.request
 
+import cv2
+import numpy as np
+
 # --- CONFIGURATION ---
-DATA_PATH = os.path.join('data') 
+from dataset import ACTIONS, DATA_PATH, NO_SEQUENCES, SEQUENCE_LENGTH
 
-# These are the words from your Lesson 1 (Greetings)
-actions = np.array(['HELLO', 'WELCOME', 'YES', 'NO', 'PLEASE', 'THANK_YOU', 'SORRY', 'FINE', 'OK', 'GOOD_BYE'])
+# These are the words from your Lesson 1 (Greetings) - edit labels.json to change them
+actions = ACTIONS
 
-no_sequences = 30   # Record 30 videos per word
-sequence_length = 30 # Each video is 30 frames long (1 second)
+no_sequences = NO_SEQUENCES       # Record 30 videos per word
+sequence_length = SEQUENCE_LENGTH # Each video is 30 frames long (1 second)
 
-# --- DOWNLOAD MEDIAPIPE HAND LANDMARK MODEL ---
 MODEL_PATH = 'hand_landmarker.task'
-if not os.path.exists(MODEL_PATH):
-    print("Downloading MediaPipe hand landmark model...")
-    url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
-    urllib.request.urlretrieve(url, MODEL_PATH)
-    print("Model downloaded successfully!")
-
-# --- MEDIAPIPE SETUP (New API) ---
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
-from mediapipe import Image, ImageFormat
-
-# Create HandLandmarker
-base_options = python.BaseOptions(model_asset_path=MODEL_PATH)
-options = vision.HandLandmarkerOptions(
-    base_options=base_options,
-    num_hands=2,  # Detect both hands
-    min_hand_detection_confidence=0.5,
-    min_hand_presence_confidence=0.5,
-    min_tracking_confidence=0.5
-)
-detector = vision.HandLandmarker.create_from_options(options)
-
-def mediapipe_detection(image):
+CAPTURE_QUEUE = 4   # frames waiting for detection (~130 ms at 30 fps)
+WRITE_QUEUE = 8     # finished sequences waiting for the disk
+
+
+def create_detector():
+    """Download the MediaPipe hand landmark model if needed and create a HandLandmarker"""
+    if not os.path.exists(MODEL_PATH):
+        print("Downloading MediaPipe hand landmark model...")
+        url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
+        urllib.request.urlretrieve(url, MODEL_PATH)
+        print("Model downloaded successfully!")
+
+    # --- MEDIAPIPE SETUP (New API) ---
+    from mediapipe.tasks import python
+    from mediapipe.tasks.python import vision
+
+    base_options = python.BaseOptions(model_asset_path=MODEL_PATH)
+    options = vision.HandLandmarkerOptions(
+        base_options=base_options,
+        num_hands=2,  # Detect both hands
+        min_hand_detection_confidence=0.5,
+        min_hand_presence_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+    return vision.HandLandmarker.create_from_options(options)
+
+
+def mediapipe_detection(image, detector):
     """Process image with MediaPipe and return landmarks"""
+    from mediapipe import Image, ImageFormat
     image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
     mp_image = Image(image_format=ImageFormat.SRGB, data=image_rgb)
     results = detector.detect(mp_image)
@@ -47,9 +85,9 @@ def draw_landmarks(image, results):
     """Draw hand landmarks on the image"""
     if not results.hand_landmarks:
         return image
-    
+
     height, width, _ = image.shape
-    
+
     for hand_landmarks in results.hand_landmarks:
         # Draw connections between landmarks
         connections = [
@@ -60,13 +98,13 @@ def draw_landmarks(image, results):
             (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky
             (5, 9), (9, 13), (13, 17)  # Palm
         ]
-        
+
         # Draw landmarks
         for landmark in hand_landmarks:
             x = int(landmark.x * width)
             y = int(landmark.y * height)
             cv2.circle(image, (x, y), 5, (0, 255, 0), -1)
-        
+
         # Draw connections
         for connection in connections:
             start_idx, end_idx = connection
@@ -75,7 +113,7 @@ def draw_landmarks(image, results):
             start_point = (int(start.x * width), int(start.y * height))
             end_point = (int(end.x * width), int(end.y * height))
             cv2.line(image, start_point, end_point, (255, 0, 0), 2)
-    
+
     return image
 
 def extract_keypoints(results):
@@ -83,92 +121,245 @@ def extract_keypoints(results):
     # Initialize arrays for left and right hand
     lh = np.zeros(21*3)
     rh = np.zeros(21*3)
-    
+
     if results.hand_landmarks and results.handedness:
         for idx, hand_landmarks in enumerate(results.hand_landmarks):
             hand_label = results.handedness[idx][0].category_name  # "Left" or "Right"
-            
+
             # Extract x, y, z coordinates
             coords = np.array([[lm.x, lm.y, lm.z] for lm in hand_landmarks]).flatten()
-            
+
             if hand_label == "Left":
                 lh = coords
             else:
                 rh = coords
-    
+
     return np.concatenate([lh, rh])
 
-# --- MAIN LOOP ---
-# Create folders
-for action in actions: 
-    for sequence in range(no_sequences):
-        try: 
-            os.makedirs(os.path.join(DATA_PATH, action, str(sequence)))
-        except: pass
-
-# --- MAIN LOOP ---
-# Create folders
-for action in actions: 
-    for sequence in range(no_sequences):
-        try: 
-            os.makedirs(os.path.join(DATA_PATH, action, str(sequence)))
-        except: 
+
+# --- PIPELINE ---
+class EndOfInput(Exception):
+    """The video file ran out, or the user quit"""
+
+
+def put_until_stopped(items, item, stop):
+    """Blocking put that gives up once `stop` is set"""
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=0.1)
+            return True
+        except queue.Full:
             pass
+    return False
 
-cap = cv2.VideoCapture(0) # Open Webcam
-
-print("Starting data collection...")
-print("Press 'q' to quit at any time")
-
-for action in actions:
-    print(f"\n--- STARTING COLLECTION FOR: {action} ---")
-    print("Get ready... (2 second pause)")
-    
-    # Give user a break between words
-    for i in range(20):  # Show countdown
-        ret, frame = cap.read()
-        if ret:
-            cv2.putText(frame, f'Get ready for: {action}', (50, 50), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2, cv2.LINE_AA)
-            cv2.imshow('OpenCV Feed', frame)
-            cv2.waitKey(100)
-    
-    for sequence in range(no_sequences):
-        for frame_num in range(sequence_length):
-
-            ret, frame = cap.read()
-            if not ret:
-                print("Failed to grab frame")
-                break
-                
-            # Process frame with MediaPipe
-            results = mediapipe_detection(frame)
-            
-            # Draw landmarks
-            image = draw_landmarks(frame.copy(), results)
-            
-            # Collection Logic
-            if frame_num == 0: 
-                cv2.putText(image, 'STARTING COLLECTION', (120, 200), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 4, cv2.LINE_AA)
-                cv2.putText(image, f'Collecting frames for {action} Video Number {sequence}', (15, 12), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1, cv2.LINE_AA)
-                cv2.imshow('OpenCV Feed', image)
-                cv2.waitKey(2000) # 2 sec pause before recording starts
-            else: 
-                cv2.putText(image, f'Collecting frames for {action} Video Number {sequence}', (15, 12), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1, cv2.LINE_AA)
-                cv2.imshow('OpenCV Feed', image)
-            
-            # Export keypoints
-            keypoints = extract_keypoints(results)
-            npy_path = os.path.join(DATA_PATH, action, str(sequence), str(frame_num))
-            np.save(npy_path, keypoints)
-
-            # Break gracefully
-            if cv2.waitKey(10) & 0xFF == ord('q'):
+
+class FrameSource(threading.Thread):
+    """Capture thread: (timestamp seconds, frame) into a bounded queue, None at the end"""
+
+    def __init__(self, cap, stop, lossless, fps=None):
+        super().__init__(name='capture', daemon=True)
+        self.cap = cap
+        self.stop = stop
+        self.lossless = lossless  # block instead of dropping (video file, as fast as detection goes)
+        self.fps = fps            # video file: timestamps (and --realtime pacing) from the frame rate
+        self.frames = queue.Queue(maxsize=CAPTURE_QUEUE)
+        self.dropped = 0
+
+    def run(self):
+        started, frame_index = time.perf_counter(), 0
+        while not self.stop.is_set():
+            ok, frame = self.cap.read()
+            if not ok:
                 break
-                
-cap.release()
-cv2.destroyAllWindows()
-print("\nData collection complete!")
\ No newline at end of file
+            if self.fps:
+                timestamp = frame_index / self.fps
+                if not self.lossless:  # --realtime: deliver frames at the video's own rate
+                    time.sleep(max(0.0, started + timestamp - time.perf_counter()))
+            else:
+                timestamp = time.perf_counter() - started
+            frame_index += 1
+
+            if self.lossless:
+                if not put_until_stopped(self.frames, (timestamp, frame), self.stop):
+                    return
+                continue
+            try:
+                self.frames.put_nowait((timestamp, frame))
+            except queue.Full:
+                # Detection is behind: drop the oldest waiting frame, keep the newest
+                try:
+                    self.frames.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+                self.frames.put_nowait((timestamp, frame))
+        put_until_stopped(self.frames, None, self.stop)
+
+    def next(self):
+        while not self.stop.is_set():
+            try:
+                item = self.frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                raise EndOfInput()
+            return item
+        raise EndOfInput()
+
+
+class SequenceWriter(threading.Thread):
+    """Writer thread: one queue item per finished sequence - all its frames + meta.json"""
+
+    def __init__(self, data_path):
+        super().__init__(name='writer')
+        self.data_path = data_path
+        self.sequences = queue.Queue(maxsize=WRITE_QUEUE)
+        self.written = 0
+
+    def run(self):
+        while True:
+            item = self.sequences.get()
+            if item is None:
+                return
+            action, sequence, keypoints, meta = item
+            sequence_path = os.path.join(self.data_path, action, str(sequence))
+            os.makedirs(sequence_path, exist_ok=True)
+            for frame_num, frame_keypoints in enumerate(keypoints):
+                np.save(os.path.join(sequence_path, str(frame_num)), frame_keypoints)
+            # Renamed into place: besides never leaving half a file, this bumps the sequence
+            # folder's mtime, which is how a re-recorded sequence marks data_packed/ out of date
+            meta_path = os.path.join(sequence_path, 'meta.json')
+            with open(meta_path + '.tmp', 'w') as f:
+                json.dump(meta, f, indent=2)
+            os.replace(meta_path + '.tmp', meta_path)
+            self.written += 1
+
+
+def run_schedule(source, detector, writer, preview, words, sequences, length, pause, stop):
+    """Detection thread: countdown, pause and record every sequence of every word"""
+    def show(frame, results, lines):
+        if preview is None:
+            return
+        try:
+            preview.put_nowait((frame, results, lines))
+        except queue.Full:
+            pass  # the window is behind - skip this preview frame, never the recording
+
+    def wait(seconds, lines):
+        # Timed on frame timestamps, so a video file pauses by the same amount of footage
+        if seconds <= 0:
+            return
+        first, _ = source.next()
+        while True:
+            timestamp, frame = source.next()
+            show(frame, None, lines)
+            if timestamp - first >= seconds:
+                return
+
+    summary = []
+    try:
+        for action in words:
+            print(f"\n--- STARTING COLLECTION FOR: {action} ---")
+            wait(pause, [(f'Get ready for: {action}', (50, 50), 1, (0, 255, 0), 2)])
+
+            for sequence in range(sequences):
+                title = (f'Collecting frames for {action} Video Number {sequence}', (15, 12), 0.5, (0, 0, 255), 1)
+                wait(pause, [('STARTING COLLECTION', (120, 200), 1, (0, 255, 0), 4), title])
+
+                dropped_before = source.dropped
+                keypoints, timestamps = [], []
+                for _ in range(length):
+                    timestamp, frame = source.next()
+                    results = mediapipe_detection(frame, detector)
+                    keypoints.append(extract_keypoints(results))
+                    timestamps.append(timestamp)
+                    show(frame, results, [title])
+
+                span = timestamps[-1] - timestamps[0]
+                meta = {
+                    "action": action,
+                    "sequence": sequence,
+                    "frames": length,
+                    "timestamps_ms": [round((t - timestamps[0]) * 1000, 1) for t in timestamps],
+                    "dropped_frames": source.dropped - dropped_before,
+                    "effective_fps": round((length - 1) / span, 2) if span > 0 else None,
+                    "hand_frames": int(sum(np.sum(np.abs(k)) >= 0.01 for k in keypoints)),
+                }
+                if not put_until_stopped(writer.sequences, (action, sequence, keypoints, meta), stop):
+                    return summary
+                summary.append(meta)
+                print(f"  {action} #{sequence}: {meta['effective_fps']} fps, "
+                      f"{meta['dropped_frames']} dropped, {meta['hand_frames']}/{length} with hands")
+    except EndOfInput:
+        if not stop.is_set():
+            print("\nInput ended before collection finished")
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Record keypoint sequences for each word")
+    parser.add_argument('--video', help="read frames from a video file instead of the webcam")
+    parser.add_argument('--camera', type=int, default=0)
+    parser.add_argument('--realtime', action='store_true',
+                        help="--video: deliver frames at the video's frame rate, dropping like a camera")
+    parser.add_argument('--headless', action='store_true', help="no preview window")
+    parser.add_argument('--actions', nargs='+', default=list(actions))
+    parser.add_argument('--sequences', type=int, default=no_sequences)
+    parser.add_argument('--pause', type=float, default=2.0, help="seconds before each word and each sequence")
+    parser.add_argument('--data-path', default=DATA_PATH)
+    args = parser.parse_args()
+
+    detector = create_detector()
+    cap = cv2.VideoCapture(args.video if args.video else args.camera)
+    if not cap.isOpened():
+        raise SystemExit(f"Could not open {args.video or f'camera {args.camera}'}")
+    fps = (cap.get(cv2.CAP_PROP_FPS) or 30.0) if args.video else None
+
+    stop = threading.Event()
+    source = FrameSource(cap, stop, lossless=bool(args.video) and not args.realtime, fps=fps)
+    writer = SequenceWriter(args.data_path)
+    preview = None if args.headless else queue.Queue(maxsize=1)
+    result = {}
+    schedule = threading.Thread(name='detection', target=lambda: result.update(summary=run_schedule(
+        source, detector, writer, preview, args.actions, args.sequences, sequence_length, args.pause, stop)))
+
+    print("Starting data collection...")
+    print("Press 'q' to quit at any time" if preview is not None else "Press Ctrl+C to quit")
+    started = time.perf_counter()
+    source.start()
+    writer.start()
+    schedule.start()
+    try:
+        while schedule.is_alive():
+            if preview is None:
+                schedule.join(timeout=0.5)
+                continue
+            try:
+                frame, results, lines = preview.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            image = draw_landmarks(frame.copy(), results) if results is not None else frame
+            for text, origin, font_scale, color, thickness in lines:
+                cv2.putText(image, text, origin, cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thickness, cv2.LINE_AA)
+            cv2.imshow('OpenCV Feed', image)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                stop.set()
+    except KeyboardInterrupt:
+        stop.set()
+    schedule.join()
+    stop.set()
+    writer.sequences.put(None)  # flush everything already recorded
+    writer.join()
+    source.join(timeout=1.0)
+    cap.release()
+    if preview is not None:
+        cv2.destroyAllWindows()
+
+    summary = result.get("summary", [])
+    elapsed = time.perf_counter() - started
+    if summary:
+        rates = [meta["effective_fps"] for meta in summary if meta["effective_fps"]]
+        print(f"\n{writer.written} sequences written in {elapsed:.1f}s | "
+              f"effective fps mean {np.mean(rates):.1f}, min {np.min(rates):.1f} | "
+              f"{sum(meta['dropped_frames'] for meta in summary)} frames dropped")
+    print("\nData collection complete!")
@@ -0,0 +1,255 @@
+"""
+Shared keypoint dataset helpers for the training / export scripts.
+Reads the data/<ACTION>/<sequence>/<frame>.npy tree written by collect_data.py,
+or - when it exists - the memory-mapped pack of it written by pack_dataset.py.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+DATA_PATH = os.path.join('data')
+
+# labels.json is the one list of signs - collection, training, verification and the
+# backend's fallback labels all read it; registered model versions snapshot it
+LABELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'labels.json')
+with open(LABELS_PATH) as _f:
+    ACTIONS = np.array(json.load(_f))
+# vocabulary.json is the 50-word video vocabulary - the backend's VIDEO_POOL and the
+# template index both read it
+VOCABULARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vocabulary.json')
+with open(VOCABULARY_PATH) as _f:
+    VOCABULARY = json.load(_f)
+NO_SEQUENCES = 30
+SEQUENCE_LENGTH = 30
+
+# pack_dataset.py output: one float32 (N, 126) array + a row index, read through mmap
+PACKED_PATH = os.path.join('data_packed')
+PACKED_INDEX_DTYPE = np.dtype([('action', '<u2'), ('sequence', '<i4'), ('frame', '<i4'), ('hand', '?')])
+
+# Same split as train_model_single_frame.py, so "held-out" means the same frames everywhere
+TEST_SIZE = 0.15
+SPLIT_SEED = 42
+
+
+class PackedDataset:
+    """
+    A pack_dataset.py directory opened zero-copy: `keypoints` and `index` are
+    read-only memory maps, so only the rows actually touched are paged in.
+    """
+
+    def __init__(self, path=PACKED_PATH):
+        with open(os.path.join(path, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        self.actions = list(self.manifest["actions"])
+        self.keypoints = np.load(os.path.join(path, 'keypoints.npy'), mmap_mode='r')
+        self.index = np.load(os.path.join(path, 'index.npy'), mmap_mode='r')
+
+    def rows(self, action, hand_only=False):
+        """Row numbers of one action (in sequence, frame order)"""
+        if action not in self.actions:
+            return np.empty(0, dtype=np.int64)
+        mask = self.index['action'] == self.actions.index(action)
+        if hand_only:
+            mask &= self.index['hand']
+        return np.flatnonzero(mask)
+
+    def sequences(self, action):
+        """{sequence number: row numbers in frame order} for one action"""
+        rows = self.rows(action)
+        sequence_numbers = self.index['sequence'][rows]
+        return {int(sequence): rows[sequence_numbers == sequence] for sequence in np.unique(sequence_numbers)}
+
+
+def numeric_entries(path):
+    """Sorted integer-named entries of a directory ('3', '12.npy' -> 3, 12)"""
+    entries = []
+    for entry in os.scandir(path):
+        name = entry.name[:-4] if entry.name.endswith('.npy') else entry.name
+        if name.isdigit():
+            entries.append((int(name), entry.path))
+    return sorted(entries)
+
+
+def tree_state(data_path, actions, per_file=False):
+    """
+    (count, newest mtime) of a data/<ACTION>/<seq>/<frame>.npy tree.
+    By default only directories are looked at: the count is sequence folders and the
+    mtime the newest action / sequence folder - a few hundred stat calls, and enough to
+    see sequences added, removed or re-recorded by collect_data.py. per_file counts and
+    stats every frame file instead, which also catches frames edited in place.
+    """
+    count, newest = 0, 0.0
+    for action in actions:
+        action_path = os.path.join(data_path, action)
+        if not os.path.isdir(action_path):
+            continue
+        newest = max(newest, os.stat(action_path).st_mtime)
+        for _, sequence_path in numeric_entries(action_path):
+            if not per_file:
+                count += 1
+                newest = max(newest, os.stat(sequence_path).st_mtime)
+                continue
+            for _, npy_path in numeric_entries(sequence_path):
+                count += 1
+                newest = max(newest, os.stat(npy_path).st_mtime)
+    return count, newest
+
+
+def open_packed(path=PACKED_PATH, data_path=DATA_PATH, check_stale=False):
+    """
+    PackedDataset if `path` holds a pack of `data_path` that is still current, else None
+    (callers fall back to the .npy tree). A pack of a different tree is ignored; a pack
+    whose tree has changed since packing is ignored with a warning. The change check
+    reads directory mtimes and counts (see tree_state); check_stale=True stats every
+    frame file as well.
+    """
+    if not os.path.exists(os.path.join(path, 'manifest.json')):
+        return None
+    packed = PackedDataset(path)
+    source = packed.manifest.get("source")
+    if os.path.abspath(data_path) != source:
+        return None
+    if os.path.isdir(data_path):
+        manifest = packed.manifest
+        per_file = check_stale or "sequences" not in manifest  # packs from before the sequence count
+        count, newest = tree_state(data_path, packed.actions, per_file)
+        expected = manifest["rows"] if per_file else manifest["sequences"]
+        packed_at = time.mktime(time.strptime(manifest["packed_at"], '%Y-%m-%dT%H:%M:%S'))
+        if count != expected or newest > packed_at + 1:
+            unit = 'frames' if per_file else 'sequences'
+            print(f"WARNING: {path} is out of date with {data_path} ({expected} {unit} packed, "
+                  f"{count} on disk) - reading the .npy files; re-run pack_dataset.py")
+            return None
+    return packed
+
+
+def load_frames(data_path=DATA_PATH, actions=ACTIONS, verbose=True, packed_path=PACKED_PATH, return_groups=False,
+                check_stale=False):
+    """
+    Load every frame with a detected hand as one sample.
+    Returns (X float array (N, 126), y int labels (N,), skipped count), plus - with
+    return_groups - the recording each frame came from (label * NO_SEQUENCES + sequence),
+    for splits that must keep a recording's frames together.
+    check_stale: check every frame file against the pack, not just the directories
+    """
+    packed = open_packed(packed_path, data_path, check_stale) if packed_path else None
+    if packed is not None:
+        return load_frames_packed(packed, actions, verbose, return_groups)
+
+    label_map = {label: num for num, label in enumerate(actions)}
+    samples, labels, groups = [], [], []
+    skipped = 0
+
+    for action in actions:
+        for sequence in range(NO_SEQUENCES):
+            for frame_num in range(SEQUENCE_LENGTH):
+                npy_path = os.path.join(data_path, action, str(sequence), f"{frame_num}.npy")
+                if os.path.exists(npy_path):
+                    keypoints = np.load(npy_path)
+
+                    # Skip frames where no hand was detected (all zeros)
+                    if np.sum(np.abs(keypoints)) < 0.01:
+                        skipped += 1
+                        continue
+
+                    samples.append(keypoints)
+                    labels.append(label_map[action])
+                    groups.append(label_map[action] * NO_SEQUENCES + sequence)
+                else:
+                    skipped += 1
+
+    X = np.array(samples)
+    y = np.array(labels, dtype=int)
+    if verbose:
+        print(f"Total samples: {len(X)} (skipped {skipped} empty frames)")
+    if return_groups:
+        return X, y, skipped, np.array(groups, dtype=int)
+    return X, y, skipped
+
+
+def load_frames_packed(packed, actions=ACTIONS, verbose=True, return_groups=False):
+    """load_frames from a pack - same rows in the same order as reading the tree"""
+    expected = len(actions) * NO_SEQUENCES * SEQUENCE_LENGTH
+    in_range = (packed.index['sequence'] < NO_SEQUENCES) & (packed.index['frame'] < SEQUENCE_LENGTH)
+    rows = [packed.rows(action, hand_only=True) for action in actions]
+    rows = [r[in_range[r]] for r in rows]
+    X = np.asarray(packed.keypoints[np.concatenate(rows)])  # the one copy: gathers just the selected rows
+    y = np.concatenate([np.full(len(r), label, dtype=int) for label, r in enumerate(rows)])
+    skipped = expected - len(X)
+    if verbose:
+        print(f"Total samples: {len(X)} (skipped {skipped} empty frames) [packed]")
+    if return_groups:
+        groups = y * NO_SEQUENCES + packed.index['sequence'][np.concatenate(rows)]
+        return X, y, skipped, groups.astype(int)
+    return X, y, skipped
+
+
+def train_test_frames(X, y, num_classes=len(ACTIONS)):
+    """
+    The 85/15 stratified split used for training.
+    Stratifies on one-hot rows exactly like the training script so the frames match.
+    Returns X_train, X_test, y_train, y_test with integer labels.
+    """
+    from sklearn.model_selection import train_test_split
+    onehot = np.eye(num_classes, dtype=int)[y]
+    X_train, X_test, oh_train, oh_test = train_test_split(
+        X, onehot, test_size=TEST_SIZE, random_state=SPLIT_SEED, stratify=onehot)
+    return X_train, X_test, oh_train.argmax(axis=1), oh_test.argmax(axis=1)
+
+
+def load_sequences(data_path=DATA_PATH, actions=ACTIONS, verbose=True, packed_path=PACKED_PATH, check_stale=False):
+    """
+    Load whole recordings for the sequence model, empty (no-hand) frames included.
+    Missing frame files are zero-filled; sequences with no file at all are dropped.
+    Returns (X float32 array (N, SEQUENCE_LENGTH, 126), y int labels (N,))
+    """
+    packed = open_packed(packed_path, data_path, check_stale) if packed_path else None
+    if packed is not None:
+        return load_sequences_packed(packed, actions, verbose)
+
+    sequences, labels = [], []
+    for label, action in enumerate(actions):
+        for sequence in range(NO_SEQUENCES):
+            frames = np.zeros((SEQUENCE_LENGTH, 126), dtype=np.float32)
+            found = 0
+            for frame_num in range(SEQUENCE_LENGTH):
+                npy_path = os.path.join(data_path, action, str(sequence), f"{frame_num}.npy")
+                if os.path.exists(npy_path):
+                    frames[frame_num] = np.load(npy_path)
+                    found += 1
+            if found:
+                sequences.append(frames)
+                labels.append(label)
+
+    X = np.array(sequences, dtype=np.float32).reshape(-1, SEQUENCE_LENGTH, 126)
+    y = np.array(labels, dtype=int)
+    if verbose:
+        print(f"Total sequences: {len(X)}")
+    return X, y
+
+
+def load_sequences_packed(packed, actions=ACTIONS, verbose=True):
+    """load_sequences from a pack: one scatter of the rows into a zero-filled block"""
+    X = np.zeros((len(actions) * NO_SEQUENCES, SEQUENCE_LENGTH, 126), dtype=np.float32)
+    found = np.zeros(len(X), dtype=bool)
+    for label, action in enumerate(actions):
+        rows = packed.rows(action)
+        sequence, frame = packed.index['sequence'][rows], packed.index['frame'][rows]
+        keep = (sequence < NO_SEQUENCES) & (frame < SEQUENCE_LENGTH)
+        slots = label * NO_SEQUENCES + sequence[keep]
+        X[slots, frame[keep]] = packed.keypoints[rows[keep]]
+        found[slots] = True
+    y = np.repeat(np.arange(len(actions)), NO_SEQUENCES)
+    X, y = X[found], y[found]
+    if verbose:
+        print(f"Total sequences: {len(X)} [packed]")
+    return X, y
+
+
+def train_test_sequences(X, y):
+    """85/15 split by WHOLE sequence (stratified) so no recording leaks into both sides"""
+    from sklearn.model_selection import train_test_split
+    return train_test_split(X, y, test_size=TEST_SIZE, random_state=SPLIT_SEED, stratify=y)
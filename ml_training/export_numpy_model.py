@@ -0,0 +1,155 @@
+"""
+Export Single-Frame Model to NumPy
+----------------------------------
+Reads sign_lingo_model_single.h5 and writes a compact float32 .npz that
+backend/numpy_model.py can run WITHOUT importing TensorFlow.
+
+- Dropout layers are dropped (they are identity at inference time)
+- Each BatchNormalization is folded into the NEXT Dense layer.
+  BN sits after the ReLU in our model, so it can't be merged backwards;
+  instead  W' = scale[:, None] * W  and  b' = b + shift @ W
+
+Usage:
+    python export_numpy_model.py                  # export
+    python export_numpy_model.py --check          # export + compare with Keras
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import h5py
+import numpy as np
+
+DEFAULT_MODEL = 'sign_lingo_model_single.h5'
+DEFAULT_OUTPUT = 'sign_lingo_model_single.npz'
+DATA_PATH = os.path.join('data')
+
+SUPPORTED_ACTIVATIONS = ('linear', 'relu', 'softmax')
+
+
+def _layer_weights(h5file, layer_name):
+    """Collect a layer's weight arrays by short name (kernel, bias, gamma, ...)"""
+    weights = {}
+    group = h5file['model_weights'][layer_name]
+
+    def visit(name, obj):
+        if isinstance(obj, h5py.Dataset):
+            # Keras 2 stores 'kernel:0', Keras 3 stores 'kernel'
+            short = name.split('/')[-1].split(':')[0]
+            weights[short] = np.array(obj, dtype=np.float64)
+
+    group.visititems(visit)
+    return weights
+
+
+def fold_model(model_path):
+    """Return a list of (kernel, bias, activation) with BN folded and Dropout removed"""
+    with h5py.File(model_path, 'r') as f:
+        config = json.loads(f.attrs['model_config'])
+        layers = config['config']['layers']
+
+        folded = []
+        pending_scale, pending_shift = None, None
+
+        for layer in layers:
+            kind = layer['class_name']
+            cfg = layer['config']
+
+            if kind in ('InputLayer', 'Dropout'):
+                continue
+
+            if kind == 'BatchNormalization':
+                w = _layer_weights(f, cfg['name'])
+                gamma = w['gamma'] if cfg.get('scale', True) else np.ones_like(w['moving_mean'])
+                beta = w['beta'] if cfg.get('center', True) else np.zeros_like(w['moving_mean'])
+                scale = gamma / np.sqrt(w['moving_variance'] + cfg.get('epsilon', 1e-3))
+                shift = beta - w['moving_mean'] * scale
+
+                # Two BNs in a row compose into a single affine transform
+                if pending_scale is not None:
+                    shift = pending_shift * scale + shift
+                    scale = pending_scale * scale
+                pending_scale, pending_shift = scale, shift
+                continue
+
+            if kind == 'Dense':
+                activation = cfg.get('activation', 'linear')
+                if activation not in SUPPORTED_ACTIVATIONS:
+                    raise ValueError(f"Unsupported activation '{activation}' in layer {cfg['name']}")
+
+                w = _layer_weights(f, cfg['name'])
+                kernel = w['kernel']
+                bias = w['bias'] if cfg.get('use_bias', True) else np.zeros(kernel.shape[1])
+
+                if pending_scale is not None:
+                    bias = bias + pending_shift @ kernel
+                    kernel = pending_scale[:, None] * kernel
+                    pending_scale, pending_shift = None, None
+
+                folded.append((kernel, bias, activation))
+                continue
+
+            raise ValueError(f"Unsupported layer type '{kind}' ({cfg.get('name')})")
+
+        if pending_scale is not None:
+            raise ValueError("Trailing BatchNormalization has no Dense layer to fold into")
+
+    return folded
+
+
+def save_numpy_model(folded, output_path):
+    arrays = {}
+    for i, (kernel, bias, activation) in enumerate(folded):
+        arrays[f'kernel_{i}'] = kernel.astype(np.float32)
+        arrays[f'bias_{i}'] = bias.astype(np.float32)
+    arrays['activations'] = np.array([activation for _, _, activation in folded])
+    np.savez(output_path, **arrays)
+
+
+def load_check_samples(limit=2000):
+    """Real keypoint frames from the dataset (falls back to random rows)"""
+    from dataset import load_frames
+    X, _, _ = load_frames(DATA_PATH, verbose=False)
+    if len(X):
+        return np.asarray(X[:limit], dtype=np.float32)
+    return np.random.default_rng(0).random((limit, 126), dtype=np.float32)
+
+
+def check_against_keras(model_path, output_path, atol):
+    """Compare NumPy runtime outputs with Keras model.predict on the same inputs"""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+    from numpy_model import NumpyGestureModel
+    from tensorflow.keras.models import load_model
+
+    X = load_check_samples()
+    keras_out = load_model(model_path).predict(X, verbose=0)
+    numpy_out = NumpyGestureModel(output_path).predict(X)
+
+    max_delta = float(np.max(np.abs(keras_out - numpy_out)))
+    top1 = float(np.mean(np.argmax(keras_out, axis=1) == np.argmax(numpy_out, axis=1)))
+    print(f"Parity on {len(X)} samples: max |delta| = {max_delta:.2e}, top-1 agreement = {top1 * 100:.2f}%")
+
+    if max_delta > atol:
+        raise SystemExit(f"FAILED: max delta {max_delta:.2e} exceeds tolerance {atol:.0e}")
+    print("PASSED")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export the single-frame model for the NumPy runtime")
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--check', action='store_true', help="compare against Keras (needs TensorFlow)")
+    parser.add_argument('--atol', type=float, default=1e-4)
+    args = parser.parse_args()
+
+    folded = fold_model(args.model)
+    save_numpy_model(folded, args.output)
+
+    shapes = ' -> '.join(f"{k.shape[0]}x{k.shape[1]} {a}" for k, _, a in folded)
+    print(f"Exported {len(folded)} Dense layers ({shapes})")
+    print(f"Saved '{args.output}' ({os.path.getsize(args.output) / 1024:.1f} KB)")
+
+    if args.check:
+        check_against_keras(args.model, args.output, args.atol)
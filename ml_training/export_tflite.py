@@ -0,0 +1,153 @@
+"""
+Quantized TFLite Export for the Single-Frame Classifier
+-------------------------------------------------------
+Run after train_model_single_frame.py. Produces:
+
+  sign_lingo_model_single_fp16.tflite  - float16 weights
+  sign_lingo_model_single_int8.tflite  - post-training INT8 (float in/out),
+                                         calibrated on real keypoints from data/
+
+and a parity + cost report (tflite_report.json) comparing every variant with
+the .h5 model on the SAME held-out split the training script evaluates on:
+top-1 agreement, max probability delta, accuracy, single-frame latency,
+file size and RSS growth after loading.
+
+Usage:
+    python export_tflite.py
+    python export_tflite.py --calibration-samples 500 --latency-runs 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+
+from dataset import ACTIONS, DATA_PATH, load_frames, train_test_frames
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from tflite_model import TFLiteGestureModel  # noqa: E402
+
+MODEL_PATH = 'sign_lingo_model_single.h5'
+NUMPY_MODEL_PATH = 'sign_lingo_model_single.npz'
+FP16_PATH = 'sign_lingo_model_single_fp16.tflite'
+INT8_PATH = 'sign_lingo_model_single_int8.tflite'
+REPORT_PATH = 'tflite_report.json'
+
+
+def rss_mb():
+    """Resident set size of this process in MB (Linux /proc, None elsewhere)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return None
+
+
+def convert(model, quantization, calibration=None):
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantization == 'fp16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == 'int8':
+        def representative_dataset():
+            for row in calibration:
+                yield [row[None, :].astype(np.float32)]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        # Keep float32 input/output so the backend call site doesn't change
+        converter.inference_input_type = tf.float32
+        converter.inference_output_type = tf.float32
+    return converter.convert()
+
+
+def single_frame_latency(predict, X, runs):
+    """p50 / p95 milliseconds for one (1, 126) frame, like a live /predict call"""
+    for i in range(min(20, runs)):
+        predict(X[i % len(X)][None, :])
+    timings = []
+    for i in range(runs):
+        row = X[i % len(X)][None, :]
+        started = time.perf_counter()
+        predict(row)
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return {"p50_ms": round(float(np.percentile(timings, 50)), 4),
+            "p95_ms": round(float(np.percentile(timings, 95)), 4)}
+
+
+def evaluate(name, predict, reference, X_test, y_test, runs, path=None, rss_before=None):
+    probabilities = predict(X_test)
+    row = {
+        "variant": name,
+        "file_kb": round(os.path.getsize(path) / 1024.0, 1) if path else None,
+        "rss_growth_mb": round(rss_mb() - rss_before, 2) if rss_before is not None and rss_mb() else None,
+        "accuracy": round(float(np.mean(np.argmax(probabilities, axis=1) == y_test)), 4),
+        "top1_agreement": round(float(np.mean(np.argmax(probabilities, axis=1) == np.argmax(reference, axis=1))), 4),
+        "max_prob_delta": round(float(np.max(np.abs(probabilities - reference))), 6),
+    }
+    row.update(single_frame_latency(predict, X_test, runs))
+    return row
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export float16 / INT8 TFLite models with a parity report")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--calibration-samples', type=int, default=300)
+    parser.add_argument('--latency-runs', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=1)
+    args = parser.parse_args()
+
+    print("Loading data...")
+    X, y, _ = load_frames(DATA_PATH, ACTIONS)
+    X = X.astype(np.float32)
+    X_train, X_test, y_train, y_test = train_test_frames(X, y)
+    print(f"Held-out split: {len(X_test)} frames")
+
+    rss_start = rss_mb()
+    keras_model = load_model(args.model)
+    reference = keras_model.predict(X_test, verbose=0)
+
+    # ---- Export ----
+    rng = np.random.default_rng(0)
+    calibration = X_train[rng.choice(len(X_train), size=min(args.calibration_samples, len(X_train)), replace=False)]
+
+    for path, quantization in ((FP16_PATH, 'fp16'), (INT8_PATH, 'int8')):
+        with open(path, 'wb') as f:
+            f.write(convert(keras_model, quantization, calibration))
+        print(f"Saved '{path}' ({os.path.getsize(path) / 1024:.1f} KB)")
+
+    # ---- Parity + cost report ----
+    report = [evaluate('keras_h5', lambda x: keras_model.predict(x, verbose=0), reference,
+                       X_test, y_test, min(args.latency_runs, 200), args.model, rss_start)]
+
+    if os.path.exists(NUMPY_MODEL_PATH):
+        from numpy_model import NumpyGestureModel
+        before = rss_mb()
+        numpy_model = NumpyGestureModel(NUMPY_MODEL_PATH)
+        report.append(evaluate('numpy', numpy_model.predict, reference,
+                               X_test, y_test, args.latency_runs, NUMPY_MODEL_PATH, before))
+
+    for name, path in (('tflite_fp16', FP16_PATH), ('tflite_int8', INT8_PATH)):
+        before = rss_mb()
+        interpreter = TFLiteGestureModel(path, num_threads=args.threads)
+        report.append(evaluate(name, interpreter.predict, reference,
+                               X_test, y_test, args.latency_runs, path, before))
+
+    print(f"\n{'variant':<12} {'size KB':>8} {'acc':>7} {'top1 agr':>9} {'max dP':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for row in report:
+        print(f"{row['variant']:<12} {row['file_kb'] or 0:>8.1f} {row['accuracy']:>7.4f} {row['top1_agreement']:>9.4f} "
+              f"{row['max_prob_delta']:>9.5f} {row['p50_ms']:>8.4f} {row['p95_ms']:>8.4f}")
+
+    with open(REPORT_PATH, 'w') as f:
+        json.dump({"held_out_frames": int(len(X_test)), "variants": report}, f, indent=2)
+    print(f"\nReport saved as '{REPORT_PATH}'")
+    print("Serve a variant with ML_RUNTIME=tflite TFLITE_MODEL_PATH=<file> in the backend")
@@ -0,0 +1,198 @@
+"""
+Offline Landmark Extraction from Sign Videos
+--------------------------------------------
+Walks a directory of .mp4 files (e.g. backend/static/videos), decodes them and
+runs MediaPipe hand landmarking in a process pool - one VIDEO-mode
+HandLandmarker per worker process, one video per task - writing the keypoints of every
+frame in the same 126-value layout as collect_data.py's extract_keypoints:
+
+    extracted/<LABEL>/<video name>.npy   - (frames, 126) float32
+    extracted/<LABEL>/<video name>.json  - source size/mtime, fps, frame + hand counts
+
+LABEL is the upper-cased file name (Hello.mp4 -> HELLO, Thankyou.mp4 -> THANK_YOU) or, with
+--label-from dir, the video's parent folder.
+
+Resumable: outputs are written atomically and a video whose .json still matches
+the source file's size and mtime is skipped, so an interrupted run picks up
+where it stopped. Per-worker and total frames/sec are reported; videos are
+independent, so throughput scales with --workers up to the core count.
+
+Usage:
+    python fetch_hand_model.py
+    python extract_videos.py --videos-dir ../backend/static/videos
+    python extract_videos.py --videos-dir ~/asl_clips --label-from dir --workers 8 --stride 2
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from hand_tracking import KEYPOINT_SIZE, create_hand_landmarker, extract_hand_keypoints, to_mp_image  # noqa: E402
+from build_template_index import VIDEO_NAMES  # noqa: E402
+
+VIDEOS_DIR = os.path.join('..', 'backend', 'static', 'videos')
+OUTPUT_PATH = 'extracted'
+HAND_MODEL_PATH = 'hand_landmarker.task'
+
+VIDEO_GAP_MS = 1000  # timestamp gap between consecutive videos on one worker
+
+# Backend video file names back to vocabulary words (Thankyou.mp4 -> THANK_YOU)
+VIDEO_FILE_WORDS = {name.lower(): word for word, name in VIDEO_NAMES.items()}
+
+_detector = None
+_timestamp_ms = 0
+
+
+def find_videos(videos_dir, label_from):
+    """[(label, path)] for every .mp4 under videos_dir, sorted"""
+    videos = []
+    for root, _, names in os.walk(videos_dir):
+        for name in sorted(names):
+            if not name.lower().endswith('.mp4'):
+                continue
+            path = os.path.join(root, name)
+            if label_from == 'dir':
+                label = os.path.basename(os.path.dirname(path))
+            else:
+                label = os.path.splitext(name)[0]
+                label = VIDEO_FILE_WORDS.get(label.lower(), label)
+            videos.append((label.upper().replace(' ', '_'), path))
+    return sorted(videos)
+
+
+def output_paths(output_path, label, video_path):
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    base = os.path.join(output_path, label, stem)
+    return base + '.npy', base + '.json'
+
+
+def is_done(video_path, meta_path):
+    """True if the video was already extracted from this exact file"""
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path) as f:
+        meta = json.load(f)
+    stat = os.stat(video_path)
+    return meta.get("source_size") == stat.st_size and meta.get("source_mtime") == int(stat.st_mtime)
+
+
+def init_worker(hand_model_path):
+    """Pool initializer: one VIDEO-mode HandLandmarker per worker process, reused for all its videos"""
+    global _detector
+    import cv2
+    cv2.setNumThreads(1)  # one core per worker; the pool provides the parallelism
+    _detector = create_hand_landmarker(hand_model_path, video_mode=True)
+
+
+def extract_video(task):
+    """Worker: one video -> keypoints file + metadata. Returns stats for the progress report."""
+    import cv2
+
+    global _timestamp_ms
+    label, video_path, npy_path, meta_path, stride = task
+    started = time.perf_counter()
+    capture = cv2.VideoCapture(video_path)
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    # VIDEO mode needs increasing timestamps for the worker's whole lifetime, so each
+    # video continues the previous one's timeline after a gap
+    base_ms = _timestamp_ms + VIDEO_GAP_MS
+    rows, frame_index = [], 0
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            if frame_index % stride == 0:
+                _timestamp_ms = base_ms + int(frame_index * 1000 / fps)
+                results = _detector.detect_for_video(to_mp_image(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)),
+                                                     _timestamp_ms)
+                rows.append(extract_hand_keypoints(results))
+            frame_index += 1
+    finally:
+        capture.release()
+
+    keypoints = np.array(rows, dtype=np.float32).reshape(-1, KEYPOINT_SIZE)
+    hand_frames = int(np.sum(np.sum(np.abs(keypoints), axis=1) >= 0.01))
+    os.makedirs(os.path.dirname(npy_path), exist_ok=True)
+    with open(npy_path + '.tmp', 'wb') as f:
+        np.save(f, keypoints)
+    os.replace(npy_path + '.tmp', npy_path)
+
+    stat = os.stat(video_path)
+    meta = {
+        "label": label,
+        "source": os.path.abspath(video_path),
+        "source_size": stat.st_size,
+        "source_mtime": int(stat.st_mtime),
+        "fps": fps,
+        "stride": stride,
+        "frames": len(keypoints),
+        "hand_frames": hand_frames,
+    }
+    # Metadata last: its presence is what marks the video as done
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(meta_path + '.tmp', meta_path)
+
+    return {"label": label, "video": os.path.basename(video_path), "worker": os.getpid(),
+            "decoded": frame_index, "frames": len(keypoints), "hand_frames": hand_frames,
+            "seconds": time.perf_counter() - started}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Extract hand keypoints from a directory of sign videos")
+    parser.add_argument('--videos-dir', default=VIDEOS_DIR)
+    parser.add_argument('--output', default=OUTPUT_PATH)
+    parser.add_argument('--hand-model', default=HAND_MODEL_PATH)
+    parser.add_argument('--label-from', choices=['name', 'dir'], default='name',
+                        help="label = file name (Hello.mp4) or parent folder (HELLO/clip1.mp4)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--stride', type=int, default=1, help="landmark every Nth frame")
+    parser.add_argument('--force', action='store_true', help="re-extract videos that are already done")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.hand_model):
+        raise SystemExit(f"Hand model not found at {args.hand_model} - run fetch_hand_model.py")
+
+    videos = find_videos(args.videos_dir, args.label_from)
+    tasks, skipped = [], 0
+    for label, path in videos:
+        npy_path, meta_path = output_paths(args.output, label, path)
+        if not args.force and is_done(path, meta_path):
+            skipped += 1
+            continue
+        tasks.append((label, path, npy_path, meta_path, max(1, args.stride)))
+    print(f"{len(videos)} videos found, {skipped} already extracted, {len(tasks)} to do with {args.workers} workers")
+    if not tasks:
+        raise SystemExit(0)
+
+    # Longest videos first so one big file doesn't finish last on a single worker
+    tasks.sort(key=lambda task: os.path.getsize(task[1]), reverse=True)
+
+    started = time.perf_counter()
+    per_worker = {}
+    with multiprocessing.get_context('spawn').Pool(args.workers, initializer=init_worker,
+                                                   initargs=(args.hand_model,)) as pool:
+        for done, result in enumerate(pool.imap_unordered(extract_video, tasks), 1):
+            worker = per_worker.setdefault(result["worker"], {"videos": 0, "frames": 0, "seconds": 0.0})
+            worker["videos"] += 1
+            worker["frames"] += result["frames"]
+            worker["seconds"] += result["seconds"]
+            print(f"[{done}/{len(tasks)}] worker {result['worker']}: {result['label']}/{result['video']} "
+                  f"{result['frames']} frames ({result['hand_frames']} with hands) "
+                  f"at {result['frames'] / result['seconds']:.1f} fps")
+
+    wall = time.perf_counter() - started
+    total_frames = sum(worker["frames"] for worker in per_worker.values())
+    print("\nPer worker:")
+    for pid, worker in sorted(per_worker.items()):
+        print(f"  {pid}: {worker['videos']} videos, {worker['frames']} frames, "
+              f"{worker['frames'] / worker['seconds']:.1f} fps while busy")
+    print(f"Total: {total_frames} frames in {wall:.1f}s = {total_frames / wall:.1f} fps "
+          f"({len(per_worker)} workers)")
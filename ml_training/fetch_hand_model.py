@@ -0,0 +1,21 @@
+"""
+Download the MediaPipe hand landmark model bundle once, ahead of time.
+The backend only loads it from disk (HAND_MODEL_PATH) and never downloads
+at startup, so run this during setup / image build:
+
+    python ml_training/fetch_hand_model.py
+"""
+
+import os
+import urllib.request
+
+URL = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hand_landmarker.task')
+
+if __name__ == '__main__':
+    if os.path.exists(MODEL_PATH):
+        print(f"Hand model already present at {MODEL_PATH}")
+    else:
+        print("Downloading MediaPipe hand landmark model...")
+        urllib.request.urlretrieve(URL, MODEL_PATH)
+        print(f"Saved {MODEL_PATH} ({os.path.getsize(MODEL_PATH) / 1024 / 1024:.1f} MB)")
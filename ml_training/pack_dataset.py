@@ -0,0 +1,96 @@
+"""
+Pack the Keypoint Dataset
+-------------------------
+collect_data.py writes one float64 .npy file per frame (data/<ACTION>/<seq>/<frame>.npy),
+so every load is thousands of stat + open calls. This converts the tree into
+
+    data_packed/
+      keypoints.npy  - (N, 126) float32, opened with np.load(mmap_mode='r')
+      index.npy      - (N,) records: action (into manifest actions), sequence, frame, hand
+      manifest.json  - actions, row / sequence counts, source tree (written last)
+
+Rows are ordered by action, sequence, frame, so a recording is a contiguous
+slice. The arrays are written through a memory map one frame at a time and
+read back the same way, so datasets far larger than RAM pack and load fine.
+
+dataset.load_frames / load_sequences (training, export) and verify_data.py read
+the pack instead of the tree when it was made from the same data path and is
+still current - after collecting more data they warn and read the .npy files
+until this is re-run. "Current" is judged from the sequence folders' count and
+mtimes; --check-stale on the training scripts stats every frame file as well.
+
+Usage:
+    python pack_dataset.py
+    python pack_dataset.py --data-path data --output data_packed
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from dataset import ACTIONS, DATA_PATH, PACKED_PATH, PACKED_INDEX_DTYPE, numeric_entries
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pack data/<ACTION>/<seq>/<frame>.npy into one memory-mapped array")
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--output', default=PACKED_PATH)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    actions = [str(action) for action in ACTIONS]
+
+    # ========== SCAN ==========
+    files = []  # (action index, sequence, frame, path)
+    sequences = 0
+    for label, action in enumerate(actions):
+        action_path = os.path.join(args.data_path, action)
+        if not os.path.isdir(action_path):
+            print(f"No data found for {action}")
+            continue
+        for sequence, sequence_path in numeric_entries(action_path):
+            sequences += 1
+            for frame, npy_path in numeric_entries(sequence_path):
+                files.append((label, sequence, frame, npy_path))
+    if not files:
+        raise SystemExit(f"No .npy frames under {args.data_path}")
+
+    # ========== WRITE ==========
+    os.makedirs(args.output, exist_ok=True)
+    keypoints_path = os.path.join(args.output, 'keypoints.npy')
+    index_path = os.path.join(args.output, 'index.npy')
+    keypoints = np.lib.format.open_memmap(keypoints_path + '.tmp', mode='w+', dtype=np.float32, shape=(len(files), 126))
+    index = np.lib.format.open_memmap(index_path + '.tmp', mode='w+', dtype=PACKED_INDEX_DTYPE, shape=(len(files),))
+    for row, (label, sequence, frame, npy_path) in enumerate(files):
+        keypoints[row] = np.load(npy_path)
+        index[row] = (label, sequence, frame, np.sum(np.abs(keypoints[row])) >= 0.01)
+    hands = int(index['hand'].sum())
+    keypoints.flush()
+    index.flush()
+    del keypoints, index
+
+    # Replace the previous pack only once the new one is complete. Drop the old manifest
+    # first and write the new one last, so a crash in between leaves no pack (the .npy
+    # tree is read) rather than a manifest describing other arrays
+    manifest_path = os.path.join(args.output, 'manifest.json')
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    os.replace(keypoints_path + '.tmp', keypoints_path)
+    os.replace(index_path + '.tmp', index_path)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump({
+            "actions": actions,
+            "rows": len(files),
+            "hand_rows": hands,
+            "sequences": sequences,
+            "source": os.path.abspath(args.data_path),
+            "packed_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    size_mb = (os.path.getsize(keypoints_path) + os.path.getsize(index_path)) / 1024 / 1024
+    print(f"Packed {len(files)} frames ({hands} with a hand) into {args.output} "
+          f"({size_mb:.1f} MB) in {time.perf_counter() - started:.1f}s")
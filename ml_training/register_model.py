@@ -0,0 +1,98 @@
+"""
+Register a Trained Model Version
+--------------------------------
+Copies a trained single-frame classifier into the model registry the backend
+serves from (models/<version>/) together with a manifest.json that carries
+the model's label list and input spec, so a version is self-describing:
+
+    models/
+      active.json               - {"active": ..., "canary": ..., "canary_percent": ...}
+      <version>/manifest.json   - version, runtime, model_file, labels, input
+      <version>/model.<ext>
+
+Activate (or canary) a version at runtime with POST /admin/api/models/activate,
+or here with --activate / --canary.
+
+Usage:
+    python register_model.py sign_lingo_model_single.npz --version single-v1 --activate
+    python register_model.py sign_lingo_model_single_int8.tflite --version int8-v1 --canary 10
+"""
+
+import argparse
+import datetime
+import json
+import os
+import shutil
+import sys
+
+from dataset import LABELS_PATH
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from model_registry import write_json_atomic  # noqa: E402 - the backend reads what this writes
+
+REGISTRY_PATH = 'models'
+RUNTIMES = {'.npz': 'numpy', '.h5': 'keras', '.keras': 'keras', '.tflite': 'tflite'}
+INPUT_SPEC = {
+    "size": 126,
+    "dtype": "float32",
+    "layout": "left hand 21 x (x, y, z), then right hand 21 x (x, y, z); zeros for a missing hand",
+}
+
+
+def read_active(registry_path):
+    path = os.path.join(registry_path, 'active.json')
+    if not os.path.exists(path):
+        return {"active": None, "canary": None, "canary_percent": 0}
+    with open(path) as f:
+        return json.load(f)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Add a model version to the backend model registry")
+    parser.add_argument('model', help="trained model file (.npz, .h5/.keras or .tflite)")
+    parser.add_argument('--version', required=True, help="version name, e.g. single-v2")
+    parser.add_argument('--registry', default=REGISTRY_PATH)
+    parser.add_argument('--labels', default=LABELS_PATH, help="JSON label list the model was trained on")
+    parser.add_argument('--notes', default='')
+    parser.add_argument('--force', action='store_true', help="overwrite an existing version")
+    parser.add_argument('--activate', action='store_true', help="make it the active version")
+    parser.add_argument('--canary', type=int, metavar='PERCENT', help="route PERCENT%% of traffic to it")
+    args = parser.parse_args()
+
+    extension = os.path.splitext(args.model)[1].lower()
+    if extension not in RUNTIMES:
+        raise SystemExit(f"Unsupported model file '{args.model}' (expected one of {', '.join(RUNTIMES)})")
+
+    version_path = os.path.join(args.registry, args.version)
+    if os.path.exists(version_path) and not args.force:
+        raise SystemExit(f"Version '{args.version}' already exists (use --force to overwrite)")
+    os.makedirs(version_path, exist_ok=True)
+
+    with open(args.labels) as f:
+        labels = json.load(f)
+
+    model_file = f"model{extension}"
+    shutil.copyfile(args.model, os.path.join(version_path, model_file))
+    manifest = {
+        "version": args.version,
+        "runtime": RUNTIMES[extension],
+        "model_file": model_file,
+        "labels": labels,
+        "input": INPUT_SPEC,
+        "source": os.path.basename(args.model),
+        "created_at": datetime.datetime.now().isoformat(timespec='seconds'),
+        "notes": args.notes,
+    }
+    write_json_atomic(os.path.join(version_path, 'manifest.json'), manifest)
+    print(f"Registered '{args.version}' ({manifest['runtime']}, {len(labels)} labels) in {version_path}")
+
+    if args.activate or args.canary is not None:
+        active = read_active(args.registry)
+        if args.activate:
+            active.update(active=args.version, canary=None, canary_percent=0)
+        else:
+            if not active.get("active"):
+                raise SystemExit("No active version yet - register one with --activate first")
+            active.update(canary=args.version, canary_percent=max(0, min(100, args.canary)))
+        write_json_atomic(os.path.join(args.registry, 'active.json'), active)
+        print(f"active.json: {active}")
@@ -0,0 +1,241 @@
+"""
+Hyperparameter Sweep for the Single-Frame Classifier
+----------------------------------------------------
+Grid or random search over layer widths, dropout, learning rate and batch size
+for train_model_single_frame.py's model, scored by stratified k-fold
+cross-validation BY RECORDING: every frame of a sequence lands in the same
+fold, so near-identical neighbouring frames never sit on both sides of a split
+(a random frame split scores ~1.0 on almost anything).
+
+Trials run in a process pool. Each worker is limited to --threads-per-worker
+TensorFlow / BLAS threads so that workers x threads matches the core count
+instead of every process fighting over all cores. Each fold trains with the
+same augmented, prefetched batches as the training script and early stops on
+a held-out slice of its training recordings. The test fold is never seen
+during training.
+
+All trials go to one leaderboard file (sweep_leaderboard.json, best first):
+mean/std fold accuracy, training time, epochs, parameter count and the
+single-frame latency of the trained model in the backend's NumPy runtime
+(measured while other trials run - use --workers 1 for clean latencies).
+The file is rewritten after every trial; re-running skips trials already on it.
+
+Usage:
+    python sweep.py                                   # 20 random trials, 5 folds
+    python sweep.py --search grid --workers 4 --threads-per-worker 2
+    python sweep.py --trials 40 --folds 3 --epochs 60 --output sweep_quick.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
+import multiprocessing
+
+import numpy as np
+
+from dataset import ACTIONS, DATA_PATH, load_frames
+
+LEADERBOARD_PATH = 'sweep_leaderboard.json'
+
+SEARCH_SPACE = {
+    "widths": [[128, 64], [256, 128], [256, 128, 64], [512, 256, 128], [128, 128, 64]],
+    "dropout": [0.1, 0.2, 0.3, 0.4],
+    "learning_rate": [3e-4, 1e-3, 3e-3],
+    "batch_size": [32, 64, 128],
+}
+# The architecture train_model_single_frame.py ships with - always trial 0 for reference
+BASELINE = {"widths": [256, 128, 64], "dropouts": [0.3, 0.3, 0.2], "learning_rate": 1e-3, "batch_size": 32}
+
+_data = None
+
+
+def expand(widths, dropout, learning_rate, batch_size):
+    return {"widths": list(widths), "dropouts": [dropout] * len(widths),
+            "learning_rate": learning_rate, "batch_size": batch_size}
+
+
+def make_trials(search, count, seed, baseline=True):
+    grid = [expand(*values) for values in itertools.product(*SEARCH_SPACE.values())]
+    if search == 'random':
+        grid = random.Random(seed).sample(grid, min(count, len(grid)))
+    trials = [BASELINE] if baseline else []
+    return trials + [params for params in grid if params != BASELINE]
+
+
+def trial_key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+def init_worker(threads, check_stale=False):
+    """Pool initializer: cap this process's threads BEFORE TensorFlow loads, then load the data once"""
+    global _data
+    for name in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS'):
+        os.environ[name] = str(threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    import warnings
+    warnings.filterwarnings('ignore')  # Keras generator / HDF5 notices, once per fold otherwise
+    import absl.logging
+    import tensorflow as tf
+    absl.logging.set_verbosity(absl.logging.ERROR)
+    tf.get_logger().setLevel('ERROR')
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    X, y, _, groups = load_frames(DATA_PATH, ACTIONS, verbose=False, return_groups=True, check_stale=check_stale)
+    _data = (X.astype(np.float32), y, groups)
+
+
+def numpy_latency(model, repeats=300):
+    """p50 / p95 microseconds for one frame through the backend's NumPy runtime"""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+    from numpy_model import NumpyGestureModel
+    from export_numpy_model import fold_model, save_numpy_model
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model.save(os.path.join(tmp, 'model.h5'))
+        save_numpy_model(fold_model(os.path.join(tmp, 'model.h5')), os.path.join(tmp, 'model.npz'))
+        runtime = NumpyGestureModel(os.path.join(tmp, 'model.npz'))
+    frame = _data[0][:1]
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        runtime.predict(frame)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return {"p50": round(float(np.percentile(samples, 50)), 1), "p95": round(float(np.percentile(samples, 95)), 1)}
+
+
+def run_trial(trial, params, folds, epochs, patience, augment, seed):
+    """Worker: k-fold CV of one configuration"""
+    from sklearn.model_selection import GroupShuffleSplit, StratifiedGroupKFold
+    from tensorflow.keras.callbacks import EarlyStopping
+    from tensorflow.keras.utils import to_categorical
+    from augment import batch_stream, prefetch
+    from train_model_single_frame import build_model
+
+    X, y, groups = _data
+    Y = to_categorical(y, num_classes=len(ACTIONS))
+    batch_size = params["batch_size"]
+    accuracies, fold_epochs, train_seconds = [], [], 0.0
+    model = None
+    for fold, (train, test) in enumerate(StratifiedGroupKFold(folds, shuffle=True, random_state=seed).split(X, y, groups)):
+        # Early stopping watches recordings carved out of the training folds, never the test fold
+        fit, val = next(GroupShuffleSplit(1, test_size=0.15, random_state=seed + fold).split(train, groups=groups[train]))
+        fit, val = train[fit], train[val]
+
+        model = build_model(len(ACTIONS), params["widths"], params["dropouts"], params["learning_rate"])
+        started = time.perf_counter()
+        # Closing the stream stops its prefetch thread - workers live for the whole sweep
+        with closing(prefetch(batch_stream(X[fit], Y[fit], batch_size, augment=augment, seed=seed + fold))) as stream:
+            history = model.fit(stream, steps_per_epoch=int(np.ceil(len(fit) / batch_size)),
+                                validation_data=(X[val], Y[val]), epochs=epochs, verbose=0,
+                                callbacks=[EarlyStopping(monitor='val_loss', patience=patience,
+                                                         restore_best_weights=True)])
+        train_seconds += time.perf_counter() - started
+        fold_epochs.append(len(history.history['loss']))
+
+        predicted = np.argmax(model(X[test], training=False), axis=1)
+        accuracies.append(float(np.mean(predicted == y[test])))
+
+    return {
+        "trial": trial,
+        "params": params,
+        "accuracy_mean": round(float(np.mean(accuracies)), 4),
+        "accuracy_std": round(float(np.std(accuracies)), 4),
+        "fold_accuracy": [round(a, 4) for a in accuracies],
+        "epochs": fold_epochs,
+        "train_seconds": round(train_seconds, 1),
+        "parameters": int(model.count_params()),
+        "latency_us": numpy_latency(model),  # last fold's model
+        "worker": os.getpid(),
+    }
+
+
+def save_leaderboard(path, config, results):
+    ranked = sorted(results, key=lambda r: (-r["accuracy_mean"], r["accuracy_std"], r["latency_us"]["p50"]))
+    for rank, result in enumerate(ranked, 1):
+        result["rank"] = rank
+    with open(path + '.tmp', 'w') as f:
+        json.dump(dict(config, updated_at=time.strftime('%Y-%m-%dT%H:%M:%S'), trials=ranked), f, indent=2)
+    os.replace(path + '.tmp', path)
+    return ranked
+
+
+def describe(params):
+    return (f"{'/'.join(map(str, params['widths']))} drop {'/'.join(map(str, params['dropouts']))} "
+            f"lr {params['learning_rate']:g} bs {params['batch_size']}")
+
+
+if __name__ == '__main__':
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Cross-validated hyperparameter sweep for the single-frame model")
+    parser.add_argument('--search', choices=['random', 'grid'], default='random')
+    parser.add_argument('--trials', type=int, default=20, help="random search: configurations to sample")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--epochs', type=int, default=150, help="max epochs per fold (early stopping)")
+    parser.add_argument('--patience', type=int, default=15)
+    parser.add_argument('--workers', type=int, default=cpus)
+    parser.add_argument('--threads-per-worker', type=int, default=None, help="default: cores / workers")
+    parser.add_argument('--no-augment', action='store_true')
+    parser.add_argument('--no-baseline', action='store_true', help="don't include the shipped configuration")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=LEADERBOARD_PATH)
+    parser.add_argument('--check-stale', action='store_true',
+                        help="check every frame file against data_packed/, not just the folders")
+    args = parser.parse_args()
+    threads = args.threads_per_worker or max(1, cpus // args.workers)
+
+    config = {
+        "search": args.search,
+        "folds": args.folds,
+        "cv": "StratifiedGroupKFold by recording",
+        "max_epochs": args.epochs,
+        "patience": args.patience,
+        "augment": not args.no_augment,
+        "seed": args.seed,
+        "search_space": SEARCH_SPACE,
+        "host": {"python": platform.python_version(), "cpus": cpus, "machine": platform.machine(),
+                 "workers": args.workers, "threads_per_worker": threads},
+    }
+
+    # Resume: keep finished trials from a previous run with the same CV setup
+    results = []
+    if os.path.exists(args.output):
+        with open(args.output) as f:
+            previous = json.load(f)
+        if all(previous.get(key) == config[key] for key in ("folds", "max_epochs", "patience", "augment", "seed")):
+            results = previous["trials"]
+    done = {trial_key(result["params"]) for result in results}
+    trials = [params for params in make_trials(args.search, args.trials, args.seed, not args.no_baseline)
+              if trial_key(params) not in done]
+    print(f"{len(trials)} trials to run ({len(done)} already on {args.output}), {args.folds} folds each, "
+          f"{args.workers} workers x {threads} threads")
+
+    started = time.perf_counter()
+    next_trial = max([result["trial"] for result in results], default=-1) + 1
+    with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=init_worker, initargs=(threads, args.check_stale)) as pool:
+        futures = [pool.submit(run_trial, next_trial + i, params, args.folds, args.epochs, args.patience,
+                               not args.no_augment, args.seed) for i, params in enumerate(trials)]
+        for done_count, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            save_leaderboard(args.output, config, results)
+            print(f"[{done_count}/{len(trials)}] trial {result['trial']}: {describe(result['params'])} -> "
+                  f"{result['accuracy_mean']:.4f} +- {result['accuracy_std']:.4f} | "
+                  f"{result['train_seconds']:.0f}s | {result['latency_us']['p50']} us")
+
+    ranked = save_leaderboard(args.output, config, results) if results else []
+    print(f"\nDone in {time.perf_counter() - started:.0f}s. Top {min(5, len(ranked))}:")
+    for result in ranked[:5]:
+        print(f"  #{result['rank']} trial {result['trial']}: {describe(result['params'])} "
+              f"acc {result['accuracy_mean']:.4f} +- {result['accuracy_std']:.4f}, "
+              f"{result['parameters']:,} params, {result['latency_us']['p50']} us/frame")
+    print(f"Leaderboard: {args.output}")
@@ -0,0 +1,137 @@
+"""
+Streaming Sequence Sign Language Classifier
+-------------------------------------------
+Optional temporal model trained on the SAME data/<ACTION>/<seq>/<frame>.npy
+recordings as the single-frame model, but as whole 30-frame sequences.
+
+    Dense(128, relu) per frame -> GRU(64) -> Dense(softmax) per frame
+
+The GRU is causal, and the model is trained to predict the sign at EVERY
+timestep, so the backend can run it incrementally: each new frame is one GRU
+step on the session's saved hidden state instead of re-running a 30-frame
+window (see backend/numpy_model.py NumpySequenceModel).
+
+Produces:
+  sign_lingo_model_sequence.h5   - Keras model
+  sign_lingo_model_sequence.npz  - weights for the NumPy streaming runtime
+
+Serve it with SEQUENCE_MODEL=true in the backend.
+
+Usage:
+    python train_model_sequence.py
+    python train_model_sequence.py --units 96 --epochs 300
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import Dense, Dropout, GRU, Input
+from tensorflow.keras.callbacks import TensorBoard, EarlyStopping, ReduceLROnPlateau
+from tensorflow.keras.optimizers import Adam
+
+from dataset import ACTIONS, DATA_PATH, SEQUENCE_LENGTH, load_sequences, train_test_sequences
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from numpy_model import NumpySequenceModel  # noqa: E402
+
+MODEL_PATH = 'sign_lingo_model_sequence.h5'
+NUMPY_MODEL_PATH = 'sign_lingo_model_sequence.npz'
+
+
+def build_model(num_classes, units):
+    model = Sequential([
+        Input(shape=(SEQUENCE_LENGTH, 126)),
+        Dense(128, activation='relu'),  # applied to every frame
+        Dropout(0.2),
+        GRU(units, return_sequences=True),
+        Dropout(0.2),
+        Dense(num_classes, activation='softmax')
+    ])
+    model.compile(
+        optimizer=Adam(learning_rate=0.001),
+        loss='sparse_categorical_crossentropy',
+        metrics=['sparse_categorical_accuracy']
+    )
+    return model
+
+
+def save_numpy_sequence_model(model, path):
+    """Write the weights NumpySequenceModel expects (Dropout is identity at inference)"""
+    encoder, gru, output = [layer for layer in model.layers if layer.get_weights()]
+    encoder_kernel, encoder_bias = encoder.get_weights()
+    gru_kernel, gru_recurrent_kernel, gru_bias = gru.get_weights()
+    output_kernel, output_bias = output.get_weights()
+    np.savez(
+        path,
+        encoder_kernel=encoder_kernel, encoder_bias=encoder_bias,
+        gru_kernel=gru_kernel, gru_recurrent_kernel=gru_recurrent_kernel,
+        gru_bias=np.asarray(gru_bias).reshape(2, -1),
+        output_kernel=output_kernel, output_bias=output_bias,
+    )
+
+
+def per_step_accuracy(probabilities, labels):
+    """Accuracy at each timestep - shows how many frames the model needs"""
+    return np.mean(np.argmax(probabilities, axis=2) == labels[:, None], axis=0)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Train the streaming GRU sequence model")
+    parser.add_argument('--units', type=int, default=64)
+    parser.add_argument('--epochs', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--check-stale', action='store_true',
+                        help="check every frame file against data_packed/, not just the folders")
+    args = parser.parse_args()
+
+    # ========== LOAD DATA ==========
+    print("Loading sequences...")
+    X, y = load_sequences(DATA_PATH, ACTIONS, check_stale=args.check_stale)
+    X_train, X_test, y_train, y_test = train_test_sequences(X, y)
+    print(f"Input shape: {X.shape}")  # (N, 30, 126)
+    print(f"Train: {len(X_train)}, Test: {len(X_test)} sequences")
+
+    # Every timestep carries the sequence label
+    Y_train = np.repeat(y_train[:, None], SEQUENCE_LENGTH, axis=1)
+    Y_test = np.repeat(y_test[:, None], SEQUENCE_LENGTH, axis=1)
+
+    # ========== BUILD + TRAIN ==========
+    model = build_model(len(ACTIONS), args.units)
+    model.summary()
+
+    callbacks = [
+        TensorBoard(log_dir='logs/sequence'),
+        EarlyStopping(monitor='val_loss', patience=40, restore_best_weights=True),
+        ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=15, min_lr=1e-6)
+    ]
+
+    print("\nTraining sequence model...")
+    model.fit(
+        X_train, Y_train,
+        validation_data=(X_test, Y_test),
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        callbacks=callbacks,
+        verbose=1
+    )
+
+    # ========== EVALUATE ==========
+    probabilities = model.predict(X_test, verbose=0)
+    steps = per_step_accuracy(probabilities, y_test)
+    print(f"\nTest accuracy (last frame): {steps[-1] * 100:.2f}%")
+    print(f"Test accuracy (all frames): {steps.mean() * 100:.2f}%")
+    for t in (0, 4, 9, 19, SEQUENCE_LENGTH - 1):
+        print(f"  after {t + 1:>2} frames: {steps[t] * 100:.2f}%")
+
+    # ========== SAVE ==========
+    model.save(MODEL_PATH)
+    print(f"\nModel saved as '{MODEL_PATH}'")
+
+    save_numpy_sequence_model(model, NUMPY_MODEL_PATH)
+    streamed = NumpySequenceModel(NUMPY_MODEL_PATH).predict(X_test)
+    max_diff = float(np.max(np.abs(streamed - probabilities)))
+    print(f"Streaming runtime saved as '{NUMPY_MODEL_PATH}' (max |diff| vs Keras: {max_diff:.2e})")
+    print("Serve it with SEQUENCE_MODEL=true in the backend")
@@ -1,16 +1,25 @@
 """
 Single-Frame Sign Language Classifier
 --------------------------------------
-Instead of LSTM (30 frames), this uses a Dense neural network 
+Instead of LSTM (30 frames), this uses a Dense neural network
 that classifies a sign from a SINGLE frame of hand landmarks.
 Gives instant feedback — just like ASL Pocket Sign!
 
 Uses the SAME data collected by collect_data.py.
 Each .npy file (126 keypoints) becomes one training sample.
+
+Training batches are augmented on the fly (hand swap, rotation, scale/shift,
+noise, hand dropout - see augment.py) and prefetched on a background thread;
+the held-out frames are never augmented.
+
+Usage:
+    python train_model_single_frame.py
+    python train_model_single_frame.py --no-augment
 """
 
+import argparse
+
 import numpy as np
-import os
 from sklearn.model_selection import train_test_split
 from tensorflow.keras.utils import to_categorical
 from tensorflow.keras.models import Sequential
@@ -18,108 +27,93 @@ from tensorflow.keras.layers import Dense, Dropout, BatchNormalization, Input
 from tensorflow.keras.callbacks import TensorBoard, EarlyStopping, ReduceLROnPlateau
 from tensorflow.keras.optimizers import Adam
 
+from augment import batch_stream, prefetch
+from dataset import ACTIONS, DATA_PATH, load_frames
+
 # ========== CONFIG ==========
-DATA_PATH = os.path.join('data')
-actions = np.array(['HELLO', 'WELCOME', 'YES', 'NO', 'PLEASE', 'THANK_YOU', 'SORRY', 'FINE', 'OK', 'GOOD_BYE'])
-no_sequences = 30
-sequence_length = 30
+actions = ACTIONS
+BATCH_SIZE = 32
 
 label_map = {label: num for num, label in enumerate(actions)}
 
-# ========== LOAD DATA ==========
-print("Loading data...")
-samples, labels = [], []
-skipped = 0
-
-for action in actions:
-    for sequence in range(no_sequences):
-        for frame_num in range(sequence_length):
-            npy_path = os.path.join(DATA_PATH, action, str(sequence), f"{frame_num}.npy")
-            if os.path.exists(npy_path):
-                keypoints = np.load(npy_path)
-                
-                # Skip frames where no hand was detected (all zeros)
-                if np.sum(np.abs(keypoints)) < 0.01:
-                    skipped += 1
-                    continue
-                
-                samples.append(keypoints)
-                labels.append(label_map[action])
-            else:
-                skipped += 1
-
-X = np.array(samples)
-y = to_categorical(labels, num_classes=len(actions)).astype(int)
-
-print(f"Total samples: {len(X)} (skipped {skipped} empty frames)")
-print(f"Input shape: {X.shape}")  # Should be (N, 126)
-print(f"Classes: {len(actions)}")
-
-# Show samples per class
-for action in actions:
-    count = np.sum(np.array(labels) == label_map[action])
-    print(f"  {action}: {count} samples")
-
-# ========== SPLIT DATA ==========
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.15, random_state=42, stratify=y)
-print(f"\nTrain: {len(X_train)}, Test: {len(X_test)}")
 
 # ========== BUILD MODEL ==========
-# Simple but effective Dense model for 126 keypoint features
-model = Sequential([
-    Input(shape=(126,)),
-    
-    # Layer 1
-    Dense(256, activation='relu'),
-    BatchNormalization(),
-    Dropout(0.3),
-    
-    # Layer 2
-    Dense(128, activation='relu'),
-    BatchNormalization(),
-    Dropout(0.3),
-    
-    # Layer 3
-    Dense(64, activation='relu'),
-    BatchNormalization(),
-    Dropout(0.2),
-    
+def build_model(num_classes, widths=(256, 128, 64), dropouts=(0.3, 0.3, 0.2), learning_rate=0.001):
+    # Simple but effective Dense model for 126 keypoint features:
+    # Dense -> BatchNorm -> Dropout per hidden layer (sweep.py searches these)
+    layers = [Input(shape=(126,))]
+    for width, dropout in zip(widths, dropouts):
+        layers += [
+            Dense(width, activation='relu'),
+            BatchNormalization(),
+            Dropout(dropout),
+        ]
+
     # Output
-    Dense(len(actions), activation='softmax')
-])
-
-model.compile(
-    optimizer=Adam(learning_rate=0.001),
-    loss='categorical_crossentropy',
-    metrics=['categorical_accuracy']
-)
-
-model.summary()
-
-# ========== CALLBACKS ==========
-callbacks = [
-    TensorBoard(log_dir='logs/single_frame'),
-    EarlyStopping(monitor='val_loss', patience=50, restore_best_weights=True),
-    ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=20, min_lr=1e-6)
-]
-
-# ========== TRAIN ==========
-print("\nTraining single-frame model...")
-history = model.fit(
-    X_train, y_train,
-    validation_data=(X_test, y_test),
-    epochs=500,
-    batch_size=32,
-    callbacks=callbacks,
-    verbose=1
-)
-
-# ========== EVALUATE ==========
-loss, accuracy = model.evaluate(X_test, y_test, verbose=0)
-print(f"\nTest Accuracy: {accuracy * 100:.2f}%")
-print(f"Test Loss: {loss:.4f}")
-
-# ========== SAVE ==========
-model.save('sign_lingo_model_single.h5')
-print("\nModel saved as 'sign_lingo_model_single.h5'")
-print("Use this model in your backend for instant single-frame predictions!")
+    layers.append(Dense(num_classes, activation='softmax'))
+    model = Sequential(layers)
+
+    model.compile(
+        optimizer=Adam(learning_rate=learning_rate),
+        loss='categorical_crossentropy',
+        metrics=['categorical_accuracy']
+    )
+    return model
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Train the single-frame classifier")
+    parser.add_argument('--no-augment', action='store_true', help="train on the raw frames only")
+    parser.add_argument('--check-stale', action='store_true',
+                        help="check every frame file against data_packed/, not just the folders")
+    args = parser.parse_args()
+
+    # ========== LOAD DATA ==========
+    print("Loading data...")
+    X, labels, skipped = load_frames(DATA_PATH, actions, check_stale=args.check_stale)
+    y = to_categorical(labels, num_classes=len(actions)).astype(int)
+
+    print(f"Input shape: {X.shape}")  # Should be (N, 126)
+    print(f"Classes: {len(actions)}")
+
+    # Show samples per class
+    for action in actions:
+        count = np.sum(np.array(labels) == label_map[action])
+        print(f"  {action}: {count} samples")
+
+    # ========== SPLIT DATA ==========
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.15, random_state=42, stratify=y)
+    print(f"\nTrain: {len(X_train)}, Test: {len(X_test)}")
+
+    model = build_model(len(actions))
+    model.summary()
+
+    # ========== CALLBACKS ==========
+    callbacks = [
+        TensorBoard(log_dir='logs/single_frame'),
+        EarlyStopping(monitor='val_loss', patience=50, restore_best_weights=True),
+        ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=20, min_lr=1e-6)
+    ]
+
+    # ========== TRAIN ==========
+    print(f"\nTraining single-frame model ({'raw frames' if args.no_augment else 'augmented batches'})...")
+    train_batches = prefetch(batch_stream(X_train, y_train, BATCH_SIZE, augment=not args.no_augment))
+    history = model.fit(
+        train_batches,
+        steps_per_epoch=int(np.ceil(len(X_train) / BATCH_SIZE)),
+        validation_data=(X_test, y_test),
+        epochs=500,
+        callbacks=callbacks,
+        verbose=1
+    )
+    train_batches.close()  # stop the prefetch thread
+
+    # ========== EVALUATE ==========
+    loss, accuracy = model.evaluate(X_test, y_test, verbose=0)
+    print(f"\nTest Accuracy: {accuracy * 100:.2f}%")
+    print(f"Test Loss: {loss:.4f}")
+
+    # ========== SAVE ==========
+    model.save('sign_lingo_model_single.h5')
+    print("\nModel saved as 'sign_lingo_model_single.h5'")
+    print("Use this model in your backend for instant single-frame predictions!")
@@ -1,30 +1,103 @@
+"""
+Verify Collected Data
+---------------------
+Default: replays every recorded sequence in an OpenCV window at 20 fps.
+
+--report: headless QA over the whole tree at once - no window, runs on a server.
+All statistics are computed on the full (N, 126) array in a few NumPy passes:
+
+  per action / per sequence  - frames, hand-detection rate, left / right / both
+                               hand presence, landmark variance (raw position and
+                               wrist-normalized hand shape), frame-to-frame motion
+  near-duplicates            - hand frames within --dup-threshold RMS of another
+                               frame of the same action (frozen camera, copied files)
+  outliers                   - hand shapes far from their action's median (robust
+                               z-score > --outlier-z), with the action they are
+                               closest to when that is a different one
+  flagged sequences          - low hand rate, missing frames, no motion
+
+and written to <output>/report.json, <output>/report.html and one contact
+sheet per action (<output>/sheets/<ACTION>.png: a tile per sequence with every
+frame's landmarks plus the middle frame's skeleton, flagged tiles outlined red).
+
+Usage:
+    python verify_data.py
+    python verify_data.py --report
+    python verify_data.py --report --output qa_report --min-hand-rate 0.6
+"""
+
+import argparse
+import html
+import json
+import sys
 import cv2
 import numpy as np
 import os
 import time
 
 # --- CONFIGURATION ---
-DATA_PATH = os.path.join('data') 
-actions = np.array(['HELLO', 'WELCOME', 'YES', 'NO', 'PLEASE', 'THANK_YOU', 'SORRY', 'FINE', 'OK', 'GOOD_BYE'])
+from dataset import ACTIONS, DATA_PATH, SEQUENCE_LENGTH, open_packed
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from template_index import normalize_keypoints  # noqa: E402
+
+actions = ACTIONS
+
+# Read the memory-mapped pack (pack_dataset.py) when there is one - no file per frame
+packed = open_packed()
+if packed is not None:
+    print(f"Reading packed dataset ({packed.manifest['rows']} frames)")
+
+HAND_CONNECTIONS = [
+    (0, 1), (1, 2), (2, 3), (3, 4),  # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),  # Index finger
+    (0, 9), (9, 10), (10, 11), (11, 12),  # Middle finger
+    (0, 13), (13, 14), (14, 15), (15, 16),  # Ring finger
+    (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky
+    (5, 9), (9, 13), (13, 17)  # Palm
+]
+HAND_COLORS = [(0, 255, 0), (0, 0, 255)]  # Left green, right red (BGR), as in the replay
+TILE_WIDTH, TILE_HEIGHT, SHEET_COLUMNS = 192, 144, 6
+
+def iter_sequence_frames(action):
+    """Yield (sequence name, [(frame number, keypoints)]) for one action"""
+    if packed is not None:
+        for sequence, rows in packed.sequences(action).items():
+            yield str(sequence), [(int(packed.index['frame'][row]), packed.keypoints[row]) for row in rows]
+        return
+
+    action_path = os.path.join(DATA_PATH, action)
+    # Get list of recorded sequences (0, 1, 2...)
+    for sequence in os.listdir(action_path):
+        if not sequence.isdigit():
+            continue  # only recording folders (0, 1, 2...)
+        sequence_path = os.path.join(action_path, sequence)
+        frames = []
+        # The 30 frames of this video
+        for frame_num in range(30):
+            npy_path = os.path.join(sequence_path, f"{frame_num}.npy")
+            if os.path.exists(npy_path):
+                frames.append((frame_num, np.load(npy_path)))
+        yield sequence, frames
 
 # Helper function to draw from landmarks
 def draw_landmarks_from_npy(image, keypoints):
     # Keypoints are concatenated: Left Hand (63 values) + Right Hand (63 values)
     # 21 points * 3 coords (x,y,z) = 63
-    
+
     lh = keypoints[0:63]
     rh = keypoints[63:126]
-    
+
     def plot_hand(data, color):
         for i in range(0, len(data), 3):
             x = data[i]
             y = data[i+1]
             # z = data[i+2] # We ignore Z for 2D drawing
-            
+
             # If x and y are 0, it means no hand was detected in that frame
             if x == 0 and y == 0:
                 continue
-                
+
             # Convert normalized coords (0-1) to pixel coords
             cv2.circle(image, (int(x * 640), int(y * 480)), 4, color, -1)
 
@@ -33,53 +106,353 @@ def draw_landmarks_from_npy(image, keypoints):
     # Draw Right Hand (Red)
     plot_hand(rh, (0, 0, 255))
 
-# --- MAIN LOOP ---
-print("Press 'q' to quit, 'n' for next action")
 
-for action in actions:
-    print(f"--- REVIEWING ACTION: {action} ---")
-    
-    # Check if folder exists
-    action_path = os.path.join(DATA_PATH, action)
-    if not os.path.exists(action_path):
-        print(f"No data found for {action}")
-        continue
+def review():
+    """Replay every sequence in a window ('q' quits)"""
+    print("Press 'q' to quit, 'n' for next action")
 
-    # Get list of recorded sequences (0, 1, 2...)
-    sequences = os.listdir(action_path)
-    
-    for sequence in sequences:
-        sequence_path = os.path.join(action_path, sequence)
-        
-        # Loop through the 30 frames of this video
-        for frame_num in range(30):
-            npy_path = os.path.join(sequence_path, f"{frame_num}.npy")
-            
-            if not os.path.exists(npy_path):
-                continue
+    for action in actions:
+        print(f"--- REVIEWING ACTION: {action} ---")
+
+        # Check if there is data for it
+        if packed is not None:
+            has_data = len(packed.rows(action)) > 0
+        else:
+            has_data = os.path.exists(os.path.join(DATA_PATH, action))
+        if not has_data:
+            print(f"No data found for {action}")
+            continue
+
+        for sequence, frames in iter_sequence_frames(action):
+            # Loop through the frames of this video
+            for frame_num, res in frames:
+
+                # Create a black background
+                image = np.zeros((480, 640, 3), dtype='uint8')
+
+                # Put text
+                cv2.putText(image, f'{action} | Video: {sequence} | Frame: {frame_num}', (10, 30),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 1, cv2.LINE_AA)
+
+                # Draw the hands
+                draw_landmarks_from_npy(image, res)
+
+                # Show the animation
+                cv2.imshow('Data Review', image)
+
+                # Control speed (0.05s = 20fps)
+                key = cv2.waitKey(50)
+                if key & 0xFF == ord('q'):
+                    exit()
+
+            # Pause slightly between videos
+            time.sleep(0.5)
+
+    cv2.destroyAllWindows()
+
+
+# --- HEADLESS QA REPORT ---
+def load_dataset():
+    """Whole dataset as arrays: keypoints (N, 126) float32, action index, sequence, frame (N,)"""
+    if packed is not None:
+        names = [str(action) for action in packed.actions]
+        index = np.asarray(packed.index)
+        return (np.asarray(packed.keypoints, dtype=np.float32), index['action'].astype(np.int64),
+                index['sequence'].astype(np.int64), index['frame'].astype(np.int64), names)
+
+    names = [str(action) for action in actions]
+    keypoints, action_ids, sequences, frame_numbers = [], [], [], []
+    for label, action in enumerate(names):
+        if not os.path.isdir(os.path.join(DATA_PATH, action)):
+            continue
+        for sequence, frames in iter_sequence_frames(action):
+            for frame_num, res in frames:
+                keypoints.append(res)
+                action_ids.append(label)
+                sequences.append(int(sequence))
+                frame_numbers.append(frame_num)
+    # Same row order as the pack (action, sequence, frame) - os.listdir order is arbitrary
+    action_ids, sequences, frame_numbers = (np.array(values, dtype=np.int64) for values in (action_ids, sequences, frame_numbers))
+    order = np.lexsort((frame_numbers, sequences, action_ids))
+    return (np.array(keypoints, dtype=np.float32).reshape(-1, 126)[order], action_ids[order],
+            sequences[order], frame_numbers[order], names)
+
+
+def pairwise_rms(vectors, chunk=2048):
+    """Yield (row offset, RMS distance block) of vectors against all vectors"""
+    norms = np.einsum('ij,ij->i', vectors, vectors)
+    for start in range(0, len(vectors), chunk):
+        block = vectors[start:start + chunk]
+        squared = norms[start:start + chunk, None] + norms[None, :] - 2.0 * block @ vectors.T
+        yield start, np.sqrt(np.maximum(squared, 0.0) / vectors.shape[1])
+
+
+def robust_z(values):
+    """Modified z-score (median / MAD), 0 when there is no spread"""
+    median = np.median(values)
+    mad = np.median(np.abs(values - median))
+    if mad < 1e-12:
+        return np.zeros_like(values)
+    return 0.6745 * (values - median) / mad
+
+
+def quality_report(keypoints, action_ids, sequences, frame_numbers, names, dup_threshold, outlier_z, min_hand_rate):
+    hands = keypoints.reshape(-1, 2, 63)
+    present = np.sum(np.abs(hands), axis=2) >= 0.01  # (N, 2): left, right
+    has_hand = present.any(axis=1)
+    normalized = normalize_keypoints(keypoints)
+
+    # ---- Per sequence: one group id per (action, sequence), aggregated with bincount ----
+    order = np.lexsort((frame_numbers, sequences, action_ids))
+    group_keys, group = np.unique(np.stack([action_ids, sequences], axis=1), axis=0, return_inverse=True)
+    group = group.ravel()
+    groups = len(group_keys)
+
+    def per_group(values):
+        return np.bincount(group, weights=values, minlength=groups)
+
+    frame_counts = np.bincount(group, minlength=groups)
+    hand_counts, left_counts, right_counts = per_group(has_hand), per_group(present[:, 0]), per_group(present[:, 1])
+
+    # Motion: RMS change between consecutive frames of a sequence where both have a hand
+    previous, current = order[:-1], order[1:]
+    consecutive = (group[previous] == group[current]) & has_hand[previous] & has_hand[current]
+    steps = np.sqrt(np.mean((keypoints[current] - keypoints[previous]) ** 2, axis=1))
+    motion_sum = np.bincount(group[current][consecutive], weights=steps[consecutive], minlength=groups)
+    motion_count = np.bincount(group[current][consecutive], minlength=groups)
+    motion = np.divide(motion_sum, motion_count, out=np.zeros(groups), where=motion_count > 0)
+
+    # ---- Action medians of hand shape: outliers and "closer to another action" ----
+    medians = np.zeros((len(names), keypoints.shape[1]), dtype=np.float32)
+    for label in range(len(names)):
+        rows = (action_ids == label) & has_hand
+        if rows.any():
+            medians[label] = np.median(normalized[rows], axis=0)
+
+    report = {"actions": {}, "flagged_sequences": []}
+    for label, action in enumerate(names):
+        rows = np.flatnonzero(action_ids == label)
+        if len(rows) == 0:
+            report["actions"][action] = {"frames": 0}
+            continue
+        hand_rows = rows[has_hand[rows]]
+
+        # Landmark variance over the frames where each hand is present
+        def variance(values, slot):
+            mask = present[rows, slot]
+            return values[rows[mask]].reshape(-1, 2, 63)[:, slot].var(axis=0).mean() if mask.sum() > 1 else 0.0
+
+        position_variance = (variance(keypoints, 0) + variance(keypoints, 1)) / 2
+        shape_variance = (variance(normalized, 0) + variance(normalized, 1)) / 2
+
+        # Near-duplicates among the action's hand frames
+        duplicate_frames = np.zeros(len(hand_rows), dtype=bool)
+        duplicate_pairs = []
+        if len(hand_rows) > 1:
+            for start, distances in pairwise_rms(keypoints[hand_rows].astype(np.float64)):
+                block = np.arange(start, start + len(distances))
+                distances[np.arange(len(block)), block] = np.inf  # not itself
+                close = distances < dup_threshold
+                duplicate_frames[block] |= close.any(axis=1)
+                for i, j in zip(*np.nonzero(np.triu(close, k=start + 1))):
+                    if len(duplicate_pairs) < 20:
+                        a, b = hand_rows[start + i], hand_rows[j]
+                        duplicate_pairs.append({"a": [int(sequences[a]), int(frame_numbers[a])],
+                                                "b": [int(sequences[b]), int(frame_numbers[b])],
+                                                "rms": round(float(distances[i, j]), 6)})
+
+        # Outliers: robust z of the distance to the action's median hand shape
+        outliers = []
+        if len(hand_rows) > 2:
+            distance = np.linalg.norm(normalized[hand_rows] - medians[label], axis=1)
+            z = robust_z(distance)
+            flagged = np.flatnonzero(z > outlier_z)
+            if len(flagged):
+                centroid_distance = np.linalg.norm(normalized[hand_rows[flagged], None] - medians[None], axis=2)
+                closest = np.argmin(centroid_distance, axis=1)
+                for position, nearest in zip(flagged[np.argsort(-z[flagged])], closest[np.argsort(-z[flagged])]):
+                    row = hand_rows[position]
+                    outliers.append({"sequence": int(sequences[row]), "frame": int(frame_numbers[row]),
+                                     "z": round(float(z[position]), 2),
+                                     "closest_action": names[nearest] if nearest != label else None})
+
+        # Per-sequence rows of this action
+        sequence_stats = {}
+        for g in np.flatnonzero(group_keys[:, 0] == label):
+            sequence = int(group_keys[g, 1])
+            stats = {
+                "frames": int(frame_counts[g]),
+                "hand_rate": round(hand_counts[g] / frame_counts[g], 4),
+                "left_rate": round(left_counts[g] / frame_counts[g], 4),
+                "right_rate": round(right_counts[g] / frame_counts[g], 4),
+                "motion": round(float(motion[g]), 5),
+            }
+            problems = []
+            if stats["hand_rate"] < min_hand_rate:
+                problems.append(f"hand rate {stats['hand_rate']:.0%}")
+            if stats["frames"] < SEQUENCE_LENGTH:
+                problems.append(f"{stats['frames']}/{SEQUENCE_LENGTH} frames")
+            if motion_count[g] > 0 and motion[g] < 1e-6:
+                problems.append("no motion")
+            if problems:
+                stats["problems"] = problems
+                report["flagged_sequences"].append({"action": action, "sequence": sequence, "problems": problems})
+            sequence_stats[sequence] = stats
+
+        report["actions"][action] = {
+            "frames": int(len(rows)),
+            "sequences": len(sequence_stats),
+            "hand_rate": round(float(has_hand[rows].mean()), 4),
+            "left_rate": round(float(present[rows, 0].mean()), 4),
+            "right_rate": round(float(present[rows, 1].mean()), 4),
+            "both_rate": round(float(present[rows].all(axis=1).mean()), 4),
+            "landmark_variance": round(float(position_variance), 6),
+            "shape_variance": round(float(shape_variance), 6),
+            "motion": round(float(np.mean([s["motion"] for s in sequence_stats.values()])), 5),
+            "duplicate_frames": int(duplicate_frames.sum()),
+            "duplicate_pairs": duplicate_pairs,
+            "outlier_frames": len(outliers),
+            "outliers": outliers[:50],
+            "per_sequence": sequence_stats,
+        }
+
+    report.update({
+        "frames": int(len(keypoints)),
+        "hand_frames": int(has_hand.sum()),
+        "hand_rate": round(float(has_hand.mean()), 4) if len(keypoints) else 0.0,
+        "thresholds": {"dup_threshold": dup_threshold, "outlier_z": outlier_z, "min_hand_rate": min_hand_rate},
+    })
+    return report
+
+
+def contact_sheet(keypoints, sequences, frame_numbers, action_report, action):
+    """One tile per sequence: every frame's landmarks as dots, the middle hand frame as a skeleton"""
+    sequence_numbers = sorted(action_report["per_sequence"])
+    rows_count = max(1, -(-len(sequence_numbers) // SHEET_COLUMNS))
+    sheet = np.full((rows_count * TILE_HEIGHT, SHEET_COLUMNS * TILE_WIDTH, 3), 24, dtype=np.uint8)
+    tile_of = {sequence: i for i, sequence in enumerate(sequence_numbers)}
+
+    # All landmarks of all frames at once: pixel = tile origin + normalized position * tile size
+    tiles = np.array([tile_of[int(s)] for s in sequences])
+    origin_x = (tiles % SHEET_COLUMNS) * TILE_WIDTH
+    origin_y = (tiles // SHEET_COLUMNS) * TILE_HEIGHT
+    points = keypoints.reshape(-1, 2, 21, 3)
+    for slot, color in enumerate(HAND_COLORS):
+        xy = points[:, slot, :, :2]
+        visible = np.any(xy != 0, axis=2) & (xy[..., 0] >= 0) & (xy[..., 0] < 1) & (xy[..., 1] >= 0) & (xy[..., 1] < 1)
+        px = (origin_x[:, None] + xy[..., 0] * TILE_WIDTH).astype(np.int64)[visible]
+        py = (origin_y[:, None] + xy[..., 1] * TILE_HEIGHT).astype(np.int64)[visible]
+        sheet[py, px] = np.array(color) // 3
+
+    for sequence, i in tile_of.items():
+        x0, y0 = (i % SHEET_COLUMNS) * TILE_WIDTH, (i // SHEET_COLUMNS) * TILE_HEIGHT
+        rows = np.flatnonzero(sequences == sequence)
+        rows = rows[np.argsort(frame_numbers[rows])]
+        hand_rows = rows[np.sum(np.abs(keypoints[rows]), axis=1) >= 0.01]
+        if len(hand_rows):
+            middle = points[hand_rows[len(hand_rows) // 2]]
+            for slot, color in enumerate(HAND_COLORS):
+                if not np.any(middle[slot] != 0):
+                    continue
+                pixels = (middle[slot, :, :2] * [TILE_WIDTH, TILE_HEIGHT] + [x0, y0]).astype(int)
+                for start, end in HAND_CONNECTIONS:
+                    cv2.line(sheet, tuple(pixels[start]), tuple(pixels[end]), color, 1, cv2.LINE_AA)
+
+        stats = action_report["per_sequence"][sequence]
+        flagged = "problems" in stats
+        cv2.rectangle(sheet, (x0, y0), (x0 + TILE_WIDTH - 1, y0 + TILE_HEIGHT - 1),
+                      (0, 0, 255) if flagged else (80, 80, 80), 2 if flagged else 1)
+        cv2.putText(sheet, f"{sequence}  {stats['hand_rate']:.0%}", (x0 + 5, y0 + 15),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1, cv2.LINE_AA)
+    cv2.putText(sheet, action, (5, sheet.shape[0] - 6), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
+    return sheet
+
+
+def write_html(report, path):
+    columns = ["frames", "sequences", "hand_rate", "left_rate", "right_rate", "both_rate",
+               "landmark_variance", "shape_variance", "motion", "duplicate_frames", "outlier_frames"]
+    header = "".join(f"<th>{column}</th>" for column in ["action"] + columns)
+    rows = []
+    for action, stats in report["actions"].items():
+        cells = "".join(f"<td>{stats.get(column, '')}</td>" for column in columns)
+        rows.append(f"<tr><td><a href='#{html.escape(action)}'>{html.escape(action)}</a></td>{cells}</tr>")
+    flagged = "".join(f"<li>{html.escape(item['action'])} #{item['sequence']}: {html.escape(', '.join(item['problems']))}</li>"
+                      for item in report["flagged_sequences"]) or "<li>none</li>"
+    sections = []
+    for action, stats in report["actions"].items():
+        if not stats["frames"]:
+            continue
+        outliers = ", ".join(f"#{o['sequence']}/{o['frame']} (z {o['z']}{', like ' + o['closest_action'] if o['closest_action'] else ''})"
+                             for o in stats["outliers"][:10]) or "none"
+        sections.append(f"<h2 id='{html.escape(action)}'>{html.escape(action)}</h2>"
+                        f"<p>Outliers: {html.escape(outliers)}</p>"
+                        f"<img src='sheets/{html.escape(action)}.png'>")
+    with open(path, 'w') as f:
+        f.write(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Sign-Lingo dataset QA</title>
+<style>body{{font-family:sans-serif;margin:24px}}table{{border-collapse:collapse}}
+td,th{{border:1px solid #ccc;padding:4px 8px;text-align:right}}img{{max-width:100%}}</style></head>
+<body><h1>Dataset QA</h1>
+<p>{report['frames']} frames, {report['hand_frames']} with a hand ({report['hand_rate']:.1%}) - generated {report['generated_at']} in {report['elapsed_s']}s</p>
+<table><tr>{header}</tr>{''.join(rows)}</table>
+<h2>Flagged sequences</h2><ul>{flagged}</ul>
+{''.join(sections)}
+</body></html>
+""")
+
+
+def write_report(args):
+    started = time.perf_counter()
+    keypoints, action_ids, sequences, frame_numbers, names = load_dataset()
+    if not len(keypoints):
+        raise SystemExit(f"No frames found under {DATA_PATH}")
+    loaded = time.perf_counter()
+
+    report = quality_report(keypoints, action_ids, sequences, frame_numbers, names,
+                            args.dup_threshold, args.outlier_z, args.min_hand_rate)
+    analysed = time.perf_counter()
+
+    os.makedirs(os.path.join(args.output, 'sheets'), exist_ok=True)
+    for label, action in enumerate(names):
+        if report["actions"][action]["frames"]:
+            rows = action_ids == label
+            sheet = contact_sheet(keypoints[rows], sequences[rows], frame_numbers[rows], report["actions"][action], action)
+            cv2.imwrite(os.path.join(args.output, 'sheets', f'{action}.png'), sheet)
+
+    report.update({
+        "source": os.path.abspath(packed.manifest["source"] if packed is not None else DATA_PATH),
+        "generated_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "elapsed_s": round(time.perf_counter() - started, 2),
+    })
+    with open(os.path.join(args.output, 'report.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    write_html(report, os.path.join(args.output, 'report.html'))
+
+    for action, stats in report["actions"].items():
+        if stats["frames"]:
+            print(f"  {action:<12} hands {stats['hand_rate']:>6.1%} (L {stats['left_rate']:.0%} / R {stats['right_rate']:.0%}) | "
+                  f"{stats['duplicate_frames']} duplicates | {stats['outlier_frames']} outliers")
+        else:
+            print(f"  {action:<12} no data")
+    print(f"{len(report['flagged_sequences'])} flagged sequences")
+    print(f"Load {loaded - started:.2f}s, stats {analysed - loaded:.2f}s, total {report['elapsed_s']}s "
+          f"-> {os.path.join(args.output, 'report.html')}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Review collected keypoint data")
+    parser.add_argument('--report', action='store_true', help="headless QA report instead of the replay window")
+    parser.add_argument('--output', default='qa_report')
+    parser.add_argument('--dup-threshold', type=float, default=1e-4, help="RMS distance below which frames are duplicates")
+    parser.add_argument('--outlier-z', type=float, default=3.5, help="robust z-score above which a frame is an outlier")
+    parser.add_argument('--min-hand-rate', type=float, default=0.5, help="flag sequences with fewer hand frames")
+    parser.add_argument('--check-stale', action='store_true',
+                        help="check every frame file against data_packed/, not just the folders")
+    args = parser.parse_args()
+    if args.check_stale and packed is not None:
+        packed = open_packed(check_stale=True)
 
-            # Load the data
-            res = np.load(npy_path)
-
-            # Create a black background
-            image = np.zeros((480, 640, 3), dtype='uint8')
-            
-            # Put text
-            cv2.putText(image, f'{action} | Video: {sequence} | Frame: {frame_num}', (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 1, cv2.LINE_AA)
-
-            # Draw the hands
-            draw_landmarks_from_npy(image, res)
-
-            # Show the animation
-            cv2.imshow('Data Review', image)
-            
-            # Control speed (0.05s = 20fps)
-            key = cv2.waitKey(50)
-            if key & 0xFF == ord('q'):
-                exit()
-        
-        # Pause slightly between videos
-        time.sleep(0.5)
-
-cv2.destroyAllWindows()
\ No newline at end of file
+    if args.report:
+        write_report(args)
+    else:
+        review()